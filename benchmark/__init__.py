@@ -0,0 +1 @@
+# This module is for benchmarking the gas basics on synthetic corpora.
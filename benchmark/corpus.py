@@ -0,0 +1,158 @@
+import argparse
+import json
+import os
+import random
+import sys
+
+
+# Generates a synthetic Bits folder for benchmarking:
+# a deep template hierarchy, a map with one region with a large objects file and a terrain of chained nodes.
+# Gas is written as text, so it can contain what GasWriter never produces - comments, multiline values, odd spacing.
+
+MAP_NAME = 'bench_map'
+REGION_NAME = 'bench_region'
+
+
+def hex_str(value: int) -> str:
+    return '0x{:08x}'.format(value)
+
+
+def template_text(name: str, specializes: str, rnd: random.Random) -> str:
+    lines = [f'[t:template,n:{name}]', '{']
+    if rnd.random() < 0.2:
+        lines.append('\t// the most interesting template')
+    lines.append(f'\tdoc = "{name}";')
+    if specializes is not None:
+        lines.append(f'\tspecializes = {specializes};')
+    lines.append(f'\tcategory_name = "{rnd.choice(["actor", "prop", "weapon", "armor"])}";')
+    lines += ['\t[aspect]', '\t{', f'\t\tmodel = m_c_gah_{name};', f'\t  f scale_base = {rnd.uniform(0.5, 2):.6f};', '\t}']
+    lines += ['\t[common]', '\t{', f'\t\tscreen_name = "{name.replace("_", " ").title()}";']
+    if rnd.random() < 0.1:
+        lines += ['\t\tdescription = "first line', '\t\t\tsecond line', '\t\t\tthird line";']
+    lines.append('\t}')
+    if rnd.random() < 0.3:
+        lines += ['\t[actor]', '\t{', f'\t\talignment = {rnd.choice(["aa_evil", "aa_good", "aa_neutral"])};', f'\t  i experience_value = {rnd.randint(0, 5000)};', '\t}']
+    if rnd.random() < 0.05:
+        lines += ['\t/*', '\t[inventory] { il_main = #weapon/10-20; }', '\t*/']
+    if rnd.random() < 0.05:
+        lines += ['\t[gizmo]', '\t{', '\t\tscript = [[', '\t\t\tcall this;', '\t\t\tcall that;', '\t\t]];', '\t}']
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def write_templates(templates_dir: str, num_templates: int, depth: int, per_file: int, rnd: random.Random) -> list[str]:
+    names = list()
+    parents = list()
+    for i in range(num_templates):
+        names.append(f'bench_{i:05d}')
+        if i == 0:
+            parents.append(None)
+        elif i < depth:
+            parents.append(names[i - 1])  # one chain of full depth
+        else:
+            parents.append(names[rnd.randrange(max(0, i - depth), i)])  # bushy, but just as deep
+    for file_index, start in enumerate(range(0, num_templates, per_file)):
+        sub_dir = os.path.join(templates_dir, f'group_{file_index % 10}')
+        os.makedirs(sub_dir, exist_ok=True)
+        with open(os.path.join(sub_dir, f'templates_{file_index:03d}.gas'), 'w') as gas_file:
+            for i in range(start, min(start + per_file, num_templates)):
+                gas_file.write(template_text(names[i], parents[i], rnd))
+    return names
+
+
+def write_objects(objects_dir: str, num_objects: int, template_names: list[str], node_guids: list[int], rnd: random.Random):
+    os.makedirs(objects_dir, exist_ok=True)
+    with open(os.path.join(objects_dir, 'actor.gas'), 'w') as gas_file:
+        for i in range(num_objects):
+            lines = [f'[t:{rnd.choice(template_names)},n:{hex_str(0x10000000 + i)}]', '{']
+            lines += ['\t[placement]', '\t{']
+            lines.append(f'\t  p position = {rnd.uniform(-4, 4):.6f},{rnd.uniform(-1, 1):.6f},{rnd.uniform(-4, 4):.6f},{hex_str(rnd.choice(node_guids))};')
+            lines.append(f'\t  q orientation = 0,{rnd.uniform(-1, 1):.6f},0,{rnd.uniform(-1, 1):.6f};')
+            lines.append('\t}')
+            if i % 3 == 0:
+                lines += ['\t[aspect]', '\t{', f'\t  f scale_multiplier = {rnd.uniform(0.8, 1.2):.6f};', '\t}']
+            if i % 7 == 0:
+                lines += ['\t[common]', '\t{', '\t\tinstance_triggers = "first trigger;', '\t\t\tsecond trigger";', '\t}']
+            lines.append('}')
+            gas_file.write('\n'.join(lines) + '\n')
+
+
+def write_terrain(region_dir: str, num_nodes: int, rnd: random.Random) -> list[int]:
+    node_guids = [0x20000000 + i for i in range(num_nodes)]
+    mesh_guids = {0x00000100 + i: f't_grs01_floor_{i:02d}' for i in range(8)}
+    index_dir = os.path.join(region_dir, 'index')
+    os.makedirs(index_dir, exist_ok=True)
+    with open(os.path.join(index_dir, 'node_mesh_index.gas'), 'w') as gas_file:
+        gas_file.write('[node_mesh_index]\n{\n' + ''.join(f'\t{hex_str(guid)} = {name};\n' for guid, name in mesh_guids.items()) + '}\n')
+    with open(os.path.join(index_dir, 'streamer_node_index.gas'), 'w') as gas_file:
+        gas_file.write('[streamer_node_index]\n{\n' + ''.join(f'  x * = {hex_str(guid)};\n' for guid in node_guids) + '}\n')
+    nodes_dir = os.path.join(region_dir, 'terrain_nodes')
+    os.makedirs(nodes_dir, exist_ok=True)
+    with open(os.path.join(nodes_dir, 'nodes.gas'), 'w') as gas_file:
+        gas_file.write('[t:terrain_nodes,n:siege_node_list]\n{\n')
+        gas_file.write('  x actor_ambient_color = 0xffffffff;\n  f actor_ambient_intensity = 1.000000;\n  x ambient_color = 0xffffffff;\n')
+        gas_file.write('  f ambient_intensity = 0.500000;\n\tenvironment_map = b_em_sphere;\n  x object_ambient_color = 0xffffffff;\n')
+        gas_file.write(f'  f object_ambient_intensity = 1.000000;\n  x targetnode = {hex_str(node_guids[0])};\n')
+        for i, guid in enumerate(node_guids):
+            lines = [f'\t[t:snode,n:{hex_str(guid)}]', '\t{']
+            lines += ['\t  b bounds_camera = true;', '\t  b camera_fade = false;', f'\t  x guid = {hex_str(guid)};']
+            lines += [f'\t  x mesh_guid = {hex_str(rnd.choice(list(mesh_guids)))};', '\t  x nodelevel = 0xffffffff;', '\t  x nodeobject = 0xffffffff;']
+            lines += ['\t  x nodesection = 0xffffffff;', '\t  b occludes_camera = false;', '\t  b occludes_light = true;', '\t\ttexsetabbr = grs01;']
+            doors = ([(1, node_guids[i - 1], 2)] if i > 0 else []) + ([(2, node_guids[i + 1], 1)] if i + 1 < num_nodes else [])
+            for door_id, farguid, fardoor in doors:
+                lines += ['\t\t[door*]', '\t\t{', f'\t\t  i fardoor = {fardoor};', f'\t\t  x farguid = {hex_str(farguid)};', f'\t\t  i id = {door_id};', '\t\t}']
+            lines.append('\t}')
+            gas_file.write('\n'.join(lines) + '\n')
+        gas_file.write('}\n')
+    return node_guids
+
+
+def write_map(map_dir: str):
+    os.makedirs(map_dir, exist_ok=True)
+    with open(os.path.join(map_dir, 'main.gas'), 'w') as gas_file:
+        gas_file.write('[t:map,n:map]\n{\n\tdescription = "Benchmark map";\n  b dev_only = false;\n\tscreen_name = "Benchmark";\n')
+        gas_file.write('\ttimeofday = 0h0m;\n  b use_node_mesh_index = true;\n  b use_player_journal = false;\n}\n')
+
+
+def generate(path: str, num_templates=2000, depth=12, templates_per_file=100, num_objects=10000, num_nodes=1000, seed=0):
+    rnd = random.Random(seed)
+    world_dir = os.path.join(path, 'world')
+    template_names = write_templates(os.path.join(world_dir, 'contentdb', 'templates'), num_templates, depth, templates_per_file, rnd)
+    map_dir = os.path.join(world_dir, 'maps', MAP_NAME)
+    write_map(map_dir)
+    region_dir = os.path.join(map_dir, 'regions', REGION_NAME)
+    node_guids = write_terrain(region_dir, num_nodes, rnd)
+    write_objects(os.path.join(region_dir, 'objects', 'regular'), num_objects, template_names, node_guids, rnd)
+    params = {'templates': num_templates, 'depth': depth, 'templates_per_file': templates_per_file, 'objects': num_objects, 'nodes': num_nodes, 'seed': seed}
+    with open(os.path.join(path, 'corpus.json'), 'w') as json_file:
+        json.dump(params, json_file, indent=2)
+    return params
+
+
+def init_arg_parser():
+    parser = argparse.ArgumentParser(description='GasPy benchmark corpus generator')
+    parser.add_argument('path', help='output dir - becomes a synthetic Bits folder')
+    parser.add_argument('--templates', type=int, default=2000)
+    parser.add_argument('--depth', type=int, default=12, help='depth of the template hierarchy')
+    parser.add_argument('--templates-per-file', type=int, default=100)
+    parser.add_argument('--objects', type=int, default=10000, help='number of game objects in the region')
+    parser.add_argument('--nodes', type=int, default=1000, help='number of terrain nodes in the region')
+    parser.add_argument('--seed', type=int, default=0)
+    return parser
+
+
+def parse_args(argv):
+    parser = init_arg_parser()
+    return parser.parse_args(argv)
+
+
+def main(argv) -> int:
+    args = parse_args(argv)
+    assert not os.path.exists(args.path) or not os.listdir(args.path), 'output dir is not empty: ' + args.path
+    params = generate(args.path, args.templates, args.depth, args.templates_per_file, args.objects, args.nodes, args.seed)
+    print(f'Generated benchmark corpus in {args.path}: {params}')
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main(sys.argv[1:]))
@@ -0,0 +1,122 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmark.corpus import MAP_NAME, REGION_NAME
+from bits.bits import Bits
+from bits.maps.region import Region
+from bits.templates import Templates
+from gas.gas_cache import GasCache
+from gas.gas_dir import GasDir
+from gas.gas_parser import GasParser
+from gas.gas_writer import GasWriter
+
+
+# Times the gas basics on a corpus made by corpus.py and writes JSON results that can be compared between commits.
+
+def time_runs(func, repeat: int) -> dict:
+    durations = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return {'min': min(durations), 'mean': sum(durations) / len(durations), 'runs': repeat}
+
+
+def run_benchmarks(corpus_path: str, repeat: int) -> dict[str, dict]:
+    region_path = os.path.join(corpus_path, 'world', 'maps', MAP_NAME, 'regions', REGION_NAME)
+    objects_path = os.path.join(region_path, 'objects', 'regular', 'actor.gas')
+    nodes_path = os.path.join(region_path, 'terrain_nodes', 'nodes.gas')
+    templates_path = os.path.join(corpus_path, 'world', 'contentdb', 'templates')
+    parser = GasParser.get_instance()
+    line_based_parser = GasParser()
+    line_based_parser.single_pass = False
+    line_based_parser.print_warnings = False
+    bits = Bits(corpus_path)
+    bench_map = bits.maps[MAP_NAME]
+    objects_gas = parser.parse_file(objects_path)
+
+    def get_templates():
+        Templates(GasDir(templates_path)).get_templates()
+
+    def load_terrain():
+        Region(GasDir(region_path), bench_map).load_terrain()
+
+    results = dict()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        out_path = os.path.join(tmp_dir, 'actor.gas')
+        benchmarks = {
+            'parse_file objects': lambda: parser.parse_file(objects_path),
+            'parse_file objects line-based': lambda: line_based_parser.parse_file(objects_path),
+            'parse_file nodes': lambda: parser.parse_file(nodes_path),
+            'write_file objects': lambda: GasWriter().write_file(out_path, objects_gas),
+            'get_templates': get_templates,
+            'load_terrain': load_terrain,
+        }
+        for name, func in benchmarks.items():
+            results[name] = time_runs(func, repeat)
+            print(f'{name}: {results[name]["min"]:.3f} s')
+    speedup = results['parse_file objects line-based']['min'] / results['parse_file objects']['min']
+    print(f'single-pass parsing: x{speedup:.2f} over line-based')
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, cwd=os.path.dirname(__file__)).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results: dict[str, dict], baseline_path: str):
+    with open(baseline_path) as json_file:
+        baseline = json.load(json_file)
+    print(f'compared to {baseline.get("commit")}:')
+    for name, result in results.items():
+        if name in baseline['results']:
+            ratio = result['min'] / baseline['results'][name]['min']
+            print(f'{name}: x{ratio:.2f}')
+
+
+def init_arg_parser():
+    parser = argparse.ArgumentParser(description='GasPy benchmark runner')
+    parser.add_argument('corpus', help='dir generated by benchmark/corpus.py')
+    parser.add_argument('--output', default=None, help='JSON results file')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--compare', default=None, help='JSON results file of an earlier run')
+    return parser
+
+
+def parse_args(argv):
+    parser = init_arg_parser()
+    return parser.parse_args(argv)
+
+
+def main(argv) -> int:
+    args = parse_args(argv)
+    GasCache.disable()  # measure the real work
+    with open(os.path.join(args.corpus, 'corpus.json')) as json_file:
+        corpus = json.load(json_file)
+    results = run_benchmarks(args.corpus, args.repeat)
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': corpus,
+        'results': results,
+    }
+    if args.output is not None:
+        with open(args.output, 'w') as json_file:
+            json.dump(report, json_file, indent=2)
+    if args.compare is not None:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main(sys.argv[1:]))
@@ -0,0 +1,100 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from gas.gas import Attribute, Gas, Section
+from gas.gas_cache import GasCache
+from gas.gas_parser import GasParser
+from gas.gas_writer import GasWriter
+
+
+# Round trip of the streaming GasWriter against the list-building writer it replaced: same bytes, time & peak memory of both.
+
+def previous_format_section(section: Section, lines: list, indent=0):
+    lines.append('\t'*indent + '[{}]\n'.format(section.header))
+    lines.append('\t'*indent + '{\n')
+    for item in section.items:
+        if isinstance(item, Attribute):
+            attr_line = '\t'*(indent+1) if item.datatype is None else '\t'*indent + '  {} '.format(item.datatype)
+            attr_line += '{} = {};\n'.format(item.name, item.value_str)
+            lines.append(attr_line)
+        else:
+            assert isinstance(item, Section)
+            previous_format_section(item, lines, indent + 1)
+    lines.append('\t'*indent + '}\n')
+
+
+def previous_format_gas(gas: Gas) -> list[str]:
+    # GasWriter.format_gas before it streamed
+    lines = []
+    for section in gas.items:
+        previous_format_section(section, lines)
+    return lines
+
+
+def previous_write_file(path: str, gas: Gas):
+    gas_lines = previous_format_gas(gas)
+    with open(path, 'w') as file:
+        file.writelines(gas_lines)
+
+
+def measure(write, path: str, gas: Gas, repeat: int) -> (float, int):
+    # -> best seconds, peak traced bytes
+    durations = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        write(path, gas)
+        durations.append(time.perf_counter() - start)
+    tracemalloc.start()
+    write(path, gas)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(durations), peak
+
+
+def compare_writers(gas_paths: list[str], repeat: int) -> dict[str, dict]:
+    parser = GasParser.get_instance()
+    results = dict()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        previous_path, streaming_path = os.path.join(tmp_dir, 'previous.gas'), os.path.join(tmp_dir, 'streaming.gas')
+        for gas_path in gas_paths:
+            gas = parser.parse_file(gas_path)
+            previous = measure(previous_write_file, previous_path, gas, repeat)
+            streaming = measure(GasWriter().write_file, streaming_path, gas, repeat)
+            with open(previous_path, 'rb') as previous_file, open(streaming_path, 'rb') as streaming_file:
+                identical = previous_file.read() == streaming_file.read()
+            results[gas_path] = {'identical': identical, 'previous': previous, 'streaming': streaming}
+            print(f'{gas_path}: {"identical" if identical else "DIFFERENT"}, '
+                  f'{previous[0]:.3f} s -> {streaming[0]:.3f} s (x{previous[0] / streaming[0]:.2f}), '
+                  f'peak {previous[1] // 1024} -> {streaming[1] // 1024} KiB')
+    return results
+
+
+def init_arg_parser():
+    parser = argparse.ArgumentParser(description='GasPy writer benchmark')
+    parser.add_argument('path', help='gas file or dir, e.g. generated by benchmark/corpus.py')
+    parser.add_argument('--repeat', type=int, default=5)
+    return parser
+
+
+def parse_args(argv):
+    parser = init_arg_parser()
+    return parser.parse_args(argv)
+
+
+def main(argv) -> int:
+    args = parse_args(argv)
+    GasCache.disable()
+    if os.path.isdir(args.path):
+        gas_paths = sorted(os.path.join(d, f) for d, _, files in os.walk(args.path) for f in files if f.endswith('.gas'))
+    else:
+        gas_paths = [args.path]
+    results = compare_writers(gas_paths, args.repeat)
+    return 0 if all(result['identical'] for result in results.values()) else 1
+
+
+if __name__ == '__main__':
+    exit(main(sys.argv[1:]))
@@ -1,12 +1,15 @@
 import os
+import time
 
 from bits.moods import Moods
 from bits.snos import SNOs
 from gas.gas_dir import GasDir
 
+from .bits_snapshot import BitsSnapshot
 from .gas_dir_handler import GasDirHandler
 from .language import Language
 from bits.maps.map import Map
+from bits.maps.region import Region
 from .nnk import NNK
 from .node_mesh_guids import NodeMeshGuids
 from .templates import Templates
@@ -18,7 +21,9 @@ class Bits(GasDirHandler):
     DS2_PATH = os.path.join(os.path.expanduser("~"), 'Documents', 'My Games', 'Dungeon Siege 2', 'Bits')  # I'm not sure this is correct
     DS2BW_PATH = os.path.join(os.path.expanduser("~"), 'Documents', 'My Games', 'Dungeon Siege 2', 'Bits BW')  # I'm sure this is not correct
 
-    def __init__(self, path: str = None):
+    SNAPSHOT_ENV_VAR = 'GASPY_BITS_SNAPSHOT'
+
+    def __init__(self, path: str = None, profile_startup=False, snapshot: bool = None):
         if path is None or path.upper() == 'DSLOA':
             path = Bits.DSLOA_PATH
         elif path.upper() == 'DS1':
@@ -29,13 +34,111 @@ class Bits(GasDirHandler):
             path = Bits.DS2BW_PATH
         assert os.path.isdir(path), path
         super().__init__(GasDir(path))
-        self.templates = self.init_templates()
-        self.maps: dict[str, Map] = self.init_maps()
-        self.moods = self.init_moods()
-        self.language = self.init_language()
-        self.nnk = self.init_nnk()
-        self.snos = self.init_snos()
-        self.nmg = self.init_nmg()
+        # subsystems are initialized on first access, so tools only pay for what they use
+        self._subsystems = dict()
+        self.profile_startup = profile_startup
+        self.startup_profile: dict[str, tuple[float, int]] = dict()  # subsystem -> init & load seconds (incl. subsystems it needs) & files read
+        self.region_summaries: dict[str, dict[str, Region.Data]] = dict()  # map -> region -> data, restored from a snapshot
+        if snapshot is None:
+            snapshot = bool(os.environ.get(Bits.SNAPSHOT_ENV_VAR))
+        self.snapshot = BitsSnapshot(self) if snapshot else None
+        if self.snapshot is not None:
+            start = time.perf_counter()
+            self.snapshot.load()
+            if self.profile_startup:
+                self.startup_profile['snapshot'] = (time.perf_counter() - start, len(self.snapshot.refreshed))
+
+    def save_snapshot(self):
+        if self.snapshot is None:
+            self.snapshot = BitsSnapshot(self)
+        self.snapshot.save()
+
+    def get_subsystem(self, name: str):
+        if name not in self._subsystems:
+            init = getattr(self, 'init_' + name)
+            if not self.profile_startup:
+                self._subsystems[name] = init()
+            else:
+                start = time.perf_counter()
+                subsystem = init()
+                duration = time.perf_counter() - start
+                self._subsystems[name] = subsystem
+                self.startup_profile[name] = (duration, self.count_files(subsystem))
+                if hasattr(subsystem, 'on_load'):
+                    # most handlers load their files lazily themselves - add those loads as they happen
+                    subsystem.on_load = lambda seconds, num_files: self.add_to_startup_profile(name, seconds, num_files)
+        return self._subsystems[name]
+
+    def add_to_startup_profile(self, name: str, seconds: float, num_files: int):
+        duration, total_files = self.startup_profile[name]
+        self.startup_profile[name] = (duration + seconds, total_files + num_files)
+
+    @staticmethod
+    def count_files(subsystem) -> int:
+        if isinstance(subsystem, dict):
+            return len(subsystem)  # maps
+        return getattr(subsystem, 'num_files', 0)  # files read on init
+
+    def print_startup_profile(self):
+        for name, (duration, num_files) in self.startup_profile.items():
+            print(f'{name}: {duration:.3f} s, {num_files} files')
+        print(f'total: {sum([duration for duration, _ in self.startup_profile.values()]):.3f} s')
+
+    @property
+    def templates(self) -> Templates:
+        return self.get_subsystem('templates')
+
+    @templates.setter
+    def templates(self, templates: Templates):
+        self._subsystems['templates'] = templates
+
+    @property
+    def maps(self) -> dict[str, Map]:
+        return self.get_subsystem('maps')
+
+    @maps.setter
+    def maps(self, maps: dict[str, Map]):
+        self._subsystems['maps'] = maps
+
+    @property
+    def moods(self) -> Moods:
+        return self.get_subsystem('moods')
+
+    @moods.setter
+    def moods(self, moods: Moods):
+        self._subsystems['moods'] = moods
+
+    @property
+    def language(self) -> Language:
+        return self.get_subsystem('language')
+
+    @language.setter
+    def language(self, language: Language):
+        self._subsystems['language'] = language
+
+    @property
+    def nnk(self) -> NNK:
+        return self.get_subsystem('nnk')
+
+    @nnk.setter
+    def nnk(self, nnk: NNK):
+        self._subsystems['nnk'] = nnk
+
+    @property
+    def snos(self) -> SNOs:
+        return self.get_subsystem('snos')
+
+    @snos.setter
+    def snos(self, snos: SNOs):
+        self._subsystems['snos'] = snos
+
+    @property
+    def nmg(self) -> NodeMeshGuids:
+        return self.get_subsystem('nmg')
+
+    @nmg.setter
+    def nmg(self, nmg: NodeMeshGuids):
+        self._subsystems['nmg'] = nmg
 
     def init_maps(self):
         maps_dir = self.gas_dir.get_subdir(['world', 'maps'])
@@ -2,6 +2,7 @@ import argparse
 import sys
 
 from bits.bits import Bits
+from gas.gas_cache import GasCache
 
 
 def print_maps(bits: Bits, map_info=None, region_info=None):
@@ -29,6 +30,10 @@ def print_nnk(bits: Bits):
 def init_arg_parser():
     parser = argparse.ArgumentParser(description='GasPy Bits')
     parser.add_argument('--bits', default='DSLOA')
+    GasCache.add_arguments(parser)
+    parser.add_argument('--profile-startup', action='store_true', help='Report init time & number of files per Bits subsystem')
+    parser.add_argument('--snapshot', action='store_true', default=None, help='Start from the Bits snapshot, refreshing what changed since')
+    parser.add_argument('--save-snapshot', action='store_true', help='Save a Bits snapshot for quicker startup next time')
     parser.add_argument('--print', choices=['maps', 'templates', 'snos', 'nnk'])
     parser.add_argument('--print-map-info', nargs='?', choices=['npcs', 'enemies-total', 'xp-total', 'nodes-total', 'shops', 'start-positions', 'enemy-templates'])
     parser.add_argument('--print-region-info', nargs='?', choices=['actors', 'enemies', 'stitches', 'xp', 'nodes', 'plants', 'data', 'node-meshes', 'objects', 'pwls'])
@@ -43,7 +48,8 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
-    bits = Bits(args.bits)
+    GasCache.apply_arguments(args)
+    bits = Bits(args.bits, args.profile_startup, args.snapshot)
     if args.print == 'maps':
         print_maps(bits, args.print_map_info, args.print_region_info)
     if args.print == 'templates':
@@ -52,6 +58,10 @@ def main(argv):
         print_snos(bits)
     if args.print == 'nnk':
         print_nnk(bits)
+    if args.save_snapshot:
+        bits.save_snapshot()
+    if args.profile_startup:
+        bits.print_startup_profile()
     return 0
 
 
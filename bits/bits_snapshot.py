@@ -0,0 +1,182 @@
+import os
+import pickle
+import threading
+
+from gas.gas_cache import GasCache
+from gas.gas_dir import GasDir
+from gas.gas_file import GasFile
+
+from .maps.region import Region
+from .nnk import NNK
+from .node_mesh_guids import NodeMeshGuids
+from .template_index import TemplateIndex
+
+
+# One file with what a Bits needs at startup: the dir tree, the template index, the NNK map, node mesh guids and region data.
+# Every part is validated on load and refreshed where it is outdated:
+# dirs by their mtime (which changes when entries are added / removed), everything else by mtime & size of the files it was made of.
+class BitsSnapshot:
+    FORMAT_VERSION = 1
+    MAGIC = b'GASPY-BITS-SNAPSHOT\n'
+
+    def __init__(self, bits, path: str = None):
+        self.bits = bits
+        self.path = path if path is not None else GasCache.get_side_file_path(bits.gas_dir.path, '.bits-snapshot')  # None without gas cache
+        self.refreshed: list[str] = list()  # outdated parts found on load
+
+    # dir tree: relative dir path -> mtime, subdir names, gas file names (without .gas)
+
+    @classmethod
+    def scan_dirs(cls, path: str, rel_path: str, dirs: dict):
+        gas_dir = GasDir(path)
+        gas_dir.load(recursive=True, record_mtimes=True)
+        cls.add_dirs(gas_dir, rel_path, dirs)
+
+    @classmethod
+    def add_dirs(cls, gas_dir: GasDir, rel_path: str, dirs: dict):
+        dirs[rel_path] = (gas_dir.mtime_ns, list(gas_dir.subdirs.keys()), list(gas_dir.gas_files.keys()))
+        for name, subdir in gas_dir.subdirs.items():
+            cls.add_dirs(subdir, os.path.join(rel_path, name), dirs)
+
+    def restore_dir(self, path: str, rel_path: str, dirs: dict) -> GasDir:
+        gas_dir = GasDir(path)
+        known = dirs.get(rel_path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return gas_dir
+        if known is not None and known[0] == mtime:
+            _, subdir_names, gas_file_names = known
+            gas_dir.gas_files = {name: GasFile(os.path.join(path, name + '.gas')) for name in gas_file_names}
+        else:
+            self.refreshed.append(path)
+            gas_dir.load()
+            subdir_names = list(gas_dir.subdirs.keys())
+        gas_dir.subdirs = {name: self.restore_dir(os.path.join(path, name), os.path.join(rel_path, name), dirs) for name in subdir_names}
+        gas_dir.loaded = True
+        return gas_dir
+
+    # manifests: relative file path -> mtime & size
+
+    @staticmethod
+    def make_manifest(root_path: str, paths: list[str]) -> dict[str, tuple[int, int]]:
+        manifest = dict()
+        for path in paths:
+            stat = os.stat(path)
+            manifest[os.path.relpath(path, root_path)] = (stat.st_mtime_ns, stat.st_size)
+        return manifest
+
+    def get_nnk_manifest(self) -> dict:
+        art_dir = self.bits.gas_dir.get_subdir('art')
+        if art_dir is None:
+            return dict()
+        nnk_paths = [entry.path for entry in os.scandir(art_dir.path) if entry.name.endswith('.nnk')]
+        return self.make_manifest(art_dir.path, nnk_paths)
+
+    def get_nmg_manifest(self) -> dict:
+        siege_nodes_dir = self.bits.gas_dir.get_subdir(['world', 'global', 'siege_nodes'])
+        return NodeMeshGuids.make_manifest(siege_nodes_dir) if siege_nodes_dir is not None else None
+
+    def get_region_main_paths(self) -> dict[str, dict[str, str]]:
+        maps_dir = self.bits.gas_dir.get_subdir(['world', 'maps'])
+        main_paths = dict()
+        for map_name, map_dir in (maps_dir.get_subdirs() if maps_dir is not None else {}).items():
+            regions_dir = map_dir.get_subdir('regions')
+            if regions_dir is None:
+                continue
+            for region_name, region_dir in regions_dir.get_subdirs().items():
+                main_file = region_dir.get_gas_file('main')
+                if main_file is not None:
+                    main_paths.setdefault(map_name, dict())[region_name] = main_file.path
+        return main_paths
+
+    def save(self):
+        assert self.path is not None, f'Bits snapshots are kept next to the gas cache - set {GasCache.ENV_VAR}'
+        bits = self.bits
+        dirs = dict()
+        self.scan_dirs(bits.gas_dir.path, '', dirs)
+
+        templates_index = None
+        if bits.templates.gas_dir is not None:
+            templates_index = bits.templates.get_index().files
+
+        nnk = (self.get_nnk_manifest(), dict(bits.nnk.nnk))
+
+        nmg_manifest = self.get_nmg_manifest()
+        nmg = (nmg_manifest, bits.nmg.get_node_mesh_guids()) if nmg_manifest is not None else None
+
+        regions = dict()
+        for map_name, region_main_paths in self.get_region_main_paths().items():
+            for region_name, main_path in region_main_paths.items():
+                data = bits.maps[map_name].get_region(region_name).get_data()
+                stat = os.stat(main_path)
+                regions.setdefault(map_name, dict())[region_name] = (stat.st_mtime_ns, stat.st_size, data.id, data.mesh_range, data.scid_range)
+
+        snapshot = {'dirs': dirs, 'templates_index': templates_index, 'nnk': nnk, 'nmg': nmg, 'regions': regions}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}-{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as snapshot_file:
+            snapshot_file.write(self.MAGIC)
+            pickle.dump((self.FORMAT_VERSION, os.path.abspath(bits.gas_dir.path), snapshot), snapshot_file, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def read(self):
+        if self.path is None:
+            return None
+        try:
+            with open(self.path, 'rb') as snapshot_file:
+                if snapshot_file.read(len(self.MAGIC)) != self.MAGIC:
+                    return None
+                version, path, snapshot = pickle.load(snapshot_file)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError, TypeError):
+            return None
+        if version != self.FORMAT_VERSION or path != os.path.abspath(self.bits.gas_dir.path):
+            return None
+        return snapshot
+
+    def load(self) -> bool:
+        # restores what is still valid into the bits, before any of its subsystems got initialized
+        snapshot = self.read()
+        if snapshot is None:
+            return False
+        bits = self.bits
+        bits.gas_dir = self.restore_dir(bits.gas_dir.path, '', snapshot['dirs'])
+
+        templates = bits.templates
+        if snapshot['templates_index'] is not None and templates.gas_dir is not None:
+            templates.index = TemplateIndex(templates.gas_dir)
+            templates.index.files = snapshot['templates_index']
+            if templates.index.refresh() > 0:
+                self.refreshed.append('templates index')
+
+        nnk_manifest, nnk_map = snapshot['nnk']
+        if nnk_manifest == self.get_nnk_manifest():
+            nnk = NNK(None)
+            nnk.art_dir = bits.gas_dir.get_subdir('art')
+            nnk.nnk = nnk_map
+            nnk.num_files = len(nnk_manifest)
+            bits.nnk = nnk
+        else:
+            self.refreshed.append('nnk')
+
+        if snapshot['nmg'] is not None:
+            nmg_manifest, node_mesh_guids = snapshot['nmg']
+            if nmg_manifest == self.get_nmg_manifest():
+                nmg = NodeMeshGuids(bits.gas_dir)
+                nmg.node_mesh_guids = node_mesh_guids
+                bits.nmg = nmg
+            else:
+                self.refreshed.append('nmg')
+
+        for map_name, region_main_paths in self.get_region_main_paths().items():
+            for region_name, main_path in region_main_paths.items():
+                known = snapshot['regions'].get(map_name, {}).get(region_name)
+                stat = os.stat(main_path)
+                if known is None or known[:2] != (stat.st_mtime_ns, stat.st_size):
+                    self.refreshed.append(main_path)
+                    continue
+                data = Region.Data()
+                data.id, data.mesh_range, data.scid_range = known[2:]
+                bits.region_summaries.setdefault(map_name, dict())[region_name] = data
+        return True
+
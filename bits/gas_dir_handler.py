@@ -1,6 +1,20 @@
+import time
+
 from gas.gas_dir import GasDir
+from gas.gas_file import GasFile
+
+
+def profile_load(on_load, load, *args):
+    # runs load(*args); on_load, if set, gets the seconds it took & the number of gas files it read (see Bits.profile_startup)
+    if on_load is None:
+        return load(*args)
+    start, num_loads = time.perf_counter(), GasFile.num_loads
+    result = load(*args)
+    on_load(time.perf_counter() - start, GasFile.num_loads - num_loads)
+    return result
 
 
 class GasDirHandler:
     def __init__(self, gas_dir: GasDir):
         self.gas_dir = gas_dir
+        self.on_load = None  # see profile_load
@@ -1,4 +1,4 @@
-from bits.gas_dir_handler import GasDirHandler
+from bits.gas_dir_handler import GasDirHandler, profile_load
 from gas.gas import Section
 from gas.gas_dir import GasDir
 
@@ -11,6 +11,9 @@ class Language(GasDirHandler):
         super().__init__(gas_dir)
 
     def get_translations(self, lang_code: str):
+        return profile_load(self.on_load, self.load_translations, lang_code)
+
+    def load_translations(self, lang_code: str):
         translations = dict()
         if self.gas_dir is None:
             return translations
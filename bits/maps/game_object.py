@@ -12,7 +12,7 @@ class GameObject:
         self.object_id = n
 
     def get_template(self) -> Template:
-        template = self._bits.templates.get_templates().get(self.template_name.lower())
+        template = self._bits.templates.get_template(self.template_name)
         assert template is not None, self.template_name
         return template
 
@@ -326,7 +326,7 @@ class Map(GasDirHandler):
         if self.bookmarks is not None:
             self.store_bookmarks()
         self.gas_dir.get_or_create_subdir('regions', False)
-        self.gas_dir.save()
+        return self.gas_dir.save()
 
     def delete(self):
         self.gas_dir.delete()
@@ -342,15 +342,24 @@ class Map(GasDirHandler):
             return False
         return True
 
+    def get_region_summary(self, name: str, region_dir: GasDir) -> Optional[Region.Data]:
+        # region data restored from a bits snapshot - unless the main file is loaded and may have been edited since
+        if self.bits is None or name not in self.bits.region_summaries.get(self.get_name(), {}):
+            return None
+        main_file = region_dir.get_gas_file('main')
+        if main_file is None or main_file.gas is not None:
+            return None
+        return self.bits.region_summaries[self.get_name()][name]
+
     def get_regions(self) -> dict[str, Region]:
         regions = self.gas_dir.get_subdir('regions').get_subdirs()
-        return {name: Region(gas_dir, self) for name, gas_dir in regions.items()}
+        return {name: Region(gas_dir, self, summary=self.get_region_summary(name, gas_dir)) for name, gas_dir in regions.items()}
 
     def get_region(self, name) -> Optional[Region]:
         region_dirs = self.gas_dir.get_subdir('regions').get_subdirs()
         if name not in region_dirs:
             return None
-        return Region(region_dirs[name], self)
+        return Region(region_dirs[name], self, summary=self.get_region_summary(name, region_dirs[name]))
 
     def create_region(self, name, region_id) -> Region:
         regions = self.get_regions()
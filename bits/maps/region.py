@@ -1,7 +1,10 @@
+import copy
 import os
 
 from gas.gas import Hex, Gas, Section, Attribute
+from gas.gas_cache import GasCache
 from gas.gas_dir import GasDir
+from gas.gas_parser import GasParser
 from .conversations_gas import ConversationsGas
 from .decals_gas import DecalsGas
 
@@ -22,16 +25,18 @@ class Region(GasDirHandler):
             self.mesh_range: Hex = None
             self.scid_range: Hex = None
 
-    def __init__(self, gas_dir: GasDir, _map, data=None, terrain: Terrain = None, lights: list[Light] = None):
+    def __init__(self, gas_dir: GasDir, _map, data=None, terrain: Terrain = None, lights: list[Light] = None, summary: 'Region.Data' = None):
         super().__init__(gas_dir)
         self.map = _map
         self.data: Region.Data = data
+        self.summary: Region.Data = summary  # shared & read-only, e.g. from a bits snapshot - get_data copies it instead of loading main.gas
         self.terrain: Terrain = terrain
         self.lights: list[Light] = lights
         self.stitch_helper: StitchHelperGas or None = None
         self.decals: DecalsGas or None = None
         self.conversations: ConversationsGas or None = None
         self.objects = RegionObjects(self.gas_dir, self)
+        self.streamed_index_values: dict[str, tuple] = dict()  # index file name -> mtime, values; see get_index_values
 
     # for quicker understanding during debugging
     def __str__(self):
@@ -65,7 +70,10 @@ class Region(GasDirHandler):
 
     def get_data(self):
         if self.data is None:
-            self.load_data()
+            if self.summary is not None:
+                self.data = copy.copy(self.summary)
+            else:
+                self.load_data()
         return self.data
 
     def load_terrain(self):
@@ -76,8 +84,7 @@ class Region(GasDirHandler):
             node_mesh_index_file = self.gas_dir.get_subdir('index').get_gas_file('node_mesh_index')
             nmi = {Hex.parse(attr.name): attr.value for attr in node_mesh_index_file.get_gas().get_section('node_mesh_index').get_attrs()}
         else:
-            nmg = self.map.bits.nmg.get_node_mesh_guids()
-            nmg = {Hex.parse(k.removesuffix('g')): v for k, v in nmg.items()}  # wtf - 0xa801037g: t_gi_flr_04x04-b
+            nmg = self.map.bits.nmg.get_node_mesh_guids_by_hex()
 
         nodes_gas_file = self.gas_dir.get_subdir('terrain_nodes').get_gas_file('nodes')
         nodes_gas = NodesGas.load(nodes_gas_file)
@@ -270,18 +277,27 @@ class Region(GasDirHandler):
         if self.decals is not None:
             self.store_decals()
         self.ensure_north_vector()
-        self.gas_dir.save()
+        return self.gas_dir.save()
+
+    def get_index_values(self, name: str) -> list[Hex]:
+        index_file = self.gas_dir.get_subdir('index').get_gas_file(name)
+        assert index_file, self.get_name() + ': ' + name + ' not found'
+        if index_file.gas is None and GasCache.get_instance() is None:
+            # just the ids - stream instead of loading the whole file, once per file version
+            mtime = os.stat(index_file.path).st_mtime_ns
+            streamed = self.streamed_index_values.get(name)
+            if streamed is None or streamed[0] != mtime:
+                streamed = mtime, [attr.value for attr in GasParser.get_instance().iter_attrs(index_file.path, name, '*')]
+                self.streamed_index_values[name] = streamed
+            return list(streamed[1])
+        attrs: list[Attribute] = index_file.get_gas().get_section(name).items
+        return [attr.value for attr in attrs]
 
     def get_node_ids(self) -> list[Hex]:
-        node_index_file = self.gas_dir.get_subdir('index').get_gas_file('streamer_node_index')
-        assert node_index_file, self.get_name() + ': streamer_node_index not found'
-        node_id_attrs: list[Attribute] = node_index_file.get_gas().get_section('streamer_node_index').items
-        return [attr.value for attr in node_id_attrs]
+        return self.get_index_values('streamer_node_index')
 
     def get_scids(self) -> list[Hex]:
-        node_content_index_file = self.gas_dir.get_subdir('index').get_gas_file('streamer_node_content_index')
-        scid_attrs: list[Attribute] = node_content_index_file.get_gas().get_section('streamer_node_content_index').items
-        return [attr.value for attr in scid_attrs]
+        return self.get_index_values('streamer_node_content_index')
 
     def count_light_locks(self) -> int:
         light_locks_file = self.gas_dir.get_subdir('editor').get_gas_file('light_locks')
@@ -327,11 +343,12 @@ class Region(GasDirHandler):
         templates: Templates = self.map.bits.templates
         generator_components = ['advanced_a2', 'auto_object_exploding', 'basic', 'breakable', 'cage', 'dumb_guy', 'in_object', 'multiple_mp', 'object_exploding', 'object_pcontent', 'random']
         generator_components = ['generator_'+x for x in generator_components]
+        generator_component_templates = {gen_comp: templates.with_component(gen_comp) for gen_comp in generator_components}
         child_template_defaults = {'generator_cage': 'Caged_phrak', 'generator_in_object': 'phrak', 'generator_dumb_guy': 'Krug_Grunt'}
         for gen in generators:
             num_enemies = 0
             for gen_comp in generator_components:
-                if not gen.get_template().has_component(gen_comp):
+                if gen.template_name.lower() not in generator_component_templates[gen_comp]:
                     continue
                 child_template_name = gen.compute_value(gen_comp, 'child_template_name')
                 if child_template_name is None:
@@ -340,7 +357,7 @@ class Region(GasDirHandler):
                     else:
                         continue
                 child_template_name = child_template_name.strip('"').lower()
-                child_template = templates.get_templates().get(child_template_name)
+                child_template = templates.get_template(child_template_name)
                 if child_template is None:
                     print(f'Generator child_template_name not found: {gen.template_name} {gen.object_id}: {child_template_name}')
                     continue
@@ -400,7 +417,8 @@ class Region(GasDirHandler):
     # returns full/smith/mage shops and also mule shops
     def get_shops(self) -> list[GameObject]:
         npcs = self.get_npcs()
-        stores = [npc for npc in npcs if npc.get_template().has_component('store')]
+        store_templates = self.map.bits.templates.with_component('store')
+        stores = [npc for npc in npcs if npc.template_name.lower() in store_templates]
         return [store for store in stores if store.get_template().compute_value('store', 'item_markup') is not None]  # filter self-selling companion/pm "stores"
 
     def xp_str(self):
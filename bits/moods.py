@@ -1,7 +1,7 @@
 import os.path
 from pathlib import Path
 
-from bits.gas_dir_handler import GasDirHandler
+from bits.gas_dir_handler import GasDirHandler, profile_load
 from gas.color import Color
 from gas.gas import Section, Attribute
 from gas.gas_dir import GasDir
@@ -292,7 +292,7 @@ class Moods(GasDirHandler):
 
     def get_moods(self) -> dict[str, list[Mood]]:
         if self.moods is None:
-            self.load_moods()
+            profile_load(self.on_load, self.load_moods)
         return self.moods
 
     def get_all_moods(self) -> list[Mood]:
@@ -3,19 +3,72 @@ import os
 from gas.gas_dir import GasDir
 
 
+class VersionedDict(dict):
+    # dict that counts its changes, so derived data can tell when it is outdated
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.version += 1
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def setdefault(self, key, default=None):
+        self.version += 1
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self.version += 1
+
+
 class NNK:
     def __init__(self, art_dir: GasDir):
         self.art_dir = art_dir
-        self.nnk: dict[str, str] = dict()
+        self._nnk = VersionedDict()
+        self.num_files = 0
+        # prefix trie over the underscore-separated segments: segment -> [path of the prefix or None, sub-trie]; built lazily
+        self._trie: dict[str, list] = None
+        self._trie_stamp: tuple = None
+        self._file_paths: dict[str, str] = dict()  # memoized lookup_file results
         if art_dir is not None:
             self._load_nnk(art_dir)
 
+    @property
+    def nnk(self) -> dict[str, str]:  # lower-case prefix -> sub path
+        return self._nnk
+
+    @nnk.setter
+    def nnk(self, nnk: dict[str, str]):
+        self._nnk = VersionedDict(nnk)
+
     def _load_nnk(self, art_dir: GasDir):
         for filename in os.listdir(art_dir.path):
             if filename.endswith('.nnk'):
                 self._load_nnk_file(os.path.join(art_dir.path, filename))
 
     def _load_nnk_file(self, file_path):
+        self.num_files += 1
         with open(file_path, 'r') as file:
             for line in file.readlines():
                 if not line.startswith('TREE ='):
@@ -26,27 +79,57 @@ class NNK:
                 prefix = prefix.lower()
                 self.nnk[prefix] = sub_path
 
+    def get_trie(self) -> dict[str, list]:
+        stamp = (id(self._nnk), self._nnk.version)
+        if self._trie is None or self._trie_stamp != stamp:
+            trie = dict()
+            for prefix, sub_path in self.nnk.items():
+                node = trie
+                segments = prefix.split('_')
+                for segment in segments[:-1]:
+                    node = node.setdefault(segment, [None, dict()])[1]
+                node.setdefault(segments[-1], [None, dict()])[0] = sub_path
+            self.resolve_trie_paths(trie, '')
+            self._trie = trie
+            self._trie_stamp = stamp
+            self._file_paths = dict()
+        return self._trie
+
+    @classmethod
+    def resolve_trie_paths(cls, node: dict[str, list], path: str):
+        # turns the sub paths into full paths; prefixes with a missing sub-prefix are unreachable, as lookups stop there
+        for entry in node.values():
+            if entry[0] is not None:
+                entry[0] = os.path.join(path, entry[0])
+                cls.resolve_trie_paths(entry[1], entry[0])
+
     def lookup_prefix(self, prefix: str):
-        prefix_segments = prefix.lower().split('_')
-        path = ''
-        for n in range(len(prefix_segments)):
-            sub_prefix = '_'.join(prefix_segments[:n+1])
-            assert sub_prefix in self.nnk, sub_prefix
-            sub_path = self.nnk[sub_prefix]
-            path = os.path.join(path, sub_path)
+        node = self.get_trie()
+        path = None
+        for segment in prefix.lower().split('_'):
+            entry = node.get(segment)
+            assert entry is not None and entry[0] is not None, prefix
+            path, node = entry
         return path
 
     def lookup_file(self, filename: str):
-        filename_segments = filename.lower().split('_')
-        path = ''
-        for n in range(len(filename_segments)):
-            sub_prefix = '_'.join(filename_segments[:n+1])
-            if sub_prefix not in self.nnk:
-                break
-            sub_path = self.nnk[sub_prefix]
-            path = os.path.join(path, sub_path)
-        assert path != '', f'filename {filename} did not match any NNK prefix'
-        return os.path.join(path, filename)
+        trie = self.get_trie()
+        path = self._file_paths.get(filename)
+        if path is None:
+            node = trie
+            dir_path = ''
+            for segment in filename.lower().split('_'):
+                entry = node.get(segment)
+                if entry is None or entry[0] is None:
+                    break
+                dir_path, node = entry
+            assert dir_path != '', f'filename {filename} did not match any NNK prefix'
+            path = os.path.join(dir_path, filename)
+            self._file_paths[filename] = path
+        return path
+
+    def lookup_files(self, filenames: list[str]) -> list[str]:
+        return [self.lookup_file(filename) for filename in filenames]
 
     def print(self):
         for prefix in self.nnk.keys():
@@ -1,16 +1,48 @@
+import os
+import pickle
+import threading
+
+from bits.gas_dir_handler import profile_load
+from gas.gas_cache import GasCache
 from gas.gas_dir import GasDir
+from gas.molecules import Hex
 
 
 class NodeMeshGuids:
+    FORMAT_VERSION = 1
+
     def __init__(self, bits_dir: GasDir):
         self.bits_dir = bits_dir
         self.node_mesh_guids = None
+        self.node_mesh_guids_by_hex: dict[Hex, str] = None
+        self.node_mesh_guids_by_filename: dict[str, Hex] = None
+        self.parallel_loading: int = None  # number of processes to parse the siege_nodes files with
+        # the result almost never changes, so it is kept next to the gas cache if that is enabled - validated by mtime & size of all siege_nodes files
+        self.cache_path: str = None  # defaults to next to the gas cache
+        self.on_load = None  # see profile_load
 
     def get_node_mesh_guids(self) -> dict[str, str]:  # dict guid->filename
         if self.node_mesh_guids is None:
-            self.node_mesh_guids = self.load_node_mesh_guids(self.bits_dir)
+            self.node_mesh_guids = profile_load(self.on_load, self.load)
         return self.node_mesh_guids
 
+    def load(self) -> dict[str, str]:
+        siege_nodes_dir = self.get_siege_nodes_dir(self.bits_dir)
+        cache_path = self.cache_path if self.cache_path is not None else GasCache.get_side_file_path(siege_nodes_dir.path, '.node-mesh-guids.pickle')
+        if cache_path is not None:
+            return self.load_cached(siege_nodes_dir, cache_path)
+        return self.load_node_mesh_guids(self.bits_dir, self.parallel_loading)
+
+    def get_node_mesh_guids_by_hex(self) -> dict[Hex, str]:
+        if self.node_mesh_guids_by_hex is None:
+            self.node_mesh_guids_by_hex = {Hex.parse(k.removesuffix('g')): v for k, v in self.get_node_mesh_guids().items()}  # wtf - 0xa801037g: t_gi_flr_04x04-b
+        return self.node_mesh_guids_by_hex
+
+    def get_node_mesh_guids_by_filename(self) -> dict[str, Hex]:  # dict lower-case filename->guid
+        if self.node_mesh_guids_by_filename is None:
+            self.node_mesh_guids_by_filename = {v.lower(): k for k, v in self.get_node_mesh_guids_by_hex().items()}
+        return self.node_mesh_guids_by_filename
+
     @classmethod
     def load_node_mesh_guids_recursive(cls, gas_dir: GasDir, node_mesh_guids: dict):
         for gas_file in gas_dir.get_gas_files().values():
@@ -23,13 +55,45 @@ class NodeMeshGuids:
             cls.load_node_mesh_guids_recursive(subdir, node_mesh_guids)
 
     @classmethod
-    def load_node_mesh_guids(cls, bits_dir: GasDir):
+    def get_siege_nodes_dir(cls, bits_dir: GasDir) -> GasDir:
         siege_nodes_dir = bits_dir.get_subdir(['world', 'global', 'siege_nodes'])
         assert siege_nodes_dir is not None, "world/global/siege_nodes dir is missing in Bits"
+        return siege_nodes_dir
+
+    @classmethod
+    def load_node_mesh_guids(cls, bits_dir: GasDir, parallel: int = None):
+        siege_nodes_dir = cls.get_siege_nodes_dir(bits_dir)
+        if parallel is not None:
+            siege_nodes_dir.load_all(parallel)
         node_mesh_guids = {}
         cls.load_node_mesh_guids_recursive(siege_nodes_dir, node_mesh_guids)
         return node_mesh_guids
 
+    @staticmethod
+    def make_manifest(siege_nodes_dir: GasDir) -> dict[str, tuple[int, int]]:  # relative path -> mtime, size
+        manifest = dict()
+        for gas_file in siege_nodes_dir.iter_gas_files():
+            stat = os.stat(gas_file.path)
+            manifest[os.path.relpath(gas_file.path, siege_nodes_dir.path)] = (stat.st_mtime_ns, stat.st_size)
+        return manifest
+
+    def load_cached(self, siege_nodes_dir: GasDir, cache_path: str) -> dict[str, str]:
+        manifest = self.make_manifest(siege_nodes_dir)
+        try:
+            with open(cache_path, 'rb') as cache_file:
+                version, cached_manifest, node_mesh_guids = pickle.load(cache_file)
+            if version == self.FORMAT_VERSION and cached_manifest == manifest:
+                return node_mesh_guids
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+            pass
+        node_mesh_guids = self.load_node_mesh_guids(self.bits_dir, self.parallel_loading)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f'{cache_path}.{os.getpid()}-{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as cache_file:
+            pickle.dump((self.FORMAT_VERSION, manifest, node_mesh_guids), cache_file, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        return node_mesh_guids
+
     def print(self):
         for guid, name in self.get_node_mesh_guids().items():
             print(f'{guid}: {name}')
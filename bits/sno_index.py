@@ -0,0 +1,155 @@
+import hashlib
+import os
+import pickle
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from sno.sno import Sno
+from sno.sno_view import SnoView, BoundingBox, V3, Version, VERSION_DTYPE, BOUNDING_BOX_DTYPE, V3_DTYPE
+
+
+# per sno file: mtime & size it was read at, plus the metadata
+METADATA_DTYPE = np.dtype([
+    ('mtime_ns', '<i8'), ('size', '<i8'),
+    ('version', VERSION_DTYPE),
+    ('door_count', '<u4'), ('spot_count', '<u4'), ('vertex_count', '<u4'), ('triangle_count', '<u4'), ('texture_count', '<u4'),
+    ('bounding_box', BOUNDING_BOX_DTYPE), ('centroid_offset', V3_DTYPE), ('tile', '<u4'),
+    ('logical_mesh_count', '<u4'), ('floor_triangle_count', '<u4'), ('has_floor', '?'), ('has_water', '?')])
+
+
+# metadata of one sno, with the attribute names of Sno for the header fields (enough for SnoHandler.print_sno)
+class SnoMetaData:
+    def __init__(self, record):
+        self.version = Version(int(record['version']['major']), int(record['version']['minor']))
+        self.door_count = int(record['door_count'])
+        self.spot_count = int(record['spot_count'])
+        self.vertex_count = int(record['vertex_count'])
+        self.triangle_count = int(record['triangle_count'])
+        self.texture_count = int(record['texture_count'])
+        self.bounding_box = BoundingBox.from_record(record['bounding_box'])
+        self.centroid_offset = V3.from_record(record['centroid_offset'])
+        self.tile = int(record['tile'])
+        self.logical_mesh_count = int(record['logical_mesh_count'])
+        self.floor_triangle_count = int(record['floor_triangle_count'])
+        self.has_floor = bool(record['has_floor'])
+        self.has_water = bool(record['has_water'])
+
+
+def read_metadata(path: str) -> (tuple, str):
+    # -> metadata record as tuple or None, error message or None
+    try:
+        stat = os.stat(path)
+        view = SnoView.from_file(path)
+        floor_meshes = [lm for lm in view.logical_mesh if lm.floor == Sno.Floor.floor]
+        header = view.header
+        record = (stat.st_mtime_ns, stat.st_size, header['version'].item(), view.door_count, view.spot_count, view.vertex_count, view.triangle_count, view.texture_count,
+                  header['bounding_box'].item(), header['centroid_offset'].item(), view.tile,
+                  view.logical_mesh_count, sum(lm.triangle_section_count for lm in floor_meshes), len(floor_meshes) > 0,
+                  any(lm.floor == Sno.Floor.water for lm in view.logical_mesh))
+        return record, None
+    except Exception as e:
+        return None, f'{e.__class__.__name__} Exception: {e}'
+
+
+# Metadata of all sno files of a dir - counts, bounding box, floor/water flags - without keeping the geometry.
+# One compact file with a NumPy record per sno; refreshed per file by mtime & size, read in parallel where many files are new.
+class SnoIndex:
+    FORMAT_VERSION = 1
+    PARALLEL_MIN_FILES = 64  # fewer files to read are not worth starting processes
+
+    def __init__(self, snos_path: str, path: str = None, output_dir='output'):
+        self.snos_path = snos_path
+        self.path = path if path is not None else self.default_path(snos_path, output_dir)
+        self.parallel: int = os.cpu_count()  # number of processes to read new sno files with
+        self.paths: list[str] = list()  # lower-case relative paths
+        self.records = np.zeros(0, METADATA_DTYPE)
+        self.errors: dict[str, str] = dict()  # lower-case relative path -> error message, for files that could not be read
+        self.row_indexes: dict[str, int] = dict()
+
+    @staticmethod
+    def default_path(snos_path: str, output_dir: str) -> str:
+        # one index per terrain dir, e.g. for several mods
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(snos_path)).encode('utf-8')).hexdigest()
+        return os.path.join(output_dir, f'sno-index-{key}.pickle')
+
+    def load(self) -> bool:
+        try:
+            with open(self.path, 'rb') as index_file:
+                version, snos_path, paths, records, errors = pickle.load(index_file)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+            return False
+        if version != self.FORMAT_VERSION or snos_path != os.path.abspath(self.snos_path):
+            return False
+        self.paths, self.records, self.errors = paths, records, errors
+        self.row_indexes = {path: i for i, path in enumerate(paths)}
+        return True
+
+    def store(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}-{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as index_file:
+            pickle.dump((self.FORMAT_VERSION, os.path.abspath(self.snos_path), self.paths, self.records, self.errors), index_file, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def read_all(self, full_paths: list[str]) -> list[tuple]:
+        if self.parallel is None or self.parallel < 2 or len(full_paths) < self.PARALLEL_MIN_FILES:
+            return [read_metadata(path) for path in full_paths]
+        chunksize = max(1, len(full_paths) // (self.parallel * 4))
+        with ProcessPoolExecutor(self.parallel) as pool:
+            return list(pool.map(read_metadata, full_paths, chunksize=chunksize))
+
+    def refresh(self, rel_paths: list[str]) -> int:
+        # brings the index to the given sno files (relative paths as found on disk), returns the number of files read
+        records = np.zeros(len(rel_paths), METADATA_DTYPE)
+        errors = dict()
+        to_read = list()  # (row, stat)
+        for i, rel_path in enumerate(rel_paths):
+            key = rel_path.lower()
+            stat = os.stat(os.path.join(self.snos_path, rel_path))
+            known = self.row_indexes.get(key)
+            if known is not None and self.records[known]['mtime_ns'] == stat.st_mtime_ns and self.records[known]['size'] == stat.st_size:
+                records[i] = self.records[known]
+                if key in self.errors:
+                    errors[key] = self.errors[key]
+            else:
+                to_read.append((i, stat))
+        results = self.read_all([os.path.join(self.snos_path, rel_paths[i]) for i, _ in to_read])
+        for (i, stat), (record, error) in zip(to_read, results):
+            if record is not None:
+                records[i] = record
+            else:
+                records['mtime_ns'][i], records['size'][i] = stat.st_mtime_ns, stat.st_size  # not read again until it changes
+                errors[rel_paths[i].lower()] = error
+        paths = [rel_path.lower() for rel_path in rel_paths]
+        changed = len(to_read) > 0 or paths != self.paths
+        self.paths, self.records, self.errors = paths, records, errors
+        self.row_indexes = {path: i for i, path in enumerate(paths)}
+        if changed:
+            self.store()
+        return len(to_read)
+
+    def get_metadata(self, path: str) -> SnoMetaData or None:
+        # path: relative; None for files that could not be read, see get_error
+        key = path.lower()
+        if key in self.errors:
+            return None
+        return SnoMetaData(self.records[self.row_indexes[key]])
+
+    def get_error(self, path: str) -> str or None:
+        return self.errors.get(path.lower())
+
+
+def main(argv):
+    index = SnoIndex(argv[0])
+    index.load()
+    num_read = index.refresh([os.path.relpath(path, argv[0]) for path in Path(argv[0]).rglob('*.sno')])
+    print(f'{len(index.paths)} snos ({num_read} read), {int(index.records["has_floor"].sum())} with floor, {int(index.records["has_water"].sum())} with water, {len(index.errors)} errors, index: {index.path}')
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main(sys.argv[1:]))
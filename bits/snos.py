@@ -2,6 +2,7 @@ import os.path
 from pathlib import Path
 
 from bits.nnk import NNK
+from bits.sno_index import SnoIndex, SnoMetaData
 from sno.sno_handler import SnoHandler
 
 
@@ -9,11 +10,19 @@ class SNOs:
     def __init__(self, path: str, nnk: NNK):
         self.path = path
         self.snos: dict[str, SnoHandler] = dict()
+        self.sno_file_paths: list[str] = list()  # relative paths as found on disk
         self._load_sno_paths()
         self.nnk = nnk
+        self.sno_paths_by_name: dict[str, str] = None  # lower-case mesh name -> sno path, see precompute_names
+        self.index: SnoIndex = None  # metadata of all snos, see get_index
+
+    @property
+    def num_files(self) -> int:
+        return len(self.snos)
 
     def _load_sno_paths(self):
-        for path in self._get_paths():
+        self.sno_file_paths = self._get_paths()
+        for path in self.sno_file_paths:
             self.snos[path.lower()] = None
 
     def _get_paths(self):
@@ -29,12 +38,31 @@ class SNOs:
             self.snos[path] = self._load_sno(path)
         return self.snos[path]
 
-    def get_sno_by_name(self, name) -> SnoHandler:
+    def lookup_sno_path(self, name) -> str:
+        if self.sno_paths_by_name is not None:
+            path = self.sno_paths_by_name.get(name.lower())
+            if path is not None:
+                return path
         path = self.nnk.lookup_file(name + '.sno').lower()
         root_path = 'terrain' + os.path.sep
         assert path.startswith(root_path), path
-        path = path[len(root_path):]
-        return self.get_sno_by_path(path)
+        return path[len(root_path):]
+
+    def precompute_names(self):
+        # one dict lookup per name from then on; names found in several dirs are left to the nnk
+        paths_by_name = dict()
+        ambiguous = set()
+        for path in self.snos:
+            name = self.get_name_for_path(path)
+            if name in paths_by_name:
+                ambiguous.add(name)
+            paths_by_name[name] = path
+        for name in ambiguous:
+            del paths_by_name[name]
+        self.sno_paths_by_name = paths_by_name
+
+    def get_sno_by_name(self, name) -> SnoHandler:
+        return self.get_sno_by_path(self.lookup_sno_path(name))
 
     @classmethod
     def get_name_for_path(cls, path: str) -> str:
@@ -42,12 +70,29 @@ class SNOs:
         assert os.path.sep in path
         return path[path.rindex(os.path.sep)+1:-4]
 
+    def get_index(self) -> SnoIndex:
+        # loaded & brought up to date on first use - only new or changed files are read
+        if self.index is None:
+            index = SnoIndex(self.path)
+            index.load()
+            index.refresh(self.sno_file_paths)
+            self.index = index
+        return self.index
+
+    def get_metadata(self, path) -> SnoMetaData:
+        # counts, bounding box & floor/water flags without loading the sno; None if it could not be read
+        return self.get_index().get_metadata(path)
+
+    def get_metadata_by_name(self, name) -> SnoMetaData:
+        return self.get_metadata(self.lookup_sno_path(name))
+
     def print(self, indent='', info='data'):
+        index = self.get_index() if info == 'data' else None
         for sno_path in self.snos:
             print(indent + self.get_name_for_path(sno_path))
             if info == 'data':
-                try:
-                    sno = self.get_sno_by_path(sno_path)
-                    sno.print(indent + '  ')
-                except Exception as e:
-                    print(indent + f'  {e.__class__.__name__} Exception: {e}')
+                metadata = index.get_metadata(sno_path)
+                if metadata is not None:
+                    SnoHandler.print_sno(metadata, indent + '  ')
+                else:
+                    print(indent + '  ' + index.get_error(sno_path))
@@ -0,0 +1,134 @@
+import os
+import pickle
+import re
+import sys
+import threading
+
+from gas.gas_cache import GasCache
+from gas.gas_dir import GasDir
+
+
+# Lightweight index of a templates dir: template name -> file, byte offset of the header, specializes & component headers.
+# Built by a fast text scan instead of a full parse, persisted next to the gas cache if that is enabled, and refreshed per file by mtime & size.
+# It only tells where to look - the files involved are still parsed for real when a template is loaded.
+class TemplateIndex:
+    FORMAT_VERSION = 1
+    TOKEN_RE = re.compile(
+        rb'\[\[.*?\]\]'  # multiline values
+        rb'|/\*.*?\*/|//[^\n]*'  # comments
+        rb'|"[^"]*"'
+        rb'|^[ \t]*(?:\w[ \t]+)?specializes[ \t]*=[ \t]*"?(?P<specializes>[^";\r\n]*?)"?[ \t]*;'
+        rb'|\[(?P<header>[^\]\r\n]*)\]'
+        rb'|[{}]',
+        re.DOTALL | re.MULTILINE | re.IGNORECASE)
+    TEMPLATE_HEADER_RE = re.compile(rb'\s*t\s*:\s*template\s*,\s*n\s*:\s*(.*?)\s*', re.IGNORECASE)
+
+    def __init__(self, gas_dir: GasDir, path: str = None):
+        self.gas_dir = gas_dir
+        self.path = path if path is not None else self.default_path(gas_dir.path)  # None: not persisted
+        self.files: dict[str, tuple[int, int, list[tuple]]] = dict()  # relative path -> mtime, size, entries
+        self.templates: dict[str, tuple[str, int, str, tuple[str]]] = dict()  # lower-case name -> relative path, offset, specializes, components
+
+    @staticmethod
+    def default_path(templates_path: str) -> str or None:
+        return GasCache.get_side_file_path(templates_path, '.templates.pickle')
+
+    @classmethod
+    def scan_text(cls, data: bytes) -> list[tuple]:
+        # entries: (name, byte offset of the header, specializes, component headers)
+        entries = list()
+        blocks = list()  # open blocks: template entry or None
+        open_templates = list()  # (entry, depth) - nested if closing braces are missing
+        pending_header = None
+        for match in cls.TOKEN_RE.finditer(data):
+            token = match.group(0)
+            if match.group('header') is not None:
+                pending_header = (match.start(), match.group('header'))
+            elif token == b'{':
+                entry = None
+                if pending_header is not None:
+                    offset, header = pending_header
+                    template_match = cls.TEMPLATE_HEADER_RE.fullmatch(header)
+                    if template_match is not None:
+                        entry = [template_match.group(1).decode('ANSI'), offset, None, list()]
+                        entries.append(entry)
+                    elif len(open_templates) > 0 and open_templates[-1][1] == len(blocks):
+                        open_templates[-1][0][3].append(header.strip().decode('ANSI'))
+                blocks.append(entry)
+                if entry is not None:
+                    open_templates.append((entry, len(blocks)))
+                pending_header = None
+            elif token == b'}':
+                if len(blocks) > 0 and blocks.pop() is not None:
+                    open_templates.pop()
+            elif match.group('specializes') is not None:
+                if len(open_templates) > 0 and open_templates[-1][1] == len(blocks):
+                    open_templates[-1][0][2] = match.group('specializes').strip().decode('ANSI')
+        return [(name, offset, specializes, tuple(components)) for name, offset, specializes, components in entries]
+
+    @classmethod
+    def scan_file(cls, path: str) -> list[tuple]:
+        with open(path, 'rb') as gas_file:
+            return cls.scan_text(gas_file.read())
+
+    def load(self) -> bool:
+        if self.path is None:
+            return False
+        try:
+            with open(self.path, 'rb') as index_file:
+                version, files = pickle.load(index_file)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+            return False
+        if version != self.FORMAT_VERSION:
+            return False
+        self.files = files
+        return True
+
+    def store(self):
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}-{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as index_file:
+            pickle.dump((self.FORMAT_VERSION, self.files), index_file, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def refresh(self) -> int:
+        # re-scans new & changed files, returns their number
+        files = dict()
+        num_scanned = 0
+        for gas_file in self.gas_dir.iter_gas_files():
+            rel_path = os.path.relpath(gas_file.path, self.gas_dir.path)
+            stat = os.stat(gas_file.path)
+            known = self.files.get(rel_path)
+            if known is not None and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+                files[rel_path] = known
+            else:
+                files[rel_path] = (stat.st_mtime_ns, stat.st_size, self.scan_file(gas_file.path))
+                num_scanned += 1
+        changed = num_scanned > 0 or len(files) != len(self.files)
+        self.files = files
+        self.templates = dict()
+        for rel_path, (_, _, entries) in files.items():
+            for name, offset, specializes, components in entries:
+                self.templates[name.lower()] = (rel_path, offset, specializes, components)
+        if changed:
+            self.store()
+        return num_scanned
+
+    def lookup(self, template_name: str):
+        return self.templates.get(template_name.lower())
+
+
+def main(argv):
+    index = TemplateIndex(GasDir(argv[0]))
+    index.load()
+    num_scanned = index.refresh()
+    print(f'{len(index.templates)} templates in {len(index.files)} files ({num_scanned} files scanned), index: {index.path}')
+    for name in argv[1:]:
+        print(name, index.lookup(name))
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main(sys.argv[1:]))
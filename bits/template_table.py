@@ -0,0 +1,60 @@
+from typing import Callable, Union
+
+import numpy
+
+from .templates import Template
+
+
+# Columnar extraction of template values for bulk analytics:
+# one pass over a set of templates, inheritance resolved, one numpy float array per column.
+# Missing values are NaN, so rows can be filtered with numpy.isnan & friends; unparsable values raise ValueError.
+class TemplateTable:
+    def __init__(self, names: list[str], columns: dict[str, numpy.ndarray], floats: dict[str, numpy.ndarray]):
+        self.names = names  # row labels
+        self.columns = columns
+        self.floats = floats  # per column: which values were given as floats rather than ints, for printing them as given
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, column: str) -> numpy.ndarray:
+        return self.columns[column]
+
+    @staticmethod
+    def parse_number(value) -> (float, bool):
+        # -> value, whether it is a float
+        if value is None:
+            return numpy.nan, False
+        if isinstance(value, str):
+            value = value.split()[0]  # dsx_zaurask_commander damage_max has garbage after a missing semicolon
+            try:
+                return int(value), False
+            except ValueError:
+                return float(value), True
+        return value, isinstance(value, float)
+
+    # columns: column name -> attr path (as for Template.compute_value) or function of the template
+    @classmethod
+    def extract(cls, templates: Union[dict[str, Template], list[Template]], columns: dict[str, Union[tuple, Callable]], names: list[str] = None) -> 'TemplateTable':
+        if isinstance(templates, dict):
+            names = list(templates.keys()) if names is None else names
+            templates = list(templates.values())
+        elif names is None:
+            names = [t.name.lower() for t in templates]
+        assert len(names) == len(templates)
+        arrays = {column: numpy.empty(len(templates)) for column in columns}
+        floats = {column: numpy.zeros(len(templates), bool) for column in columns}
+        getters = [(arrays[column], floats[column], spec if callable(spec) else (lambda t, path=spec: t.compute_value(*path))) for column, spec in columns.items()]
+        parse_number = cls.parse_number
+        for i, template in enumerate(templates):
+            for array, is_float, getter in getters:
+                array[i], is_float[i] = parse_number(getter(template))
+        return TemplateTable(names, arrays, floats)
+
+    def select(self, mask: numpy.ndarray) -> 'TemplateTable':
+        names = [name for name, selected in zip(self.names, mask) if selected]
+        return TemplateTable(names, {column: array[mask] for column, array in self.columns.items()}, {column: array[mask] for column, array in self.floats.items()})
+
+    def cell_values(self, column: str) -> list:
+        # for printing: None for NaN, ints & floats as given
+        return [None if numpy.isnan(v) else v if is_float else int(v) for v, is_float in zip(self.columns[column].tolist(), self.floats[column].tolist())]
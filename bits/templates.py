@@ -1,14 +1,80 @@
+import operator
 import os
 from pathlib import Path
 
-from gas.gas import Section, Gas
+from gas.gas import Attribute, Section, Gas
 from gas.gas_dir import GasDir
 from gas.gas_file import GasFile
 
-from .gas_dir_handler import GasDirHandler
+from .gas_dir_handler import GasDirHandler, profile_load
+from .template_index import TemplateIndex
+
+
+# cheap check whether items got added to, removed from, replaced or renamed in any of the sections since the snapshot.
+# keeps a copy of each items list and compares them in bulk; a base snapshot's sections & copies are shared, not copied again
+class SectionsSnapshot:
+    get_items = operator.attrgetter('items')
+
+    def __init__(self, sections: list[Section], base: 'SectionsSnapshot' = None):
+        self.indexes = [section.get_index() for section in sections]
+        self.items = [list(items) for items in map(self.get_items, sections)]
+        self.sections = sections
+        if base is not None:
+            self.indexes += base.indexes
+            self.items += base.items
+            self.sections = sections + base.sections
+        self.renames = Gas.rename_log.version
+
+    def is_current(self) -> bool:
+        if list(map(self.get_items, self.sections)) != self.items:
+            return False
+        renames = Gas.rename_log.version
+        if self.renames != renames:
+            if not all(section.get_index() is index for section, index in zip(self.sections, self.indexes)):
+                return False
+            self.renames = renames
+        return True
+
+
+# flattened view of a template and all its base templates, see Template.get_resolved
+class ResolvedTemplate:
+    def __init__(self, template: 'Template', parent: 'ResolvedTemplate' = None):
+        self.parent = parent
+        self.tree_edits = Template.tree_edits
+        # the sections of this template & its base templates, attr values are looked up live so only their structure matters
+        self.snapshot = SectionsSnapshot([template.section] + template.section.get_sections(), parent.snapshot if parent is not None else None)
+        self.ancestors: set[str] = {template.name}
+        self.components: set[str] = set()
+        self.attrs: dict[str, Attribute] = dict()  # lower-case name -> last attr; top-level attrs
+        self.component_attrs: dict[str, dict[str, Attribute]] = dict()  # component -> lower-case name -> last attr
+        if parent is not None:
+            self.ancestors |= parent.ancestors
+            self.components |= parent.components
+            self.attrs.update(parent.attrs)
+            self.component_attrs.update(parent.component_attrs)  # inner dicts are shared until overridden
+        for attr in template.section.get_attrs():
+            self.attrs[attr.name.lower()] = attr
+        own_component_attrs: dict[str, dict[str, Attribute]] = dict()
+        for component_section in template.section.get_sections():
+            self.components.add(component_section.header)
+            comp_attrs = own_component_attrs.get(component_section.header)
+            if comp_attrs is None:
+                comp_attrs = dict(self.component_attrs.get(component_section.header, ()))
+                own_component_attrs[component_section.header] = comp_attrs
+            for attr in component_section.get_attrs():
+                comp_attrs[attr.name.lower()] = attr  # last one wins
+        self.component_attrs.update(own_component_attrs)
+
+    def get_attr(self, *attr_path: str) -> Attribute:
+        if len(attr_path) == 1:
+            return self.attrs.get(attr_path[0].lower())
+        comp_attrs = self.component_attrs.get(attr_path[0])
+        return comp_attrs.get(attr_path[1].lower()) if comp_attrs is not None else None
 
 
 class Template:
+    tree_edits = 0  # bumped whenever a template gets (re-)connected
+
     def __init__(self, section: Section):
         self.section = section
         assert section.has_t_n_header('template')
@@ -24,8 +90,34 @@ class Template:
         self.specializes: str = specializes
 
         # these are set when connecting the template tree:
-        self.parent_template = None
+        self._parent_template = None
         self.child_templates = []
+        # euler tour numbering, set by Templates.number_template_tree: descendants are numbered tree_index <= i < tree_end
+        self.tree_index: int = None
+        self.tree_end: int = None
+        self._resolved: ResolvedTemplate = None
+
+    @property
+    def parent_template(self) -> 'Template':
+        return self._parent_template
+
+    @parent_template.setter
+    def parent_template(self, parent_template: 'Template'):
+        self._parent_template = parent_template
+        Template.tree_edits += 1  # invalidates resolved views & the tree numbering
+
+    # lazily built, cached until the sections of this template or a base template change, or a base template gets re-connected.
+    def get_resolved(self) -> ResolvedTemplate:
+        resolved = self._resolved
+        if resolved is not None and resolved.tree_edits == Template.tree_edits and resolved.snapshot.is_current():
+            return resolved
+        parent = self.parent_template.get_resolved() if self.specializes is not None and self.parent_template is not None else None
+        if resolved is not None and resolved.parent is parent and resolved.snapshot.is_current():
+            resolved.tree_edits = Template.tree_edits  # some other template got re-connected
+        else:
+            resolved = ResolvedTemplate(self, parent)
+            self._resolved = resolved
+        return resolved
 
     @property
     def wl_prefix(self):
@@ -48,27 +140,18 @@ class Template:
         return results
 
     def is_descendant_of(self, template_name) -> bool:
-        if self.name == template_name:
-            return True
-        if self.specializes is None:
-            return False
-        return self.parent_template.is_descendant_of(template_name)
+        return template_name in self.get_resolved().ancestors
 
     def is_leaf(self) -> bool:
         return len(self.child_templates) == 0
 
     def has_component(self, component_name) -> bool:
-        if len(self.section.get_sections(component_name)) > 0:
-            return True
-        if self.specializes is None:
-            return False
-        return self.parent_template.has_component(component_name)
+        return component_name in self.get_resolved().components
 
     def compute_value(self, *attr_path):
         if len(attr_path) <= 2:
-            attr = self.section.resolve_attr(*attr_path)
-            if attr is not None:
-                return attr.value
+            attr = self.get_resolved().get_attr(*attr_path)
+            return attr.value if attr is not None else None
         else:
             # template gas inheritance is not fully transparent, only up to the level of component-section properties
             section = self.section.resolve_section(*attr_path[:2])
@@ -117,6 +200,16 @@ class Templates(GasDirHandler):
         super().__init__(gas_dir)
         self.templates: dict[str, Template] = None
         self.ignore_duplicate_template_names = False
+        self.parallel_loading: int = None  # number of processes to parse the template files with
+        self.tree_order: list[Template] = None  # templates in pre-order, so every subtree is a contiguous slice
+        self.tree_order_stamp: int = None
+        self.component_index: dict[str, dict[str, Template]] = None  # component -> templates that have it, directly or inherited
+        self.component_index_tree_order: list[Template] = None  # the component index was built for
+        self.component_index_snapshot: SectionsSnapshot = None  # of the template sections in tree order
+        # on-demand loading of single templates, see get_template
+        self.index: TemplateIndex = None
+        self.loaded_templates: dict[str, Template] = dict()
+        self.loaded_files: set[str] = set()
 
     @classmethod
     def do_load_templates_gas(cls, gas: Gas) -> list[Template]:
@@ -147,7 +240,16 @@ class Templates(GasDirHandler):
 
     def load_templates(self):
         self.templates = {}
+        if self.parallel_loading is not None:
+            self.gas_dir.load_all(self.parallel_loading)
         self.load_templates_rec_files(self.gas_dir, self.templates)
+        # keep the objects already handed out by get_template, so there is one Template per template section
+        for name, template in self.loaded_templates.items():
+            loaded = self.templates.get(name)
+            if loaded is not None and loaded.section is template.section:
+                self.templates[name] = template
+        self.loaded_templates = dict()
+        self.loaded_files = set()
 
     def connect_template_tree(self):
         for name, template in self.templates.items():
@@ -156,30 +258,129 @@ class Templates(GasDirHandler):
                 assert parent_template is not None, name + ' -> ' + template.specializes
                 template.parent_template = parent_template
                 parent_template.child_templates.append(template)
+        self.number_template_tree()
+        self.build_component_index()
+
+    def number_template_tree(self):
+        tree_order = list()
+        for root in self.templates.values():
+            if root.parent_template is not None:
+                continue
+            stack = [(root, False)]
+            while len(stack) > 0:
+                template, done = stack.pop()
+                if done:
+                    template.tree_end = len(tree_order)
+                    continue
+                template.tree_index = len(tree_order)
+                tree_order.append(template)
+                stack.append((template, True))
+                stack.extend((child, False) for child in reversed(template.child_templates))
+        self.tree_order = tree_order
+        self.tree_order_stamp = Template.tree_edits
+
+    def get_tree_order(self) -> list[Template]:
+        self.get_templates()
+        if self.tree_order_stamp != Template.tree_edits:
+            self.number_template_tree()  # renumber after re-parenting
+        return self.tree_order
+
+    def build_component_index(self):
+        tree_order = self.get_tree_order()
+        holders: dict[str, list[Template]] = dict()  # templates that have the component themselves, in pre-order
+        for template in tree_order:
+            for header in {section.header for section in template.section.get_sections()}:
+                holders.setdefault(header, []).append(template)
+        component_index = dict()
+        for header, header_holders in holders.items():
+            templates = dict()
+            end = 0
+            for holder in header_holders:
+                if holder.tree_index >= end:  # not already covered by the subtree of a previous holder
+                    templates.update((t.name.lower(), t) for t in tree_order[holder.tree_index:holder.tree_end])
+                    end = holder.tree_end
+            component_index[header] = templates
+        self.component_index = component_index
+        self.component_index_tree_order = tree_order
+        self.component_index_snapshot = SectionsSnapshot([template.section for template in tree_order])
+
+    def with_component(self, component_name: str) -> dict[str, Template]:
+        tree_order = self.get_tree_order()
+        # gas edits may have added or removed components, renumbering replaces the tree order
+        if self.component_index is None or self.component_index_tree_order is not tree_order or not self.component_index_snapshot.is_current():
+            self.build_component_index()
+        return self.component_index.get(component_name, {})
 
     def get_templates(self) -> dict[str, Template]:
         if self.templates is None:
-            self.load_templates()
+            profile_load(self.on_load, self.load_templates)
             self.connect_template_tree()
         return self.templates
 
+    def get_index(self) -> TemplateIndex:
+        if self.index is None:
+            self.index = TemplateIndex(self.gas_dir)
+            self.index.load()
+            self.index.refresh()
+        return self.index
+
+    # looks up one template without loading all of them: only the files of the template & its base templates are parsed.
+    # templates loaded this way know their base templates but not their child templates - until get_templates loads all, keeping the same objects.
+    def get_template(self, template_name: str) -> Template:
+        if self.templates is not None:
+            return self.templates.get(template_name.lower())
+        template = self.loaded_templates.get(template_name.lower())
+        if template is None:
+            entry = self.get_index().lookup(template_name)
+            if entry is None or entry[0] in self.loaded_files:
+                return None
+            self.loaded_files.add(entry[0])
+            rel_path = entry[0].split(os.sep)
+            gas_file = self.gas_dir.get_subdir(rel_path[:-1]).get_gas_file(rel_path[-1][:-4])
+            self.load_templates_file(gas_file, self.loaded_templates)
+            template = self.loaded_templates.get(template_name.lower())
+            if template is None:
+                return None  # index was off
+        if template.specializes is not None and template.parent_template is None:
+            parent_template = self.get_template(template.specializes)
+            assert parent_template is not None, template.name + ' -> ' + template.specializes
+            template.parent_template = parent_template
+        return template
+
+    def is_descendant(self, template: Template, ancestor_name: str) -> bool:
+        self.get_tree_order()
+        ancestor = self.templates.get(ancestor_name.lower())
+        return ancestor is not None and ancestor.tree_index <= template.tree_index < ancestor.tree_end
+
+    def descendants(self, template_name: str, leaf_only=False) -> dict[str, Template]:
+        tree_order = self.get_tree_order()
+        ancestor = self.templates[template_name.lower()]
+        subtree = tree_order[ancestor.tree_index:ancestor.tree_end]
+        return {t.name.lower(): t for t in subtree if not leaf_only or t.is_leaf()}
+
+    def get_resolved(self, template_name: str) -> ResolvedTemplate:
+        template = self.get_template(template_name)
+        assert template is not None, template_name
+        return template.get_resolved()
+
     def get_actor_templates(self, leaf_only=True) -> dict[str, Template]:
         actor_templates = dict()
+        actor_component_templates = self.with_component('actor')
         for n, t in self.get_templates().items():
             # goblin templates are actually subclassed by dsx (albeit unused) but it somehow still works for the existing objects placed in map_world/gi_r3
             # dsx_utraean_townfolk_male_03 is also subclassed, by ilorn, and both are used, wtf were they doing
             if not leaf_only or t.is_leaf() or t.regular_name in ['goblin_inventor', 'goblin_robo_suit', 'dsx_utraean_townfolk_male_03']:
-                if t.is_descendant_of('actor') or t.has_component('actor'):  # dsx_darkgenerator_clockroom has [actor] but is derived from prop
+                if self.is_descendant(t, 'actor') or n in actor_component_templates:  # dsx_darkgenerator_clockroom has [actor] but is derived from prop
                     actor_templates[n] = t
         return actor_templates
 
     def get_enemy_templates(self) -> dict[str, Template]:
         enemy_templates = dict()
         for n, t in self.get_actor_templates().items():
-            if t.is_descendant_of('actor_evil') and t.compute_value('actor', 'alignment') == 'aa_evil':
+            if self.is_descendant(t, 'actor_evil') and t.compute_value('actor', 'alignment') == 'aa_evil':
                 enemy_templates[n] = t
             # dragon & goblin_robo_suit are actor_custom; gom is initially aa_good
-            elif t.is_descendant_of('actor_custom') or t.regular_name == 'gom':
+            elif self.is_descendant(t, 'actor_custom') or t.regular_name == 'gom':
                 enemy_templates[n] = t
         return enemy_templates
 
@@ -214,7 +415,7 @@ class Templates(GasDirHandler):
         templates = dict()
         for n, t in self.get_templates().items():
             if t.is_leaf():
-                if ancestor is None or t.is_descendant_of(ancestor):
+                if ancestor is None or self.is_descendant(t, ancestor):
                     templates[n] = t
         return templates
 
@@ -222,7 +423,7 @@ class Templates(GasDirHandler):
         templates = dict()
         for n, t in self.get_templates().items():
             if not leaf_only or t.is_leaf():
-                if ancestor is None or t.is_descendant_of(ancestor):
+                if ancestor is None or self.is_descendant(t, ancestor):
                     templates[n] = t
         return templates
 
@@ -15,6 +15,7 @@ from build.check_rivers import check_rivers
 from build.check_gizmo_placement import check_gizmo_placement
 from build.check_tips import check_tips
 from build.check_waters import check_waters
+from gas.gas_cache import GasCache
 
 
 class PreBuildCheck:
@@ -148,6 +149,7 @@ def init_arg_parser():
     parser.add_argument('--exclude', nargs='+', choices=set(PRE_BUILD_CHECKS.keys()))
     parser.add_argument('--fix', action='store_true')
     parser.add_argument('--bits', default='DSLOA')
+    GasCache.add_arguments(parser)
     return parser
 
 
@@ -158,6 +160,7 @@ def parse_args(argv: list[str]):
 
 def main(argv: list[str]) -> int:
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     valid = pre_build_checks(args.bits, args.map, args.check, args.exclude, args.fix)
     return 0 if valid else -1
 
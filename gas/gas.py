@@ -1,13 +1,78 @@
+import sys
+import threading
+from collections import deque
+
 from gas.molecules import Hex, Position, Quaternion
 
 
+_PENDING = object()  # placeholder for a value that is not decoded yet
+_DECODED_DATATYPES = frozenset(['b', 'i', 'f', 'd', 'x', 'p'])  # datatypes whose values get converted from str
+
+
 class Attribute:
+    __slots__ = ('_name', '_value', '_raw', 'datatype')  # millions of these in a loaded Bits tree
+
     def __init__(self, name: str, value, datatype: str = None):
         value, datatype = self.process_value(value, datatype)
-        self.name = name
-        self.value = value
+        self._name = sys.intern(name)  # names repeat a lot
+        self._value = value
+        self._raw = None  # raw string of a deferred attr, as long as the value is unmodified
         self.datatype = datatype
 
+    @classmethod
+    def deferred(cls, name: str, raw: str, datatype: str = None) -> 'Attribute':
+        if datatype not in _DECODED_DATATYPES:
+            return cls(name, raw, datatype)  # nothing to decode
+        attr = cls.__new__(cls)
+        attr._name = sys.intern(name)
+        attr._value = _PENDING
+        attr._raw = raw
+        attr.datatype = datatype
+        return attr
+
+    @classmethod
+    def parsed(cls, name: str, raw: str, datatype: str = None) -> 'Attribute':
+        # same as cls(name, raw, datatype) for a raw value string, minus the checks for values of other types
+        attr = cls.__new__(cls)
+        attr._name = sys.intern(name)
+        attr._value = raw if datatype is None or datatype not in _DECODED_DATATYPES else _DECODERS[datatype](raw)
+        attr._raw = None
+        attr.datatype = datatype
+        return attr
+
+    def set_deferred(self, raw: str):
+        # keeps the raw string, typed values are decoded on first access
+        if self.datatype in _DECODED_DATATYPES:
+            self._value = _PENDING
+            self._raw = raw
+        else:
+            self.set_value(raw, self.datatype)  # nothing to decode
+
+    @property
+    def value(self):
+        value = self._value
+        if value is _PENDING:
+            value, _ = self.process_value(self._raw, self.datatype)
+            self._value = value
+            if isinstance(value, Position):
+                self._raw = None  # mutable - raw string could go stale
+        return value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self._raw = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, name: str):
+        old_name = self._name
+        self._name = sys.intern(name)
+        Gas.rename_log.log(self, old_name)
+
     @classmethod
     def parse_bool(cls, value):
         assert value in ['true', 'false'], value
@@ -64,13 +129,16 @@ class Attribute:
 
     @property
     def value_str(self):
-        assert self.value is not None, self.name
-        if isinstance(self.value, bool):
-            return 'true' if self.value else 'false'
-        elif isinstance(self.value, float):
-            return self.format_float(self.value)
+        if self._raw is not None:
+            return self._raw  # unmodified deferred value, exactly as parsed
+        value = self.value
+        assert value is not None, self.name
+        if isinstance(value, bool):
+            return 'true' if value else 'false'
+        elif isinstance(value, float):
+            return self.format_float(value)
         else:
-            return str(self.value)
+            return str(value)
 
     def __str__(self):
         datatype_str = ' (' + self.datatype + ')' if self.datatype is not None else ''
@@ -80,24 +148,141 @@ class Attribute:
         print(indent + str(self))
 
     def copy(self):
+        if self._raw is not None:
+            # unmodified deferred value: the copy keeps the raw string and decodes its own value on first access
+            copy = Attribute.__new__(Attribute)
+            copy._name = self._name
+            copy._value = _PENDING
+            copy._raw = self._raw
+            copy.datatype = self.datatype
+            return copy
         copy = Attribute(self.name, self.value_str, self.datatype)
         assert str(copy) == str(self)  # safety check
         return copy
 
+    def pack(self) -> tuple:
+        if self._value is _PENDING:
+            return self.name, self._raw, self.datatype, True  # stays deferred
+        value = self.value
+        if isinstance(value, Hex):
+            value = int(value)
+        elif isinstance(value, Position):
+            value = (value.x, value.y, value.z, int(value.node_guid))
+        return self.name, value, self.datatype
+
+    @classmethod
+    def unpack(cls, packed: tuple) -> 'Attribute':
+        if len(packed) == 4:
+            return cls.deferred(*packed[:3])
+        name, value, datatype = packed
+        if datatype == 'x' and isinstance(value, int):
+            value = Hex(value)
+        elif datatype == 'p' and isinstance(value, tuple):
+            x, y, z, node_guid = value
+            value = Position(x, y, z, Hex(node_guid))
+        attr = cls.__new__(cls)  # values are already processed - multiline values may even be raw strings despite their datatype
+        attr._name = sys.intern(name)
+        attr._value = value
+        attr._raw = None
+        attr.datatype = datatype
+        return attr
+
+
+# str -> value per datatype, as in Attribute.process_value
+_DECODERS = {'b': Attribute.parse_bool, 'i': int, 'f': float, 'd': float, 'x': Hex.parse, 'p': Position.parse}
+
+
+class RenameLog:
+    # attr renames & section header changes, for checking lookup indexes. version counts the renames so far.
+    # keeps ids instead of the items, so it holds on to nothing - an id reused by another item at worst causes an index rebuild
+    MAX_ENTRIES = 1024
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = 0
+        self.entries: deque[tuple[int, str, bool]] = deque(maxlen=self.MAX_ENTRIES)  # (item id, old name, is attr) of the last renames
+
+    def log(self, item, old_name: str):
+        with self.lock:
+            self.version += 1
+            self.entries.append((id(item), old_name, isinstance(item, Attribute)))
+
+    def get_since(self, version: int) -> (int, list[tuple[int, str, bool]]):
+        # -> current version & the renames after the given version; None for the renames if they are not all logged anymore
+        with self.lock:
+            num_renames = self.version - version
+            if num_renames > len(self.entries):
+                return self.version, None
+            return self.version, [self.entries[-i] for i in range(num_renames, 0, -1)]
+
+
+class GasIndex:
+    # lookup index of a Gas, see Gas.get_index
+    __slots__ = ('items', 'num_items', 'last_item', 'renames', 'attrs_by_name', 'sections_by_header', 'attrs', 'sections')
+
+    def __init__(self, items: list):
+        self.items = items  # the indexed list, with its length & last item at indexing time
+        self.num_items = len(items)
+        self.last_item = items[-1] if self.num_items > 0 else None
+        self.renames = Gas.rename_log.version  # checked up to
+        self.attrs: list[Attribute] = list()
+        self.sections: list[Section] = list()
+        self.attrs_by_name: dict[str, list[Attribute]] = dict()  # lower-case name -> attrs
+        self.sections_by_header: dict[str, list[Section]] = dict()
+        for item in items:
+            if isinstance(item, Section):
+                self.sections.append(item)
+                self.sections_by_header.setdefault(item.header, []).append(item)
+            elif isinstance(item, Attribute):
+                self.attrs.append(item)
+                self.attrs_by_name.setdefault(item.name.lower(), []).append(item)
+
+    def is_renamed(self) -> bool:
+        # whether any indexed item got renamed since the index was last checked
+        version, renames = Gas.rename_log.get_since(self.renames)
+        if renames is None:
+            return True
+        for item_id, old_name, is_attr in renames:
+            indexed = self.attrs_by_name.get(old_name.lower()) if is_attr else self.sections_by_header.get(old_name)
+            if indexed is not None and any(id(i) == item_id for i in indexed):
+                return True
+        self.renames = version
+        return False
+
 
 class Gas:  # content of a gas file
+    __slots__ = ('items', '_index')
+    rename_log = RenameLog()
+
     def __init__(self, items=None):
         self.items = items if items is not None else list()  # sections
+        self._index: GasIndex = None  # lazy lookup index, see get_index
+
+    def invalidate_index(self):
+        # only needed after replacing items in place (items[i] = x), other changes to items are noticed
+        self._index = None
+
+    # lookup index: lower-case attr name -> attrs, header -> sections.
+    # rebuilt lazily when the items list was replaced or changed in length or last item, or when an indexed item got renamed
+    def get_index(self) -> GasIndex:
+        index = self._index
+        items = self.items
+        num_items = len(items)
+        if index is None or index.items is not items or index.num_items != num_items or (num_items > 0 and index.last_item is not items[-1]) \
+                or (index.renames != Gas.rename_log.version and index.is_renamed()):
+            index = GasIndex(items)
+            self._index = index
+        return index
 
     def print(self, indent=''):
         for item in self.items:
             item.print(indent)
 
     def get_sections(self, header=None):
-        sections = [item for item in self.items if isinstance(item, Section)]
-        if header is not None:
-            sections = [section for section in sections if section.header == header]
-        return sections
+        index = self.get_index()
+        if header is None:
+            return list(index.sections)
+        return list(index.sections_by_header.get(header, ()))
 
     def get_section(self, header):
         sections = self.get_sections(header)
@@ -114,6 +299,7 @@ class Gas:  # content of a gas file
         return results
 
     def insert_item(self, item):
+        self._index = None
         self.items.append(item)
 
     def get_or_create_section(self, header):
@@ -131,11 +317,35 @@ class Gas:  # content of a gas file
         attrs = [a for a in attrs if a is not None]
         return attrs[-1] if len(attrs) > 0 else None  # yep, multiple findings. looking at you, braak_magic_base (common:screen_name)
 
+    # compact picklable form of parsed gas, made of plain lists & tuples: sections are lists, attributes are tuples
+    def pack(self) -> list:
+        return [item.pack() for item in self.items]
+
+    @classmethod
+    def unpack_items(cls, packed_items: list) -> list:
+        return [Section(packed[0], cls.unpack_items(packed[1])) if isinstance(packed, list) else Attribute.unpack(packed) for packed in packed_items]
+
+    @classmethod
+    def unpack(cls, packed: list) -> 'Gas':
+        return Gas(cls.unpack_items(packed))
+
 
 class Section(Gas):
+    __slots__ = ('_header',)
+
     def __init__(self, header='', items: list = None):
         super().__init__(items)  # self.items contains attributes & sub-sections
-        self.header = header
+        self._header = sys.intern(header)
+
+    @property
+    def header(self) -> str:
+        return self._header
+
+    @header.setter
+    def header(self, header: str):
+        old_header = self._header
+        self._header = sys.intern(header)
+        Gas.rename_log.log(self, old_header)
 
     def print(self, indent=''):
         print(indent + self.header)
@@ -143,19 +353,17 @@ class Section(Gas):
             item.print(indent + '  ')
 
     def get_attrs(self, name=None) -> list[Attribute]:
-        attrs = [item for item in self.items if isinstance(item, Attribute)]
-        if name is not None:
-            attrs = [attr for attr in attrs if attr.name.lower() == name.lower()]
-        return attrs
+        index = self.get_index()
+        if name is None:
+            return list(index.attrs)
+        return list(index.attrs_by_name.get(name.lower(), ()))
 
     def get_attr(self, name: str):
-        attr = None
-        for item in self.items:
-            if isinstance(item, Attribute):
-                if item.name.lower() == name.lower():
-                    assert attr is None, f'get_attr: multiple attributes found: {name}'
-                    attr = item
-        return attr
+        attrs = self.get_index().attrs_by_name.get(name.lower())
+        if attrs is None:
+            return None
+        assert len(attrs) == 1, f'get_attr: multiple attributes found: {name}'
+        return attrs[0]
 
     def get_last_attr(self, name: str) -> Attribute:
         attrs = self.get_attrs(name)
@@ -170,6 +378,7 @@ class Section(Gas):
         return self.header
 
     def insert_item(self, item):
+        self._index = None
         item_name: str = item.name
         item_is_attr = isinstance(item, Attribute)
         for i in range(len(self.items)):
@@ -196,6 +405,7 @@ class Section(Gas):
             if value is not None:
                 attr.set_value(value)
             else:
+                self._index = None
                 self.items.remove(attr)
         else:
             if value is not None:
@@ -250,9 +460,7 @@ class Section(Gas):
     def find_attrs_recursive(self, name, results=None):
         if results is None:
             results = list()
-        for attr in self.get_attrs():
-            if attr.name.lower() == name.lower():
-                results.append(attr)
+        results.extend(self.get_attrs(name))
         for section in self.get_sections():
             section.find_attrs_recursive(name, results)
         return results
@@ -269,3 +477,6 @@ class Section(Gas):
 
     def copy(self):
         return Section(self.header, [item.copy() for item in self.items])
+
+    def pack(self) -> list:
+        return [self.header, super().pack()]
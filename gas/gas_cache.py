@@ -0,0 +1,148 @@
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+import threading
+
+from .gas import Gas
+from .gas_parser import GasParser
+
+
+class GasCache:
+    # Opt-in on-disk cache of parsed gas files, so unchanged files don't have to be parsed again.
+    # Entries are validated against path, mtime and size of the gas file, and optionally a hash of its content.
+    # Enable by setting the GASPY_GAS_CACHE environment variable to a cache dir, or by calling GasCache.enable.
+    ENV_VAR = 'GASPY_GAS_CACHE'
+    FORMAT_VERSION = 1
+    DEFAULT_MAX_SIZE = 1024 * 1024 * 1024  # bytes
+    _instance = None
+    _disabled = False
+
+    @staticmethod
+    def get_instance():
+        if GasCache._instance is None and not GasCache._disabled:
+            path = os.environ.get(GasCache.ENV_VAR)
+            if path:
+                GasCache._instance = GasCache(path)
+        return GasCache._instance
+
+    @staticmethod
+    def enable(path: str, max_size: int = DEFAULT_MAX_SIZE, check_hash=False):
+        GasCache._instance = GasCache(path, max_size, check_hash)
+        GasCache._disabled = False
+        return GasCache._instance
+
+    @staticmethod
+    def disable():
+        # escape hatch, e.g. --no-gas-cache
+        GasCache._instance = None
+        GasCache._disabled = True
+
+    @staticmethod
+    def add_arguments(parser: argparse.ArgumentParser):
+        parser.add_argument('--no-gas-cache', action='store_true', help='Parse all gas files, ignoring the parsed-gas cache')
+
+    @staticmethod
+    def apply_arguments(args: argparse.Namespace):
+        if args.no_gas_cache:
+            GasCache.disable()
+
+    def __init__(self, path: str, max_size: int = DEFAULT_MAX_SIZE, check_hash=False):
+        self.path = path
+        self.max_size = max_size
+        self.check_hash = check_hash
+        # cached gas is only valid for the same parser & python version
+        self.version = f'{self.FORMAT_VERSION}.{GasParser.VERSION}.py{sys.version_info.major}.{sys.version_info.minor}'
+        self.size = None  # total size of the entries, determined on first store
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def get_side_file_path(path: str, suffix: str) -> str or None:
+        # location for other derived data about a dir or file (indexes, snapshots) in the cache dir.
+        # None if the cache is not enabled - side files are pickles, so they are never kept in a shared place like the temp dir
+        gas_cache = GasCache.get_instance()
+        if gas_cache is None:
+            return None
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(path)).encode('utf-8')).hexdigest()
+        return os.path.join(gas_cache.path, key + suffix)
+
+    def get_entry_path(self, gas_path: str) -> str:
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(gas_path)).encode('utf-8')).hexdigest()
+        return os.path.join(self.path, key + '.gas.pickle')
+
+    @staticmethod
+    def hash_content(gas_path: str) -> str:
+        with open(gas_path, 'rb') as gas_file:
+            return hashlib.sha1(gas_file.read()).hexdigest()
+
+    def make_header(self, gas_path: str, stat: os.stat_result) -> dict:
+        return {
+            'version': self.version,
+            'path': os.path.abspath(gas_path),
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': self.hash_content(gas_path) if self.check_hash else None,
+        }
+
+    def load(self, gas_path: str):
+        # returns gas & parser warnings, or None if not cached or outdated
+        entry_path = self.get_entry_path(gas_path)
+        try:
+            with open(entry_path, 'rb') as entry_file:
+                header = pickle.load(entry_file)
+                if header == self.make_header(gas_path, os.stat(gas_path)):
+                    warnings, packed_gas = pickle.load(entry_file)
+                else:
+                    header = None
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            header = None
+        if header is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        os.utime(entry_path)  # mark as recently used for eviction
+        return Gas.unpack(packed_gas), warnings
+
+    def store(self, gas_path: str, stat: os.stat_result, gas: Gas, warnings: list[str]):
+        # stat is taken before parsing, so a file changed in the meantime will not match the entry
+        self.store_packed(gas_path, stat, gas.pack(), warnings)
+
+    def store_packed(self, gas_path: str, stat: os.stat_result, packed_gas: list, warnings: list[str]):
+        entry_path = self.get_entry_path(gas_path)
+        tmp_path = f'{entry_path}.{os.getpid()}-{threading.get_ident()}.tmp'  # concurrent loaders may store the same entry
+        with open(tmp_path, 'wb') as entry_file:
+            pickle.dump(self.make_header(gas_path, stat), entry_file, pickle.HIGHEST_PROTOCOL)
+            pickle.dump((warnings, packed_gas), entry_file, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, entry_path)
+        if self.size is None:
+            self.size = sum([size for _, size, _ in self.list_entries()])
+        else:
+            self.size += os.path.getsize(entry_path)
+        if self.size > self.max_size:
+            self.evict()
+
+    def list_entries(self) -> list[tuple[str, int, float]]:
+        entries = []
+        for dir_entry in os.scandir(self.path):
+            if dir_entry.name.endswith('.gas.pickle'):
+                stat = dir_entry.stat()
+                entries.append((dir_entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def evict(self):
+        # remove least recently used entries until the cache is down to 90% of its max size
+        entries = sorted(self.list_entries(), key=lambda entry: entry[2])
+        self.size = sum([size for _, size, _ in entries])
+        for path, size, _ in entries:
+            if self.size <= self.max_size * 0.9:
+                break
+            os.remove(path)
+            self.size -= size
+
+    def clear(self):
+        for path, _, _ in self.list_entries():
+            os.remove(path)
+        self.size = 0
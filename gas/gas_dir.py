@@ -8,6 +8,15 @@ from .gas_file import GasFile
 from .gas_parser import GasParser
 
 
+class SaveSummary:
+    def __init__(self):
+        self.written: list[str] = list()  # paths
+        self.skipped: list[str] = list()  # paths of unchanged files
+
+    def __str__(self):
+        return f'{len(self.written)} files written, {len(self.skipped)} unchanged'
+
+
 class GasDir:
     def __init__(self, path: str, subs=None):
         self.path = path
@@ -23,6 +32,7 @@ class GasDir:
                     self.subdirs[name] = GasDir(os.path.join(path, name), sub)
 
         self.loaded = False
+        self.mtime_ns: int = None  # as found when enumerating, if recorded
 
     def clear_cache(self):
         self.subdirs: dict[str, GasDir] = dict()
@@ -34,22 +44,41 @@ class GasDir:
             if load is True or (self.exists() and load is not False):  # load=None means load if exists
                 self.load()
 
-    def load(self):
-        for entry in os.listdir(self.path):
-            sub_path = os.path.join(self.path, entry)
-            if os.path.isdir(sub_path):
-                self.subdirs[entry] = GasDir(sub_path)
-            elif os.path.isfile(sub_path) and entry.endswith('.gas'):
-                self.gas_files[entry[:-4]] = GasFile(sub_path)
+    def load(self, recursive=False, record_mtimes=False):
+        # scandir entries know their type, so there is no extra stat per entry (except for recording mtimes on posix)
+        if record_mtimes and self.mtime_ns is None:
+            self.mtime_ns = os.stat(self.path).st_mtime_ns
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    subdir = GasDir(entry.path)
+                    if record_mtimes:
+                        subdir.mtime_ns = entry.stat().st_mtime_ns
+                    self.subdirs[entry.name] = subdir
+                elif entry.is_file() and entry.name.endswith('.gas'):
+                    gas_file = GasFile(entry.path)
+                    if record_mtimes:
+                        gas_file.mtime_ns = entry.stat().st_mtime_ns
+                    self.gas_files[entry.name[:-4]] = gas_file
         self.loaded = True
-
-    def save(self):
+        if recursive:
+            for subdir in self.subdirs.values():
+                subdir.load(True, record_mtimes)
+
+    def save(self, summary: SaveSummary = None) -> SaveSummary:
+        # writes loaded gas files whose content changed
+        if summary is None:
+            summary = SaveSummary()
         if not os.path.exists(self.path):
             os.mkdir(self.path)
         for gas_file in self.gas_files.values():
-            gas_file.save()
+            if gas_file.save():
+                summary.written.append(gas_file.path)
+            elif gas_file.gas is not None:
+                summary.skipped.append(gas_file.path)
         for subdir in self.subdirs.values():
-            subdir.save()
+            subdir.save(summary)
+        return summary
 
     def delete(self):
         if os.path.exists(self.path):
@@ -71,30 +100,55 @@ class GasDir:
                         gas_file.load()
                     gas_file.gas.print(indent + '  ')
 
-    def iter_parse(self, print_gas=True, print_files=True, print_dirs=True, indent=''):
-        self.load()
+    def iter_gas_files(self):
+        # all gas files of this dir tree - own files first, then subdirs
+        for gas_file in self.get_gas_files().values():
+            yield gas_file
+        for subdir in self.get_subdirs().values():
+            yield from subdir.iter_gas_files()
+
+    def load_all(self, parallel: int = None):
+        # parse all gas files of this dir tree that are not loaded yet. parallel=N spreads the parsing across N processes.
+        GasFile.load_many([gas_file for gas_file in self.iter_gas_files() if gas_file.gas is None], parallel)
+
+    def iter_parse(self, print_gas=True, print_files=True, print_dirs=True, indent='', parallel: int = None):
+        if parallel is not None:
+            self.load_all(parallel)  # parse everything not loaded yet up front, loaded files keep their gas
+        self.do_iter_parse(print_gas, print_files, print_dirs, indent, parallel is None)
+
+    def do_iter_parse(self, print_gas, print_files, print_dirs, indent, load):
+        if load:
+            self.load()
         for name, gas_file in self.gas_files.items():
             if print_files:
                 print(indent + name + '.gas')
-            gas_file.load()
+            if load:
+                gas_file.load()
             if print_gas:
                 gas_file.gas.print(indent + '  ')
         for name, gas_dir in self.subdirs.items():
             if print_dirs:
                 print(indent + name)
-            gas_dir.iter_parse(print_gas, print_files, print_dirs, indent + '  ')
+            gas_dir.do_iter_parse(print_gas, print_files, print_dirs, indent + '  ', load)
 
-    def iter_rewrite(self, print_files=True, print_dirs=True, indent=''):
-        self.load()
+    def iter_rewrite(self, print_files=True, print_dirs=True, indent='', parallel: int = None):
+        if parallel is not None:
+            self.load_all(parallel)  # parse everything not loaded yet up front, loaded files keep their gas
+        self.do_iter_rewrite(print_files, print_dirs, indent, parallel is None)
+
+    def do_iter_rewrite(self, print_files, print_dirs, indent, load):
+        if load:
+            self.load()
         for name, gas_file in self.gas_files.items():
             if print_files:
                 print(indent + name + '.gas')
-            gas_file.load()  # read in gas...
+            if load:
+                gas_file.load()  # read in gas...
             gas_file.save()  # ...and write it out again, therefore applying gaspy standard formatting
         for name, gas_dir in self.subdirs.items():
             if print_dirs:
                 print(indent + name)
-            gas_dir.iter_rewrite(print_files, print_dirs, indent + '  ')
+            gas_dir.do_iter_rewrite(print_files, print_dirs, indent + '  ', load)
 
     def get_subdirs(self, load: bool = None):
         self.load_if_required(load)
@@ -163,10 +217,11 @@ class GasDir:
 
 def main(argv):
     the_folder = argv[0]
+    parallel = int(argv[1]) if len(argv) > 1 else None
     print(the_folder)
     gas_dir = GasDir(the_folder)
-    # gas_dir.iter_parse(False, False, False)
-    gas_dir.iter_rewrite(False)
+    # gas_dir.iter_parse(False, False, False, parallel=parallel)
+    gas_dir.iter_rewrite(False, parallel=parallel)
     return len(GasParser.get_instance().warnings)
 
 
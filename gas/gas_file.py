@@ -1,21 +1,134 @@
+import hashlib
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 from .gas import Gas
+from .gas_cache import GasCache
 from .gas_parser import GasParser
 from .gas_writer import GasWriter
 
 
 class GasFile:
+    num_loads = 0  # gas files loaded so far, parsed or from the gas cache - for load profiles
+
     def __init__(self, path, gas=None):
         self.path = path
         self.gas: Gas = gas
+        # mtime, size & hash of the formatted gas of the file as loaded / last saved / found unchanged. hash is None while not needed yet
+        self.fingerprint: tuple[int, int, str] = None
+        self.mtime_ns: int = None  # as found when enumerating the dir, if recorded
 
     def load(self):
-        self.gas = GasParser.get_instance().parse_file(self.path)
+        GasFile.num_loads += 1
+        parser = GasParser.get_instance()
+        gas_cache = GasCache.get_instance()
+        stat = os.stat(self.path)
+        self.fingerprint = (stat.st_mtime_ns, stat.st_size, None)
+        if gas_cache is None:
+            self.gas = parser.parse_file(self.path)
+            return
+        cached = gas_cache.load(self.path)
+        if cached is not None:
+            self.gas, warnings = cached
+            for warning in warnings:
+                parser.warn(warning)  # same warnings as if parsed
+            return
+        warnings = list()
+        try:
+            self.gas = parser.parse_file(self.path, warnings)
+        finally:
+            parser.merge_warnings(warnings)
+        gas_cache.store(self.path, stat, self.gas, warnings)
+
+    @staticmethod
+    def load_many(gas_files: list['GasFile'], parallel: int = None):
+        # parse the given gas files, spread across a pool of processes if parallel > 1.
+        # parsed gas comes back in compact form; warnings are issued in the order of gas_files, as if parsed one by one.
+        if parallel is None or parallel < 2 or len(gas_files) < 2:
+            for gas_file in gas_files:
+                gas_file.load()
+            return
+        GasFile.num_loads += len(gas_files)
+        parser = GasParser.get_instance()
+        gas_cache = GasCache.get_instance()
+        file_stats = {gas_file.path: os.stat(gas_file.path) for gas_file in gas_files}
+        for gas_file in gas_files:
+            gas_file.fingerprint = (file_stats[gas_file.path].st_mtime_ns, file_stats[gas_file.path].st_size, None)
+        cached = [gas_cache.load(gas_file.path) if gas_cache is not None else None for gas_file in gas_files]
+        to_parse = [gas_file for gas_file, c in zip(gas_files, cached) if c is None]
+        chunksize = max(1, len(to_parse) // (parallel * 4))
+        with ProcessPoolExecutor(parallel) as pool:
+            parsed = pool.map(parse_packed, [gas_file.path for gas_file in to_parse], repeat(parser.single_pass), repeat(parser.deferred_values), chunksize=chunksize)
+            for gas_file, c in zip(gas_files, cached):
+                if c is not None:
+                    gas_file.gas, warnings = c
+                else:
+                    packed_gas, warnings = next(parsed)
+                    gas_file.gas = Gas.unpack(packed_gas)
+                    if gas_cache is not None:
+                        gas_cache.store_packed(gas_file.path, file_stats[gas_file.path], packed_gas, warnings)
+                for warning in warnings:
+                    parser.warn(warning)
+
+    @staticmethod
+    def same_content(path: str, other_path: str, chunk_size=64 * 1024) -> bool:
+        with open(path, 'rb') as file, open(other_path, 'rb') as other_file:
+            while True:
+                chunk = file.read(chunk_size)
+                if chunk != other_file.read(chunk_size):
+                    return False
+                if not chunk:
+                    return True
+
+    @staticmethod
+    def format_digest(gas: Gas, write=None) -> str:
+        # formats gas, passing the text on to write if given -> hash of the text
+        sha1 = hashlib.sha1()
+
+        def hashed_write(text: str):
+            if write is not None:
+                write(text)
+            sha1.update(text.encode())
+        GasWriter().write_sections(hashed_write, gas)
+        return sha1.hexdigest()
 
-    def save(self):
-        if self.gas is not None:
-            GasWriter().write_file(self.path, self.gas)
+    def is_unchanged(self, tmp_path: str, digest: str) -> bool:
+        # whether the file on disk has the gas of the newly written temp file
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        if self.fingerprint is not None and self.fingerprint[:2] == (stat.st_mtime_ns, stat.st_size):
+            if self.fingerprint[2] is None:
+                # as loaded - what it looks like formatted, even if the file itself isn't formatted that way
+                parser = GasParser.get_instance().new_context(list())
+                parser.print_warnings = False
+                self.fingerprint = (stat.st_mtime_ns, stat.st_size, self.format_digest(parser.parse_file(self.path)))
+            return self.fingerprint[2] == digest
+        if stat.st_size != os.path.getsize(tmp_path) or not self.same_content(tmp_path, self.path):
+            return False  # changed by someone else, or never loaded
+        self.fingerprint = (stat.st_mtime_ns, stat.st_size, digest)
+        return True
+
+    def save(self) -> bool:
+        # writes the file only if its gas actually changed. returns whether it was written.
+        if self.gas is None:
+            return False
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as file:  # formatted straight into a temp file, hashed on the way
+                digest = self.format_digest(self.gas, file.write)
+            if self.is_unchanged(tmp_path, digest):
+                return False
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)  # unchanged, or failed
+        stat = os.stat(self.path)
+        self.fingerprint = (stat.st_mtime_ns, stat.st_size, digest)
+        return True
 
     def get_gas(self):
         if self.gas is None:
@@ -23,6 +136,16 @@ class GasFile:
         return self.gas
 
 
+def parse_packed(path: str, single_pass=True, deferred_values=False) -> (list, list[str]):
+    # runs in a worker process of GasFile.load_many
+    parser = GasParser()
+    parser.print_warnings = False
+    parser.single_pass = single_pass
+    parser.deferred_values = deferred_values
+    gas = parser.parse_file(path)
+    return gas.pack(), parser.warnings
+
+
 def main(argv):
     the_path = argv[0]
     print(the_path)
@@ -0,0 +1,85 @@
+import sys
+import time
+import tracemalloc
+
+from .gas import Attribute, Gas, Section
+from .gas_cache import GasCache
+from .gas_dir import GasDir
+from .gas_file import GasFile
+from .gas_parser import GasParser
+
+
+def count_items(gas: Gas) -> (int, int):
+    num_attrs = 0
+    num_sections = 0
+    for item in gas.items:
+        if isinstance(item, Section):
+            num_sections += 1
+            sub_attrs, sub_sections = count_items(item)
+            num_attrs += sub_attrs
+            num_sections += sub_sections
+        elif isinstance(item, Attribute):
+            num_attrs += 1
+    return num_attrs, num_sections
+
+
+def copy_str(s: str) -> str:
+    return s.encode('utf-8').decode('utf-8')  # a new string object, as the parser used to produce for every name
+
+
+# gas nodes the way they were before __slots__ & name interning, with eagerly decoded values - for comparison
+class PlainAttribute:
+    def __init__(self, attr: Attribute):
+        value = attr.value
+        self.name = copy_str(attr.name)
+        self.value = copy_str(value) if isinstance(value, str) else value
+        self.datatype = attr.datatype
+
+
+class PlainSection:
+    def __init__(self, section: Section):
+        self.header = copy_str(section.header)
+        self.items = [PlainSection(item) if isinstance(item, Section) else PlainAttribute(item) for item in section.items]
+
+
+def measure_plain(gas_files: list[GasFile]) -> int:
+    tracemalloc.start()
+    plain_gas = [[PlainSection(section) for section in gas_file.gas.items] for gas_file in gas_files]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del plain_gas
+    return size
+
+
+# loads a whole dir tree (e.g. a Bits folder) and reports how much memory the loaded gas occupies
+def measure(path: str):
+    GasCache.disable()  # cache hits would leave pickle garbage in the measurement
+    GasParser.get_instance().print_warnings = False
+    gas_files = list(GasDir(path).iter_gas_files())  # dir structure is not part of the measurement
+    tracemalloc.start()
+    start_time = time.time()
+    GasFile.load_many(gas_files)
+    duration = time.time() - start_time
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    num_attrs = num_sections = 0
+    for gas_file in gas_files:
+        file_attrs, file_sections = count_items(gas_file.gas)
+        num_attrs += file_attrs
+        num_sections += file_sections
+    print(f'{len(gas_files)} files, {num_sections} sections, {num_attrs} attributes, loaded in {duration:.1f} s')
+    print(f'{size / 2**20:.1f} MiB in use, {peak / 2**20:.1f} MiB peak')
+    if num_attrs > 0:
+        print(f'{size / num_attrs:.0f} bytes per attribute (sections & values included)')
+        plain_size = measure_plain(gas_files)
+        print(f'without slots & interning: {plain_size / 2**20:.1f} MiB, {plain_size / num_attrs:.0f} bytes per attribute ({size / plain_size:.0%})')
+
+
+def main(argv):
+    measure(argv[0])
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main(sys.argv[1:]))
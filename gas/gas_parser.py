@@ -1,7 +1,30 @@
+import re
+import threading
+
 from .gas import Section, Attribute, Gas
 
 
+_WHITESPACE = re.compile(r'\s*')
+# event types of GasParser.iter_events
+SECTION_OPEN = 'section_open'
+ATTRIBUTE = 'attribute'
+SECTION_CLOSE = 'section_close'
+# tokens the single-pass parser can take in one step: section header, braces, end-of-line comment,
+# and a well-formed attribute that makes up the rest of its line. anything else is irregular and goes the long way.
+_TOKENS = re.compile(
+    r'\s*(?:'
+    r'\[([^\]\n]*)\](\s*\{)?'  # 1: header, 2: with its opening brace
+    r'|(\{)'  # 3: opening brace
+    r'|(\})'  # 4: closing brace
+    r'|(//)[^\n]*'  # 5: end-of-line comment
+    r'|(?:([bifxpqvd]) )?([\w*]+)[ \t]*=[ \t]*(?:("[^"\n]*")[ \t]*;?|([^\s;"\[][^;\n]*)?;)[ \t]*(?:\n|\Z)'  # 6-9: attribute
+    r'|(\S)'  # 10: irregular
+    r')')
+
+
 class GasParser:
+    VERSION = 1  # bump whenever parsing results change; invalidates cached gas
+    EVENTS_CHUNK_SIZE = 64 * 1024  # chars iter_events reads at a time
     _instance = None
 
     @staticmethod
@@ -13,23 +36,47 @@ class GasParser:
     def __init__(self):
         self.warnings = []
         self.print_warnings = True
-        # temp vars
-        self.gas = None
-        self.stack = None
-        self.multiline_value = None
-        self.multiline_value_delimiter = None
-        self.multiline_value_attr = None
+        self.single_pass = True  # False falls back to the line-based parsing below
+        self.deferred_values = False  # True keeps typed values as raw strings until first access
+        self.lock = threading.Lock()  # guards warnings
 
     def warn(self, warning):
-        self.warnings.append(warning)
+        with self.lock:
+            self.warnings.append(warning)
         if self.print_warnings:
             print('Warning: ' + warning)
 
+    def merge_warnings(self, warnings: list[str]):
+        with self.lock:
+            self.warnings.extend(warnings)
+
     def clear_warnings(self):
-        warnings = self.warnings
-        self.warnings = []
+        with self.lock:
+            warnings = self.warnings
+            self.warnings = []
         return warnings
 
+    # Every parse call runs in a fresh context: a parser with the same settings that holds the temp vars of the line-based parsing
+    # (set up in do_parse_file_content) and collects the warnings of this call. So one parser (e.g. the singleton) can be used by several threads at once.
+    # Warnings go to the given list, or get merged into this parser's warnings at the end of the call.
+
+    def new_context(self, warnings: list[str] = None) -> 'GasParser':
+        context = GasParser()
+        context.print_warnings = self.print_warnings
+        context.single_pass = self.single_pass
+        context.deferred_values = self.deferred_values
+        if warnings is not None:
+            context.warnings = warnings
+        return context
+
+    def run_in_context(self, func, warnings: list[str], *args):
+        context = self.new_context(warnings)
+        try:
+            return func(context, *args)
+        finally:
+            if warnings is None:
+                self.merge_warnings(context.warnings)
+
     def start_multiline_parsing(self, value, delimiter, attr):
         assert self.multiline_value is None
         self.multiline_value = value
@@ -138,7 +185,10 @@ class GasParser:
         if self.multiline_value is None:
             if value.endswith(';'):
                 value = value[:-1]
-            attr.set_value(value, attr.datatype)
+            if self.deferred_values:
+                attr.set_deferred(value)
+            else:
+                attr.set_value(value, attr.datatype)
         return line
 
     def parse_line(self, line):
@@ -185,7 +235,10 @@ class GasParser:
                     line = self.parse_attribute(line)
         assert line == ''
 
-    def parse_file_content(self, open_file):
+    def parse_file_content(self, open_file, warnings: list[str] = None) -> Gas:
+        return self.run_in_context(GasParser.do_parse_file_content, warnings, open_file)
+
+    def do_parse_file_content(self, open_file) -> Gas:
         gas = Gas()
         self.gas = gas
         self.stack = [self.gas]
@@ -203,6 +256,328 @@ class GasParser:
         self.gas = None
         return gas
 
-    def parse_file(self, path):
+    # Single-pass parsing: scans the whole text once with a compiled token regex and a position cursor
+    # instead of re-slicing every line. Produces the same Gas tree and warnings as parse_file_content, quirks included.
+    # Irregular input drops to _scan_irregular, which follows parse_line step by step on the current line segment:
+    # text[pos:seg_end] is what parse_line would hold in its line variable, line_end is where the next line starts.
+
+    @staticmethod
+    def _line_end(text: str, pos: int) -> int:
+        eol = text.find('\n', pos)
+        return len(text) if eol == -1 else eol + 1
+
+    @staticmethod
+    def _rstrip_end(text: str, start: int, end: int, chars=None) -> int:
+        while end > start and (text[end-1].isspace() if chars is None else text[end-1] in chars):
+            end -= 1
+        return end
+
+    def _scan_multiline(self, text: str, value: str, delimiter, line_end: int):
+        # continues a multiline value or comment on the lines after line_end; returns the value and the rest-of-line segment
+        assert line_end < len(text), 'Unexpected end of gas: multiline element'
+        start = line_end
+        if delimiter is None:
+            first_end = self._rstrip_end(text, start, self._line_end(text, start), '\r\n')
+            content_start = _WHITESPACE.match(text, start, first_end).end()
+            val_start = text[content_start:min(content_start+2, first_end)]
+            if val_start.startswith('"'):
+                delimiter = '"'
+                value += '"'
+                start = content_start + 1
+            elif val_start.startswith('[['):
+                delimiter = ']]'
+            else:
+                assert False, 'Unclear multiline value delimiter, value starts with ' + val_start
+        end_index = text.find(delimiter, start)
+        assert end_index != -1, 'Unexpected end of gas: multiline element'
+        line_end = self._line_end(text, end_index)
+        value_end = self._rstrip_end(text, end_index, line_end, '\r\n')
+        pos = end_index + len(delimiter)
+        value += '\n' + text[start:end_index if delimiter == ';' else pos]
+        pos = _WHITESPACE.match(text, pos, value_end).end()
+        if delimiter != ';' and text.startswith(';', pos, value_end):
+            pos = _WHITESPACE.match(text, pos + 1, value_end).end()
+        return value, pos, self._rstrip_end(text, pos, value_end), line_end
+
+    def _scan_attribute(self, text: str, pos: int, seg_end: int, line_end: int, current_section: Section):
+        equals = text.find('=', pos, seg_end)
+        if equals == -1:
+            self.warn('could not parse: ' + text[pos:seg_end].strip())
+            brace = text.find('{', pos, seg_end)
+            return (brace if brace != -1 else seg_end), seg_end, line_end  # else discard
+        name = text[pos:equals].strip()
+        datatype = None
+        if len(name) > 1 and name[1] == ' ':
+            datatype = name[0]
+            name = name[2:]
+        name_subsection_parts: list[str] = name.split(':')
+        name = name_subsection_parts.pop()
+        name_section: Section = current_section
+        for name_subsection_name in name_subsection_parts:
+            subsection = Section(name_subsection_name)
+            name_section.items.append(subsection)
+            name_section = subsection
+        attr = Attribute(name, None, datatype)
+        name_section.items.append(attr)
+
+        value_end = self._rstrip_end(text, equals + 1, seg_end, '\r\n')
+        value_start = _WHITESPACE.match(text, equals + 1, value_end).end()
+        if text.startswith('"', value_start, value_end):
+            end_index = text.find('"', value_start + 1, value_end)
+            if end_index == -1:
+                attr.value, pos, seg_end, line_end = self._scan_multiline(text, text[value_start:value_end], '"', line_end)
+                return pos, seg_end, line_end
+            if end_index + 1 < value_end and text[end_index + 1] == ';':
+                end_index += 1
+            value = text[value_start:end_index + 1]
+            pos = _WHITESPACE.match(text, end_index + 1, value_end).end()
+            seg_end = self._rstrip_end(text, pos, value_end)
+            if seg_end - pos == 1 and text[pos] == ';':
+                pos = seg_end
+        elif text.startswith('[[', value_start, value_end):
+            end_index = text.find(']]', value_start, value_end)
+            if end_index == -1:
+                attr.value, pos, seg_end, line_end = self._scan_multiline(text, text[value_start:value_end], ']]', line_end)
+                return pos, seg_end, line_end
+            pos = _WHITESPACE.match(text, end_index + 2, value_end).end()
+            assert text.startswith(';', pos, value_end)
+            pos = _WHITESPACE.match(text, pos + 1, value_end).end()
+            seg_end = value_end
+            value = text[value_start:end_index + 2]
+        else:
+            semicolon = text.find(';', value_start, value_end)
+            if semicolon == -1:
+                delimiter = ';' if value_start != value_end else None
+                attr.value, pos, seg_end, line_end = self._scan_multiline(text, text[value_start:value_end], delimiter, line_end)
+                return pos, seg_end, line_end
+            value = text[value_start:semicolon]
+            pos = _WHITESPACE.match(text, semicolon + 1, value_end).end()
+            seg_end = self._rstrip_end(text, pos, value_end)
+        if value.endswith(';'):
+            value = value[:-1]
+        if self.deferred_values:
+            attr.set_deferred(value)
+        else:
+            attr.set_value(value, attr.datatype)
+        return pos, seg_end, line_end
+
+    def _scan_irregular(self, text: str, pos: int, seg_end: int, line_end: int, current_section: Section):
+        if pos >= seg_end:
+            seg_end = line_end = self._line_end(text, pos)
+        if text.startswith('[', pos):
+            text.index(']', pos, seg_end)  # header without closing bracket - raises error like parse_line
+        elif text.startswith('/*', pos):
+            endcomment = text.find('*/', pos, seg_end)
+            if endcomment == -1:
+                _, pos, seg_end, line_end = self._scan_multiline(text, '', '*/', line_end)
+            else:
+                pos = endcomment + 2
+        else:
+            pos, seg_end, line_end = self._scan_attribute(text, pos, seg_end, line_end, current_section)
+        return pos, seg_end, line_end
+
+    def parse_text(self, text: str, warnings: list[str] = None) -> Gas:
+        return self.run_in_context(GasParser.do_parse_text, warnings, text)
+
+    def do_parse_text(self, text: str) -> Gas:
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')  # universal newlines, as when reading a file
+        gas = Gas()
+        stack: list[Gas] = [gas]
+        current_section = gas
+        items = gas.items  # of current_section
+        pos = seg_end = line_end = 0
+        make_attr = Attribute.deferred if self.deferred_values else Attribute.parsed
+        while True:
+            for token in _TOKENS.finditer(text, pos):
+                token_type = token.lastindex
+                if token_type > 5:
+                    if token_type == 10:
+                        pos = token.start(10)
+                        break
+                    datatype, name, quoted_value, value = token.group(6, 7, 8, 9)
+                    items.append(make_attr(name, quoted_value or value or '', datatype))
+                elif token_type == 1:
+                    items.append(Section(token.group(1)))
+                elif token_type == 2:
+                    current_section = Section(token.group(1))
+                    items.append(current_section)
+                    items = current_section.items
+                    stack.append(current_section)
+                elif token_type == 3:
+                    while not isinstance(items[-1], Section):
+                        rogue_attr = items.pop()
+                        self.warn('discarding rogue attribute ' + str(rogue_attr))
+                    current_section = items[-1]
+                    items = current_section.items
+                    stack.append(current_section)
+                elif token_type == 4:
+                    if len(stack) < 2:
+                        self.warn('additional closing brace')
+                    else:
+                        stack.pop()
+                    current_section = stack[-1]
+                    items = current_section.items
+                # else end-of-line comment, ignore
+            else:
+                break  # nothing but whitespace left
+            pos, seg_end, line_end = self._scan_irregular(text, pos, seg_end, line_end, current_section)
+        if len(stack) != 1:
+            self.warn('Unexpected end of gas: ' + str(len(stack) - 1) + ' open sections')
+        return gas
+
+    # Streaming: yields (event type, path, item) instead of building a tree - item is the header for section events,
+    # the Attribute for attribute events. path holds the headers of the enclosing sections, incl. the opened/closed one.
+    # Items are held back only until it's clear they won't be discarded as rogue attributes, so memory stays flat.
+    # Quirk: a section reopened by a stray opening brace is reported twice, and its earlier sub-sections can't be reopened.
+
+    def _item_events(self, item, path: tuple):
+        if isinstance(item, Attribute):
+            yield ATTRIBUTE, path, item
+            return
+        header = item if isinstance(item, str) else item.header
+        sub_path = path + (header,)
+        yield SECTION_OPEN, sub_path, header
+        if isinstance(item, Section):  # colon-path attr, e.g. aspect:scale_base
+            for sub_item in item.items:
+                yield from self._item_events(sub_item, sub_path)
+        yield SECTION_CLOSE, sub_path, header
+
+    def _flush_events(self, pending: list, path: tuple, lasts: list):
+        for item in pending:
+            yield from self._item_events(item, path)
+            if not isinstance(item, Attribute):
+                lasts[-1] = item if isinstance(item, str) else item.header
+        pending.clear()
+
+    def iter_text_events(self, text: str, warnings: list[str] = None):
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        yield from self.iter_chunk_events(iter([text]), warnings)
+
+    # chunks have to end at line ends, with \n newlines (as read from a file in text mode)
+    def iter_chunk_events(self, chunks, warnings: list[str] = None):
+        context = self.new_context(warnings)
+        try:
+            yield from context.do_iter_chunk_events(chunks)
+        finally:
+            if warnings is None:
+                self.merge_warnings(context.warnings)
+
+    def do_iter_chunk_events(self, chunks):
+        text = ''
+        collector = Section()  # receives what _scan_irregular parses
+        path = tuple()
+        pendings: list[list] = [[]]  # per open section: headers (str), attrs & colon-path sections not reported yet
+        lasts: list[str] = [None]  # per open section: header of the last reported sub-section
+        pending = pendings[-1]
+        pos = seg_end = line_end = 0
+        make_attr = Attribute.deferred if self.deferred_values else Attribute.parsed
+        while True:
+            for token in _TOKENS.finditer(text, pos):
+                token_type = token.lastindex
+                if token_type > 5:
+                    if token_type == 10:
+                        pos = token.start(10)
+                        break
+                    datatype, name, quoted_value, value = token.group(6, 7, 8, 9)
+                    pending.append(make_attr(name, quoted_value or value or '', datatype))
+                elif token_type == 1:
+                    yield from self._flush_events(pending, path, lasts)
+                    pending.append(token.group(1))
+                elif token_type == 2:
+                    yield from self._flush_events(pending, path, lasts)
+                    header = token.group(1)
+                    path += (header,)
+                    yield SECTION_OPEN, path, header
+                    pending = []
+                    pendings.append(pending)
+                    lasts.append(None)
+                elif token_type == 3:
+                    while pending and isinstance(pending[-1], Attribute):
+                        self.warn('discarding rogue attribute ' + str(pending.pop()))
+                    sub_items = []
+                    if pending:
+                        target = pending.pop()
+                        yield from self._flush_events(pending, path, lasts)
+                        if isinstance(target, Section):
+                            header, sub_items = target.header, target.items
+                        else:
+                            header = target
+                    elif lasts[-1] is not None:
+                        header = lasts[-1]
+                    else:
+                        raise ValueError('opening brace without section')
+                    path += (header,)
+                    yield SECTION_OPEN, path, header
+                    pending = list(sub_items)
+                    pendings.append(pending)
+                    lasts.append(None)
+                elif token_type == 4:
+                    if len(pendings) < 2:
+                        self.warn('additional closing brace')
+                    else:
+                        yield from self._flush_events(pending, path, lasts)
+                        pendings.pop()
+                        lasts.pop()
+                        yield SECTION_CLOSE, path, path[-1]
+                        lasts[-1] = path[-1]
+                        path = path[:-1]
+                        pending = pendings[-1]
+                # else end-of-line comment, ignore
+            else:
+                # nothing but whitespace left
+                text = next(chunks, None)
+                if text is None:
+                    break
+                pos = seg_end = line_end = 0
+                continue
+            while True:
+                try:
+                    pos, seg_end, line_end = self._scan_irregular(text, pos, seg_end, line_end, collector)
+                    break
+                except AssertionError:
+                    # a multiline value or comment may go on in the next chunk - else the error comes up again at the end
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        raise
+                    text += chunk
+                    collector.items.clear()
+            pending.extend(collector.items)
+            collector.items.clear()
+        num_open = len(pendings) - 1
+        while len(pendings) > 1:
+            yield from self._flush_events(pendings.pop(), path, lasts)
+            lasts.pop()
+            yield SECTION_CLOSE, path, path[-1]
+            path = path[:-1]
+        yield from self._flush_events(pendings[0], path, lasts)
+        if num_open != 0:
+            self.warn('Unexpected end of gas: ' + str(num_open) + ' open sections')
+
+    def iter_events(self, path, warnings: list[str] = None):
+        with open(path, encoding='ANSI') as open_file:
+            chunks = iter(lambda: ''.join(open_file.readlines(self.EVENTS_CHUNK_SIZE)), '')  # whole lines
+            yield from self.iter_chunk_events(chunks, warnings)
+
+    def iter_attrs(self, path, *attr_path: str):
+        # attrs at a path of section headers & attr name, like Gas.find_attrs_by_path. '*' matches any header / name.
+        *section_path, attr_name = attr_path
+        attr_name = attr_name.lower()
+        depth = len(section_path)
+        for event, event_path, item in self.iter_events(path):
+            if event == ATTRIBUTE and len(event_path) == depth and (attr_name == '*' or item.name.lower() == attr_name):
+                if all(header == '*' or header == event_header for header, event_header in zip(section_path, event_path)):
+                    yield item
+
+    def collect_attrs(self, path, *attr_path: str) -> list[Attribute]:
+        return list(self.iter_attrs(path, *attr_path))
+
+    def parse_file(self, path, warnings: list[str] = None) -> Gas:
+        return self.run_in_context(GasParser.do_parse_file, warnings, path)
+
+    def do_parse_file(self, path) -> Gas:
         with open(path, encoding='ANSI') as open_file:
-            return self.parse_file_content(open_file)
+            if self.single_pass:
+                return self.do_parse_text(open_file.read())
+            return self.do_parse_file_content(open_file)
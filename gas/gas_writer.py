@@ -1,31 +1,58 @@
+import os
+
 from .gas import Gas, Section, Attribute
 
 
 class GasWriter:
-    @staticmethod
-    def format_attr(attr: Attribute, lines: list, indent: int):
-        attr_line = '\t'*indent if attr.datatype is None else '\t'*(indent-1) + '  {} '.format(attr.datatype)
-        attr_line += '{} = {};\n'.format(attr.name, attr.value_str)
-        lines.append(attr_line)
+    indents = ['']  # cached indent prefixes, indents[n] is n tabs
+
+    @classmethod
+    def get_indent(cls, indent: int) -> str:
+        while len(cls.indents) <= indent:
+            cls.indents.append('\t' * len(cls.indents))
+        return cls.indents[indent]
 
-    def _format_section(self, section: Section, lines: list, indent=0):
-        lines.append('\t'*indent + '[{}]\n'.format(section.header))
-        lines.append('\t'*indent + '{\n')
+    # writes the lines of a section through the given write function, e.g. list.append or file.write
+    def _write_section(self, section: Section, write, indent=0):
+        indents = self.indents
+        if len(indents) <= indent + 1:
+            self.get_indent(indent + 1)
+        prefix = indents[indent]
+        attr_prefix = indents[indent + 1]
+        typed_prefix = prefix + '  '
+        write(prefix + '[' + section.header + ']\n')
+        write(prefix + '{\n')
 
         for item in section.items:
             if isinstance(item, Attribute):
-                self.format_attr(item, lines, indent+1)
+                datatype = item.datatype
+                if datatype is None:
+                    value = item.value
+                    if type(value) is str:  # the common case, no formatting needed
+                        write(attr_prefix + item.name + ' = ' + value + ';\n')
+                    else:
+                        write(attr_prefix + item.name + ' = ' + item.value_str + ';\n')
+                else:
+                    write(typed_prefix + datatype + ' ' + item.name + ' = ' + item.value_str + ';\n')
             else:
                 assert isinstance(item, Section)
-                self._format_section(item, lines, indent + 1)
+                self._write_section(item, write, indent + 1)
+
+        write(prefix + '}\n')
 
-        lines.append('\t'*indent + '}\n')
+    # write the content of a gas file through the given write function
+    def write_sections(self, write, gas: Gas):
+        for section in gas.items:
+            self._write_section(section, write)
+
+    # write the content of a gas file to an open text file
+    def write_gas(self, file, gas: Gas):
+        self.write_sections(file.write, gas)
 
     # format the content of a gas file into lines
     def format_gas(self, gas: Gas) -> list[str]:
         lines = []
-        for section in gas.items:
-            self._format_section(section, lines)
+        self.write_sections(lines.append, gas)
         return lines
 
     def format_gas_str(self, gas: Gas) -> str:
@@ -34,10 +61,16 @@ class GasWriter:
     # format a section into a string
     def format_section_str(self, section: Section, indent=0) -> str:
         lines = []
-        self._format_section(section, lines, indent)
+        self._write_section(section, lines.append, indent)
         return '\n'.join(lines)
 
     def write_file(self, path: str, gas: Gas):
-        gas_lines = self.format_gas(gas)
-        with open(path, 'w') as file:
-            file.writelines(gas_lines)
+        # atomic: write to a temp file, then swap it in
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as file:
+                self.write_gas(file, gas)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)  # failed
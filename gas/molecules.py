@@ -6,6 +6,8 @@ import string
 
 
 class Hex(int):
+    __slots__ = ()
+
     @classmethod
     def random(cls):
         random_hex_str = '0x' + ''.join([random.choice(string.digits + 'abcdef') for _ in range(8)])
@@ -32,6 +34,8 @@ class Hex(int):
 
 
 class Position:
+    __slots__ = ('x', 'y', 'z', 'node_guid')
+
     def __init__(self, x: float, y: float, z: float, node_guid: Hex):
         self.x: float = x
         self.y: float = y
@@ -48,6 +52,8 @@ class Position:
 
 
 class Quaternion:
+    __slots__ = ('x', 'y', 'z', 'w')
+
     def __init__(self, x: float, y: float, z: float, w: float):
         self.x = x
         self.y = y
@@ -6,13 +6,7 @@ from bits.maps.game_object import GameObject
 from bits.maps.region import Region
 from bits.maps.terrain import TerrainNode
 from gas.molecules import Position
-from landscaping.plant_gen import load_mesh_info, PlantableArea, random_position
-
-
-def place_randomly(plant: GameObject, plantable_area: PlantableArea, node: TerrainNode, bits: Bits):
-    pos = random_position(plantable_area, node, bits)
-    if pos is not None:
-        plant.section.get_section('placement').set_attr_value('position', pos)
+from landscaping.plant_gen import load_mesh_info, random_positions
 
 
 # plants that are placed on or in water
@@ -36,6 +30,7 @@ def grow_out_region(region: Region, no_water_plants: bool, bits: Bits) -> int:
     region.terrain = None  # don't try to save
     missing_meshes = set()
     changes = 0
+    node_plants: dict[TerrainNode, list[GameObject]] = dict()
     for plant in plants:
         pos: Position = plant.get_own_value('placement', 'position')
         node_id = pos.node_guid
@@ -47,7 +42,13 @@ def grow_out_region(region: Region, no_water_plants: bool, bits: Bits) -> int:
         if not plantable_area:
             continue
         changes += 1
-        place_randomly(plant, plantable_area, node, bits)
+        node_plants.setdefault(node, list()).append(plant)
+    # new positions per node in one batch each
+    for node, plants_on_node in node_plants.items():
+        positions = random_positions(plantable_areas[node.mesh_name], node, bits, len(plants_on_node))
+        for plant, pos in zip(plants_on_node, positions):
+            if pos is not None:
+                plant.section.get_section('placement').set_attr_value('position', pos)
     print(f'  Repositioned {changes} of {len(plants)} plants')
     if changes:
         region.save()
@@ -46,8 +46,8 @@ class LightProfile:
 
 def random_position(node: TerrainNode, bits: Bits) -> PosDir or None:
     sno = bits.snos.get_sno_by_name(node.mesh_name)
-    x = random.uniform(sno.sno.bounding_box.min.x, sno.sno.bounding_box.max.x)
-    z = random.uniform(sno.sno.bounding_box.min.z, sno.sno.bounding_box.max.z)
+    x = random.uniform(sno.view.bounding_box.min.x, sno.view.bounding_box.max.x)
+    z = random.uniform(sno.view.bounding_box.min.z, sno.view.bounding_box.max.z)
     pos_found = sno.is_in_floor_2d(x, z)
     if not pos_found:
         return None
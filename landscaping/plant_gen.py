@@ -4,8 +4,11 @@ import math
 import os
 import random
 import sys
+from collections import Counter
 from typing import Optional
 
+import numpy as np
+
 from bits.bits import Bits
 from bits.maps.game_object_data import GameObjectData, Placement, Aspect, Common
 from gas.gas import Position, Quaternion
@@ -98,22 +101,33 @@ class Plant:
         self.size: float = size
 
 
-def random_position(plantable_area: PlantableArea, node: TerrainNode, bits: Bits) -> Optional[Position]:
+def random_positions(plantable_area: PlantableArea, node: TerrainNode, bits: Bits, num_positions: int, num_tries=16) -> list[Optional[Position]]:
+    # one candidate per position and round, checked against the floor in one go; rounds repeat for the positions not found yet
     sno = bits.snos.get_sno_by_name(node.mesh_name)
-    x = y = z = None
-    pos_found = False
-    for n in range(16):
-        x, y, z = plantable_area.random_position()
-        assert sno.is_in_bounding_box_2d(x, z), f'{x}|{y}|{z} not in {sno.bb_str(sno.sno.bounding_box)} bounds of {node.mesh_name}'
-        pos_found = sno.is_in_floor_2d(x, z)
-        if pos_found:
-            y = sno.snap_to_ground(x, z)
+    bb = sno.view.bounding_box
+    positions: list[Optional[Position]] = [None] * num_positions
+    pending = list(range(num_positions))
+    for _ in range(num_tries):
+        if len(pending) == 0:
             break
-    if not pos_found:
+        candidates = [plantable_area.random_position() for _ in pending]
+        x = np.array([c[0] for c in candidates])
+        z = np.array([c[2] for c in candidates])
+        out_of_bounds = np.nonzero((x < bb.min.x) | (x > bb.max.x) | (z < bb.min.z) | (z > bb.max.z))[0]
+        if len(out_of_bounds) > 0:
+            x, y, z = candidates[out_of_bounds[0]]
+            assert False, f'{x}|{y}|{z} not in {sno.bb_str(bb)} bounds of {node.mesh_name}'
+        on_floor, heights = sno.snap_to_ground_batch(x, z)
+        for i in on_floor.nonzero()[0].tolist():
+            positions[pending[i]] = Position(float(x[i]), float(heights[i]), float(z[i]), node.guid)
+        pending = [pending[i] for i in (~on_floor).nonzero()[0].tolist()]
+    for _ in pending:
         print(f'no pos found for {node.mesh_name}')
-        return None
-    pos = Position(x, y, z, node.guid)
-    return pos
+    return positions
+
+
+def random_position(plantable_area: PlantableArea, node: TerrainNode, bits: Bits) -> Optional[Position]:
+    return random_positions(plantable_area, node, bits, 1)[0]
 
 
 def generate_plants(terrain: Terrain, plants_profile: dict[str, float], node_masks: NodeMasks, bits: Bits) -> list[Plant]:
@@ -148,6 +162,7 @@ def generate_plants(terrain: Terrain, plants_profile: dict[str, float], node_mas
             overall_weighted += weighted
             weighted_area_dist.append((overall_weighted, node))
 
+        plant_nodes = list()
         for i in range(num_plants):
             rand_val = random.uniform(0, overall_weighted)
             node = None
@@ -155,8 +170,15 @@ def generate_plants(terrain: Terrain, plants_profile: dict[str, float], node_mas
                 if max_rand_val > rand_val:
                     node = n
                     break
-            plantable_area = mesh_info[node.mesh_name]
-            pos = random_position(plantable_area, node, bits)
+            plant_nodes.append(node)
+
+        # positions per node in one batch each
+        node_positions: dict[TerrainNode, list[Optional[Position]]] = dict()
+        for node, num_node_plants in Counter(plant_nodes).items():
+            node_positions[node] = random_positions(mesh_info[node.mesh_name], node, bits, num_node_plants)
+
+        for node in plant_nodes:
+            pos = node_positions[node].pop()
             if pos is None:
                 continue
             orientation = random.uniform(0, math.tau)
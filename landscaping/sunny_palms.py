@@ -17,8 +17,8 @@ from terrain_layout import TerrainMetaData, NodeMetaData
 
 
 def random_position(node: TerrainNode, sno: SnoHandler) -> Position or None:
-    x = random.uniform(sno.sno.bounding_box.min.x, sno.sno.bounding_box.max.x)
-    z = random.uniform(sno.sno.bounding_box.min.z, sno.sno.bounding_box.max.z)
+    x = random.uniform(sno.view.bounding_box.min.x, sno.view.bounding_box.max.x)
+    z = random.uniform(sno.view.bounding_box.min.z, sno.view.bounding_box.max.z)
     pos_found = sno.is_in_floor_2d(x, z)
     if not pos_found:
         return None
@@ -4,6 +4,7 @@ import sys
 
 from bits.bits import Bits
 from bits.templates import Template
+from gas.gas_cache import GasCache
 from printouts.equipment import get_pcontent_variants
 
 HERO_NPC_MODELS = ['gah_fg', 'gah_fb', 'gan_df', 'ecm_sk', 'gan_hg']
@@ -83,6 +84,7 @@ def run_printout_clothes(bits_path: str):
 def init_arg_parser():
     parser = argparse.ArgumentParser(description='GasPy Printout Clothes')
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     return parser
 
 
@@ -93,6 +95,7 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     run_printout_clothes(args.bits)
 
 
@@ -4,6 +4,7 @@ import sys
 
 from bits.bits import Bits
 from elevator_nodes import read_elevators_gas, evaluate_map
+from gas.gas_cache import GasCache
 
 
 def elevator_nodes(map_names: list[str], asserts: list[str], bits_path: str):
@@ -20,6 +21,7 @@ def init_arg_parser():
     parser.add_argument('--eval-maps', nargs='+', help='evaluate these maps (extract ele guids and compare with lists)')
     parser.add_argument('--asserts', nargs='*', choices=['map-in-list', 'guids-in-list', 'no-unspecified-meshes'], default=list())
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     return parser
 
 
@@ -30,6 +32,7 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     elevator_nodes(args.eval_maps, args.asserts, args.bits)
 
 
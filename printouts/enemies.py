@@ -10,6 +10,7 @@ from gas.gas import Attribute
 from printouts.common import compute_skill_level, parse_bool_value, is_shield, SPELL_ATTR_NAMES
 from printouts.csv import write_csv_dict
 from gas.gas_parser import GasParser
+from gas.gas_cache import GasCache
 
 
 def parse_value(value, default=None, variables: dict = None):
@@ -461,6 +462,7 @@ def init_arg_parser():
     parser.add_argument('--world-level', choices=['regular', 'veteran', 'elite', 'all'], default='regular')
     parser.add_argument('--ds2-world-levels', action='store_true', help='DS2 mode for calculating/selecting enemies of the given world-level')
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     return parser
 
 
@@ -471,6 +473,7 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     write_enemies(args.bits, args.zero_xp, args.exclude, args.world_level, args.extend, args.output, args.ds2_world_levels)
 
 
@@ -6,6 +6,7 @@ import sys
 from bits.bits import Bits
 from bits.maps.map import Map
 from gas.gas_parser import GasParser
+from gas.gas_cache import GasCache
 from printouts.common import load_enemies, load_regions_xp, Enemy, RegionXP
 from printouts.csv import write_csv_dict
 
@@ -197,6 +198,7 @@ def init_arg_parser():
     parser = argparse.ArgumentParser(description='GasPy enemy_occurrence')
     parser.add_argument('--output', choices=['txt', 'csv'], default='txt')
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     return parser
 
 
@@ -207,6 +209,7 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     enemy_occurrence(args.bits, args.output)
 
 
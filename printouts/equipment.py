@@ -6,6 +6,7 @@ from bits.bits import Bits
 from bits.templates import Template
 from gas.gas import Section
 from gas.gas_parser import GasParser
+from gas.gas_cache import GasCache
 from printouts.common import parse_bool_value
 from printouts.csv import write_csv_dict
 
@@ -476,6 +477,7 @@ def equipment(bits_path: str, output_dir='output'):
 def init_arg_parser():
     parser = argparse.ArgumentParser(description='GasPy Printout Equipment')
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     parser.add_argument('--out', default='output')
     return parser
 
@@ -487,6 +489,7 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     equipment(args.bits, args.out)
 
 
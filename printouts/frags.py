@@ -5,6 +5,7 @@ import sys
 from bits.bits import Bits
 from bits.templates import Template
 from gas.gas_parser import GasParser
+from gas.gas_cache import GasCache
 from printouts.common import parse_bool_value, parse_value
 
 
@@ -201,6 +202,7 @@ def run_printout_frags(bits_path: str, evaluate='all', unsure=False):
 def init_arg_parser():
     parser = argparse.ArgumentParser(description='GasPy Printout Frags')
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     parser.add_argument('--evaluate', choices=['texture', 'scale', 'all'], default='all')
     parser.add_argument('--unsure', action='store_true')
     return parser
@@ -213,6 +215,7 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     run_printout_frags(args.bits, args.evaluate, args.unsure)
 
 
@@ -5,6 +5,7 @@ import sys
 from bits.bits import Bits
 from bits.maps.map import Map
 from gas.gas_parser import GasParser
+from gas.gas_cache import GasCache
 from printouts.common import load_regions_xp
 from printouts.csv import write_csv
 
@@ -48,6 +49,7 @@ def init_arg_parser():
     parser.add_argument('--add-region-xp', nargs='*', default=None)
     parser.add_argument('--world-levels', choices=['true', 'false'], default=None)
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     return parser
 
 
@@ -58,6 +60,7 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     map_levels(args.map, args.start_level, args.add_region_xp, args.world_levels, args.bits)
 
 
@@ -3,6 +3,7 @@ import argparse
 import sys
 
 from bits.bits import Bits
+from gas.gas_cache import GasCache
 from printouts.csv import write_csv
 
 
@@ -55,6 +56,7 @@ def printout_moods(bits: Bits):
 def init_arg_parser():
     parser = argparse.ArgumentParser(description='GasPy printouts moods')
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     return parser
 
 
@@ -65,6 +67,7 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     bits = Bits(args.bits)
     printout_moods(bits)
 
@@ -8,6 +8,7 @@ from bits.maps.game_object import GameObject
 from bits.maps.map import Map
 from bits.maps.region import Region
 from gas.gas_parser import GasParser
+from gas.gas_cache import GasCache
 
 
 def parse_model_name(model: str):
@@ -225,6 +226,7 @@ def init_arg_parser():
     parser.add_argument('map')
     parser.add_argument('--with-silent-convos', action='store_true')
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     return parser
 
 
@@ -235,6 +237,7 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     printout_npcs(args.map, args.bits, args.with_silent_convos)
 
 
@@ -5,6 +5,7 @@ import sys
 from bits.bits import Bits
 from bits.templates import Template
 from gas.gas_parser import GasParser
+from gas.gas_cache import GasCache
 from printouts.csv import write_csv_dict
 from printouts.equipment import Equipment, EQUIPMENT_USAGE, load_equipment_templates, PContentVariant
 
@@ -252,6 +253,7 @@ def scontentmart(bits_path: str, output_dir='output'):
 def init_arg_parser():
     parser = argparse.ArgumentParser(description='GasPy Printout SContentMart data')
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     parser.add_argument('--out', default='output')
     return parser
 
@@ -263,6 +265,7 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     scontentmart(args.bits, args.out)
 
 
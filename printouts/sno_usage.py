@@ -8,6 +8,7 @@ from bits.maps.region import Region
 from bits.maps.terrain import TerrainNode
 from bits.snos import SNOs
 from gas.gas_parser import GasParser
+from gas.gas_cache import GasCache
 
 
 def combine_usages(combo_type: str, usages: dict, sub_usages: dict):
@@ -235,6 +236,7 @@ def init_arg_parser():
     parser.add_argument('--maps', nargs='*')
     parser.add_argument('--count-usage-values', action='store_true')
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     parser.add_argument('--node-bits', default=None)
     return parser
 
@@ -246,6 +248,7 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     sno_usage(args.usage, args.maps, args.count_usage_values, args.bits, args.node_bits)
 
 
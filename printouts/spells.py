@@ -4,6 +4,7 @@ import sys
 from bits.bits import Bits
 from bits.templates import Template
 from gas.gas_parser import GasParser
+from gas.gas_cache import GasCache
 from printouts.common import SPELL_ATTR_NAMES
 from printouts.csv import write_csv
 
@@ -176,6 +177,7 @@ def init_arg_parser():
     parser.add_argument('--only-type', choices=['spell', 'scroll'])
     parser.add_argument('--only-class', choices=['nature', 'combat'])
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     return parser
 
 
@@ -186,6 +188,7 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     GasParser.get_instance().print_warnings = False
     bits = Bits(args.bits)
     write_spells_csv(bits, args.only_for, args.only_type, args.only_class)
@@ -5,6 +5,7 @@ import sys
 from bits.bits import Bits
 from bits.maps.map import Map
 from gas.gas_parser import GasParser
+from gas.gas_cache import GasCache
 from printouts.csv import write_csv
 
 
@@ -71,6 +72,7 @@ def init_arg_parser():
     parser = argparse.ArgumentParser(description='GasPy startpos_xp')
     parser.add_argument('--maps', nargs='+')
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     return parser
 
 
@@ -81,6 +83,7 @@ def parse_args(argv: list[str]):
 
 def main(argv: list[str]):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     startpos_xp(args.bits, args.maps)
 
 
@@ -4,6 +4,7 @@ import sys
 from bits.bits import Bits
 from bits.maps.map import Map
 from gas.gas_parser import GasParser
+from gas.gas_cache import GasCache
 from printouts.enemy_attacks import write_enemy_attacks_csv
 from printouts.enemy_occurrence import print_enemy_occurrence
 from printouts.level_enemies import write_level_enemies_csv
@@ -38,6 +39,7 @@ def init_arg_parser():
     parser = argparse.ArgumentParser(description='GasPy statistics')
     parser.add_argument('which', choices=which_choices)
     parser.add_argument('--bits', default=None)
+    GasCache.add_arguments(parser)
     parser.add_argument('--map-name', nargs='?')  # for map-specific printouts
     return parser
 
@@ -49,6 +51,7 @@ def parse_args(argv):
 
 def main(argv):
     args = parse_args(argv)
+    GasCache.apply_arguments(args)
     GasParser.get_instance().print_warnings = False
     bits = Bits(args.bits)
     which = args.which
@@ -1,6 +1,7 @@
 from typing import Union
 
 from bits.bits import Bits
+from bits.template_table import TemplateTable
 from bits.templates import Template
 from printouts.common import get_wl_templates, none_empty
 from printouts.csv import write_csv
@@ -25,43 +26,39 @@ def parse_value(value):
     return value
 
 
+SKILL_STATS = ['strength', 'dexterity', 'intelligence', 'melee', 'ranged', 'combat_magic', 'nature_magic']
+ACTOR_STAT_COLUMNS = {
+    'experience_value': ('aspect', 'experience_value'),
+    'defense': ('defend', 'defense'),
+    'damage_min': ('attack', 'damage_min'),
+    'damage_max': ('attack', 'damage_max'),
+    'life': ('aspect', 'life'),
+    'max_life': ('aspect', 'max_life'),
+    'mana': ('aspect', 'mana'),
+    'max_mana': ('aspect', 'max_mana'),
+    **{skill: (lambda template, skill=skill: wl_actor_skill(template, skill)) for skill in SKILL_STATS},
+}
+
+
 def actor_stats_dict(template: Template) -> dict[str, Union[int, float]]:
-    values = {
-        'experience_value': template.compute_value('aspect', 'experience_value'),
-        'defense': template.compute_value('defend', 'defense'),
-        'damage_min': template.compute_value('attack', 'damage_min'),
-        'damage_max': template.compute_value('attack', 'damage_max'),
-        'life': template.compute_value('aspect', 'life'),
-        'max_life': template.compute_value('aspect', 'max_life'),
-        'mana': template.compute_value('aspect', 'mana'),
-        'max_mana': template.compute_value('aspect', 'max_mana'),
-        'strength': wl_actor_skill(template, 'strength'),
-        'dexterity': wl_actor_skill(template, 'dexterity'),
-        'intelligence': wl_actor_skill(template, 'intelligence'),
-        'melee': wl_actor_skill(template, 'melee'),
-        'ranged': wl_actor_skill(template, 'ranged'),
-        'combat_magic': wl_actor_skill(template, 'combat_magic'),
-        'nature_magic': wl_actor_skill(template, 'nature_magic'),
-    }
+    values = {stat: column(template) if callable(column) else template.compute_value(*column) for stat, column in ACTOR_STAT_COLUMNS.items()}
     return {stat: parse_value(value) for stat, value in values.items()}
 
 
+def actor_stats_table(templates: list[Template], names: list[str] = None) -> TemplateTable:
+    return TemplateTable.extract(templates, ACTOR_STAT_COLUMNS, names)
+
+
 def write_world_level_stats_csv(bits: Bits):
     actors = bits.templates.get_actor_templates()  # todo option for only enemies (and not unused)
     wls_actors = get_wl_templates(actors)
 
     wls = ['regular', 'veteran', 'elite']
-    skill_stats = ['strength', 'dexterity', 'intelligence', 'melee', 'ranged', 'combat_magic', 'nature_magic']
-    other_stats = ['defense', 'damage_min', 'damage_max', 'life', 'max_life', 'mana', 'max_mana']
-    stats = ['experience_value'] + other_stats + skill_stats
+    stats = list(ACTOR_STAT_COLUMNS.keys())
+    names = [name for name, wl_actors in wls_actors.items() if None not in wl_actors.values()]  # e.g. molten_golem_summon_gom has no 2W/3W templates
+    wl_tables = {wl: actor_stats_table([wls_actors[name][wl] for name in names], names) for wl in wls}
+    columns = [names]
+    columns += [none_empty(wl_tables[wl].cell_values(stat)) for stat in stats for wl in wls]
     csv = [['actor'] + [f'{wl} {stat}' for stat in stats for wl in wls]]
-    for name, wl_actors in wls_actors.items():
-        if None in wl_actors.values():
-            continue  # e.g. molten_golem_summon_gom has no 2W/3W templates
-        actors = [actor_stats_dict(wl_actors[wl]) for wl in wls]
-        csv_line = [name]
-        for stat in stats:
-            wl_stats = [a[stat] for a in actors]
-            csv_line += none_empty(wl_stats)
-        csv.append(csv_line)
+    csv += [list(row) for row in zip(*columns)]
     write_csv('World-Level Stats', csv)
@@ -25,13 +25,11 @@ def convert_region(region: Region, nmg: NodeMeshGuids, force=False):
     node_sections = nodes_section.get_sections()
     mesh_guid_attrs = [ns.get_attr('mesh_guid') for ns in node_sections]
     node_mesh_index = {}
-    node_mesh_guids = nmg.get_node_mesh_guids()
+    node_mesh_guids = nmg.get_node_mesh_guids_by_hex()  # also resolves 0x0a801037 -> 0xa801037g: t_gi_flr_04x04-b (map_world gi_r10 node 0xf0cce721)
     for mesh_guid_attr in mesh_guid_attrs:
-        mesh_guid = mesh_guid_attr.value.to_str_lower()
-        if mesh_guid == '0x0a801037':
-            mesh_guid = '0xa801037g'  # wtf - map_world gi_r10 node 0xf0cce721 - 0xa801037g: t_gi_flr_04x04-b
+        mesh_guid = mesh_guid_attr.value
         if mesh_guid not in node_mesh_guids:
-            print_node_mesh_guids(node_mesh_guids)
+            print_node_mesh_guids(nmg.get_node_mesh_guids())
             assert mesh_guid in node_mesh_guids, f'{mesh_guid} is not in node_mesh_guids!'
         if mesh_guid not in node_mesh_index:
             node_mesh_index[mesh_guid] = Hex(len(node_mesh_index) + 1)
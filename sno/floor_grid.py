@@ -0,0 +1,111 @@
+import math
+
+import numpy as np
+
+from sno.geometry import is_point_inside_triangle_2d, snap_point_to_plane
+from sno.sno_view import TRIANGLE_DTYPE, V3_DTYPE
+
+
+# Uniform 2d (x/z) grid over floor triangles: each cell lists the triangles whose bounding box overlaps it,
+# so a point is only tested against the few triangles of its cell instead of all of them.
+# Triangle order is kept - where triangles overlap, the first one wins, as with a plain loop over them.
+class FloorGrid:
+    TRIANGLES_PER_CELL = 2  # on average, for choosing the grid size
+
+    def __init__(self, triangles: np.ndarray, normals: np.ndarray):
+        assert triangles.dtype == TRIANGLE_DTYPE and normals.dtype == V3_DTYPE
+        self.num_triangles = len(triangles)
+        self.ax, self.ay, self.az = [triangles['a'][c].astype(np.float64) for c in 'xyz']
+        self.bx, self.bz = [triangles['b'][c].astype(np.float64) for c in 'xz']
+        self.cx, self.cz = [triangles['c'][c].astype(np.float64) for c in 'xz']
+        self.nx, self.ny, self.nz = [normals[c].astype(np.float64) for c in 'xyz']
+        # same values as Python floats for single point queries, which are faster without NumPy overhead
+        self.corners: list[tuple] = list(zip(self.ax.tolist(), self.az.tolist(), self.bx.tolist(), self.bz.tolist(), self.cx.tolist(), self.cz.tolist()))
+
+        min_x = np.minimum(np.minimum(self.ax, self.bx), self.cx)
+        max_x = np.maximum(np.maximum(self.ax, self.bx), self.cx)
+        min_z = np.minimum(np.minimum(self.az, self.bz), self.cz)
+        max_z = np.maximum(np.maximum(self.az, self.bz), self.cz)
+        if self.num_triangles > 0:
+            self.min_x, self.max_x, self.min_z, self.max_z = float(min_x.min()), float(max_x.max()), float(min_z.min()), float(max_z.max())
+        else:
+            self.min_x = self.max_x = self.min_z = self.max_z = 0.0
+        size_x, size_z = self.max_x - self.min_x, self.max_z - self.min_z
+        num_cells = max(1, self.num_triangles // self.TRIANGLES_PER_CELL)
+        cell_size = math.sqrt(size_x * size_z / num_cells) if size_x > 0 and size_z > 0 else max(size_x, size_z, 1.0)
+        self.cells_x = max(1, min(num_cells, math.ceil(size_x / cell_size)))
+        self.cells_z = max(1, min(num_cells, math.ceil(size_z / cell_size)))
+        self.cell_size_x = size_x / self.cells_x if size_x > 0 else 1.0
+        self.cell_size_z = size_z / self.cells_z if size_z > 0 else 1.0
+
+        # cell -> triangles as CSR: triangles of cell i are cell_triangles[cell_starts[i]:cell_starts[i+1]], in ascending order
+        ix0, ix1 = self.cell_x(min_x), self.cell_x(max_x)
+        iz0, iz1 = self.cell_z(min_z), self.cell_z(max_z)
+        width = ix1 - ix0 + 1
+        counts = width * (iz1 - iz0 + 1)
+        triangle_indexes = np.repeat(np.arange(self.num_triangles), counts)
+        local = np.arange(len(triangle_indexes)) - np.repeat(np.cumsum(counts) - counts, counts)
+        cells = (iz0[triangle_indexes] + local // width[triangle_indexes]) * self.cells_x + ix0[triangle_indexes] + local % width[triangle_indexes]
+        order = np.lexsort((triangle_indexes, cells))
+        self.cell_triangles = triangle_indexes[order]
+        self.cell_starts = np.zeros(self.cells_x * self.cells_z + 1, np.int64)
+        np.cumsum(np.bincount(cells, minlength=self.cells_x * self.cells_z), out=self.cell_starts[1:])
+        self.cell_lists: list[list[int]] = None  # per cell, for single point queries
+
+    def cell_x(self, x):
+        return np.clip(np.floor((x - self.min_x) / self.cell_size_x), 0, self.cells_x - 1).astype(np.int64)
+
+    def cell_z(self, z):
+        return np.clip(np.floor((z - self.min_z) / self.cell_size_z), 0, self.cells_z - 1).astype(np.int64)
+
+    def get_cell_lists(self) -> list[list[int]]:
+        if self.cell_lists is None:
+            triangles = self.cell_triangles.tolist()
+            starts = self.cell_starts.tolist()
+            self.cell_lists = [triangles[starts[i]:starts[i+1]] for i in range(len(starts) - 1)]
+        return self.cell_lists
+
+    def find_triangle(self, x: float, z: float) -> int or None:
+        # index of the first triangle containing the point
+        if not (self.min_x <= x <= self.max_x and self.min_z <= z <= self.max_z):
+            return None
+        ix = min(int((x - self.min_x) / self.cell_size_x), self.cells_x - 1)
+        iz = min(int((z - self.min_z) / self.cell_size_z), self.cells_z - 1)
+        for index in self.get_cell_lists()[iz * self.cells_x + ix]:
+            if is_point_inside_triangle_2d(*self.corners[index], x, z):
+                return index
+        return None
+
+    def snap(self, x: float, z: float, index: int) -> float:
+        return snap_point_to_plane(float(self.ax[index]), float(self.ay[index]), float(self.az[index]), float(self.nx[index]), float(self.ny[index]), float(self.nz[index]), x, z)
+
+    def find_triangles(self, x: np.ndarray, z: np.ndarray) -> np.ndarray:
+        # vectorized find_triangle: index of the first triangle containing each point, -1 for none
+        x = np.asarray(x, np.float64).ravel()
+        z = np.asarray(z, np.float64).ravel()
+        indexes = np.full(len(x), -1, np.int64)
+        points = np.nonzero((self.min_x <= x) & (x <= self.max_x) & (self.min_z <= z) & (z <= self.max_z))[0]
+        if len(points) == 0 or self.num_triangles == 0:
+            return indexes
+        cells = self.cell_z(z[points]) * self.cells_x + self.cell_x(x[points])
+        starts = self.cell_starts[cells]
+        counts = self.cell_starts[cells + 1] - starts
+        # all (point, candidate triangle) pairs, grouped by point, triangles ascending
+        pair_points = np.repeat(points, counts)
+        local = np.arange(len(pair_points)) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_triangles = self.cell_triangles[np.repeat(starts, counts) + local]
+        hits = is_point_inside_triangle_2d(self.ax[pair_triangles], self.az[pair_triangles], self.bx[pair_triangles], self.bz[pair_triangles],
+                                           self.cx[pair_triangles], self.cz[pair_triangles], x[pair_points], z[pair_points])
+        hit_points, first_hits = np.unique(pair_points[hits], return_index=True)
+        indexes[hit_points] = pair_triangles[hits][first_hits]
+        return indexes
+
+    def snap_all(self, x: np.ndarray, z: np.ndarray, indexes: np.ndarray) -> np.ndarray:
+        # heights of the points on the given triangles, NaN where the index is -1
+        x = np.asarray(x, np.float64).ravel()
+        z = np.asarray(z, np.float64).ravel()
+        heights = np.full(len(x), np.nan)
+        found = indexes >= 0
+        t = indexes[found]
+        heights[found] = snap_point_to_plane(self.ax[t], self.ay[t], self.az[t], self.nx[t], self.ny[t], self.nz[t], x[found], z[found])
+        return heights
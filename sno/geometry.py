@@ -1,23 +1,21 @@
-import math
-
-
 def triangle_2d_area(x1, y1, x2, y2, x3, y3):
     return abs((x1 * (y2 - y3) + x2 * (y3 - y1) + x3 * (y1 - y2)) / 2.0)
 
 
-def is_point_inside_triangle_2d(x1, y1, x2, y2, x3, y3, x, y):
-    # area of triangle ABC
-    a = triangle_2d_area(x1, y1, x2, y2, x3, y3)
+EDGE_TOLERANCE = 1e-9  # relative to the triangle size, so points on an edge shared by two triangles are found in either
 
-    # area of triangle PBC
-    a1 = triangle_2d_area(x, y, x2, y2, x3, y3)
-    # area of triangle PAC
-    a2 = triangle_2d_area(x1, y1, x, y, x3, y3)
-    # area of triangle PAB
-    a3 = triangle_2d_area(x1, y1, x2, y2, x, y)
 
-    # Check if sum of A1, A2 and A3 is the same as A
-    return math.isclose(a, a1 + a2 + a3)
+# barycentric test: the point is inside if it's on the same side of all three edges (either winding), edges included.
+# works on NumPy arrays as well - for many triangles and/or many points at once, returning a bool array
+def is_point_inside_triangle_2d(x1, y1, x2, y2, x3, y3, x, y):
+    area2 = (x2 - x1) * (y3 - y1) - (y2 - y1) * (x3 - x1)  # twice the signed area
+    d1 = (x2 - x1) * (y - y1) - (y2 - y1) * (x - x1)
+    d2 = (x3 - x2) * (y - y2) - (y3 - y2) * (x - x2)
+    d3 = (x1 - x3) * (y - y3) - (y1 - y3) * (x - x3)
+    tolerance = EDGE_TOLERANCE * abs(area2)
+    ccw = (d1 >= -tolerance) & (d2 >= -tolerance) & (d3 >= -tolerance)
+    cw = (d1 <= tolerance) & (d2 <= tolerance) & (d3 <= tolerance)
+    return (area2 != 0) & (ccw | cw)  # degenerate triangles contain nothing
 
 
 # a = plane point, n = plane normal, x,z = point 2d -> returns y
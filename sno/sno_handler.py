@@ -1,10 +1,23 @@
-from sno.geometry import is_point_inside_triangle_2d, snap_point_to_plane
+import numpy as np
+
+from sno.floor_grid import FloorGrid
 from sno.sno import Sno
+from sno.sno_view import SnoView, LogicalMesh, TRIANGLE_DTYPE, V3_DTYPE
 
 
 class SnoHandler:
     def __init__(self, sno_path):
-        self.sno = Sno.from_file(sno_path)
+        self.path = sno_path
+        self.view = SnoView.from_file(sno_path)  # all queries below work on this
+        self._sno: Sno = None
+        self._floor_grid: FloorGrid = None
+
+    @property
+    def sno(self) -> Sno:
+        # the full kaitai object model, parsed on first access
+        if self._sno is None:
+            self._sno = Sno.from_file(self.path)
+        return self._sno
 
     @classmethod
     def v3_str(cls, v3: Sno.V3):
@@ -19,15 +32,15 @@ class SnoHandler:
         print(f'{indent}texture: {surface.texture}')
 
     @classmethod
-    def print_logical_mesh(cls, logical_mesh: Sno.LogicalMesh, indent=''):
+    def print_logical_mesh(cls, logical_mesh: LogicalMesh, indent=''):
         print(f'{indent}- index: {logical_mesh.index}')
         print(f'{indent}  floor: {logical_mesh.floor}')
         print(f'{indent}  triangle_section_count: {logical_mesh.triangle_section_count}')
-        for triangle_section in logical_mesh.triangle_section:
-            print(f'{indent}  - {cls.v3_str(triangle_section.triangle.a)}, {cls.v3_str(triangle_section.triangle.b)}, {cls.v3_str(triangle_section.triangle.c)}')
+        for a, b, c in logical_mesh.triangles.tolist():
+            print(f'{indent}  - ({a[0]} | {a[1]} | {a[2]}), ({b[0]} | {b[1]} | {b[2]}), ({c[0]} | {c[1]} | {c[2]})')
 
     @classmethod
-    def print_sno(cls, sno: Sno, indent='', redundant=False, basic=True, surfaces=False, logical_mesh=False):
+    def print_sno(cls, sno: SnoView, indent='', redundant=False, basic=True, surfaces=False, logical_mesh=False):
         # printing fields in the order defined in the KSY
         if redundant:
             print(f'{indent}magic: {sno.magic}')
@@ -56,7 +69,7 @@ class SnoHandler:
                 cls.print_logical_mesh(lm, indent + '  ')
 
     def print(self, indent='', redundant=False, basic=True, surfaces=False, logical_mesh=False):
-        self.print_sno(self.sno, indent, redundant, basic, surfaces, logical_mesh)
+        self.print_sno(self.view, indent, redundant, basic, surfaces, logical_mesh)
 
     @classmethod
     def _is_in_bounding_box(cls, x: float, y: float, z: float, box: Sno.BoundingBox):
@@ -65,7 +78,7 @@ class SnoHandler:
                box.min.z <= z <= box.max.z
 
     def is_in_bounding_box(self, x: float, y: float, z: float):
-        return self._is_in_bounding_box(x, y, z, self.sno.bounding_box)
+        return self._is_in_bounding_box(x, y, z, self.view.bounding_box)
 
     @classmethod
     def _bounding_box_2d_size(cls, box: Sno.BoundingBox):
@@ -74,7 +87,7 @@ class SnoHandler:
         return x*z
 
     def bounding_box_2d_size(self) -> float:
-        return self._bounding_box_2d_size(self.sno.bounding_box)
+        return self._bounding_box_2d_size(self.view.bounding_box)
 
     @classmethod
     def _is_in_bounding_box_2d(cls, x: float, z: float, box: Sno.BoundingBox):
@@ -82,48 +95,35 @@ class SnoHandler:
                box.min.z <= z <= box.max.z
 
     def is_in_bounding_box_2d(self, x: float, z: float):
-        return self._is_in_bounding_box_2d(x, z, self.sno.bounding_box)
-
-    @classmethod
-    def _is_in_triangle_2d(cls, x: float, z: float, triangle: Sno.Triangle):
-        return is_point_inside_triangle_2d(triangle.a.x, triangle.a.z, triangle.b.x, triangle.b.z, triangle.c.x, triangle.c.z, x, z)
+        return self._is_in_bounding_box_2d(x, z, self.view.bounding_box)
 
-    @classmethod
-    def _find_triangle_2d(cls, x: float, z: float, mesh: Sno.LogicalMesh):
-        if not cls._is_in_bounding_box_2d(x, z, mesh.bounding_box):
-            return None
-        for triangle in mesh.triangle_section:
-            if cls._is_in_triangle_2d(x, z, triangle.triangle):
-                return triangle
-        return None
-
-    @classmethod
-    def _is_in_mesh_2d(cls, x: float, z: float, mesh: Sno.LogicalMesh):
-        return cls._find_triangle_2d(x, z, mesh) is not None
+    def get_floor_grid(self) -> FloorGrid:
+        # all floor triangles of all logical meshes, in mesh order; built on first use
+        if self._floor_grid is None:
+            floor_meshes = [mesh for mesh in self.view.logical_mesh if mesh.floor == Sno.Floor.floor]
+            triangles = np.concatenate([mesh.triangles for mesh in floor_meshes]) if len(floor_meshes) > 0 else np.empty(0, TRIANGLE_DTYPE)
+            normals = np.concatenate([mesh.normals for mesh in floor_meshes]) if len(floor_meshes) > 0 else np.empty(0, V3_DTYPE)
+            self._floor_grid = FloorGrid(triangles, normals)
+        return self._floor_grid
 
     def is_in_floor_2d(self, x: float, z: float):
         if not self.is_in_bounding_box_2d(x, z):
             return False
-        for mesh in self.sno.logical_mesh:
-            if mesh.floor != Sno.Floor.floor:
-                continue
-            if self._is_in_mesh_2d(x, z, mesh):
-                return True
-        return False
-
-    @classmethod
-    def _snap_to_triangle(cls, x: float, z: float, triangle: Sno.Triangle, normal: Sno.V3) -> float:
-        return snap_point_to_plane(triangle.a.x, triangle.a.y, triangle.a.z, normal.x, normal.y, normal.z, x, z)
+        return self.get_floor_grid().find_triangle(x, z) is not None
 
     def snap_to_ground(self, x: float, z: float):
-        triangle = None
-        for mesh in self.sno.logical_mesh:
-            if mesh.floor != Sno.Floor.floor:
-                continue
-            t = self._find_triangle_2d(x, z, mesh)
-            if t is not None:
-                triangle = t
-                break
-        assert isinstance(triangle, Sno.TriangleSection)
-
-        return self._snap_to_triangle(x, z, triangle.triangle, triangle.normal)
+        floor_grid = self.get_floor_grid()
+        index = floor_grid.find_triangle(x, z)
+        assert index is not None, f'{x}|{z} is not on the floor'
+        return floor_grid.snap(x, z, index)
+
+    # batch versions for many points at once - x & z are NumPy arrays (or anything array-like) of the same length
+
+    def is_in_floor_2d_batch(self, x: np.ndarray, z: np.ndarray) -> np.ndarray:
+        return self.get_floor_grid().find_triangles(x, z) >= 0
+
+    def snap_to_ground_batch(self, x: np.ndarray, z: np.ndarray) -> (np.ndarray, np.ndarray):
+        # floor mask & heights, NaN where not on the floor
+        floor_grid = self.get_floor_grid()
+        indexes = floor_grid.find_triangles(x, z)
+        return indexes >= 0, floor_grid.snap_all(x, z, indexes)
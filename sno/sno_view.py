@@ -0,0 +1,213 @@
+import mmap
+import struct
+
+import numpy as np
+from kaitaistruct import KaitaiStream
+
+from sno.sno import Sno
+
+
+# NumPy dtypes mirroring the types in sno.ksy (little endian, packed)
+V3_DTYPE = np.dtype([('x', '<f4'), ('y', '<f4'), ('z', '<f4')])
+BOUNDING_BOX_DTYPE = np.dtype([('min', V3_DTYPE), ('max', V3_DTYPE)])
+TRIANGLE_DTYPE = np.dtype([('a', V3_DTYPE), ('b', V3_DTYPE), ('c', V3_DTYPE)])
+COLOR_DTYPE = np.dtype([('r', 'u1'), ('g', 'u1'), ('b', 'u1'), ('a', 'u1')])
+TCOORDS_DTYPE = np.dtype([('u', '<f4'), ('v', '<f4')])
+VERSION_DTYPE = np.dtype([('major', '<u4'), ('minor', '<u4')])
+FACE_DTYPE = np.dtype([('a', '<u2'), ('b', '<u2'), ('c', '<u2')])
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S4'), ('version', VERSION_DTYPE),
+    ('door_count', '<u4'), ('spot_count', '<u4'), ('vertex_count', '<u4'), ('triangle_count', '<u4'), ('texture_count', '<u4'),
+    ('bounding_box', BOUNDING_BOX_DTYPE), ('centroid_offset', V3_DTYPE),
+    ('tile', '<u4'), ('reserved0', '<u4'), ('reserved1', '<u4'), ('reserved2', '<u4')])  # checksum follows from version 6.2 on
+DOOR_DTYPE = np.dtype([('id', '<u4'), ('center', V3_DTYPE), ('x_axis', V3_DTYPE), ('y_axis', V3_DTYPE), ('z_axis', V3_DTYPE), ('vertex_count', '<u4')])  # + vertex_count u4
+SPOT_DTYPE = np.dtype([('x_axis', V3_DTYPE), ('y_axis', V3_DTYPE), ('z_axis', V3_DTYPE), ('center', V3_DTYPE)])  # + zero-terminated label
+VERTEX_DTYPE = np.dtype([('position', V3_DTYPE), ('normal', V3_DTYPE), ('color', COLOR_DTYPE), ('uvcoords', TCOORDS_DTYPE)])
+SURFACE_DTYPE = np.dtype([('start_corner', '<u4'), ('span_corner', '<u4'), ('vertex_count', '<u4')])  # after the zero-terminated texture; + vertex_count / 3 faces
+LOGICAL_MESH_DTYPE = np.dtype([('index', 'u1'), ('bounding_box', BOUNDING_BOX_DTYPE), ('floor', '<u4'), ('num_connections', '<u4')])
+TRIANGLE_SECTION_DTYPE = np.dtype([('triangle', TRIANGLE_DTYPE), ('normal', V3_DTYPE)])
+BSP_SECTION_DTYPE = np.dtype([('bounding_box', BOUNDING_BOX_DTYPE), ('is_leaf', 'u1'), ('triangle_count', '<u2')])  # + triangle_count u2, children u1, children
+
+
+# small stand-ins for the kaitai classes, so code written against Sno works on a SnoView too
+
+class V3:
+    def __init__(self, x: float, y: float, z: float):
+        self.x, self.y, self.z = x, y, z
+
+    @classmethod
+    def from_record(cls, record) -> 'V3':
+        return V3(*record.tolist())
+
+
+class BoundingBox:
+    def __init__(self, bb_min: V3, bb_max: V3):
+        self.min = bb_min
+        self.max = bb_max
+
+    @classmethod
+    def from_record(cls, record) -> 'BoundingBox':
+        return BoundingBox(V3.from_record(record['min']), V3.from_record(record['max']))
+
+
+class Version:
+    def __init__(self, major: int, minor: int):
+        self.major, self.minor = major, minor
+
+
+class Door:
+    def __init__(self, record, vertex_array: np.ndarray):
+        self.id = int(record['id'])
+        self.center = V3.from_record(record['center'])
+        self.x_axis = V3.from_record(record['x_axis'])
+        self.y_axis = V3.from_record(record['y_axis'])
+        self.z_axis = V3.from_record(record['z_axis'])
+        self.vertex_count = int(record['vertex_count'])
+        self.vertex_array = vertex_array
+
+
+class Spot:
+    def __init__(self, record, label: str):
+        self.x_axis = V3.from_record(record['x_axis'])
+        self.y_axis = V3.from_record(record['y_axis'])
+        self.z_axis = V3.from_record(record['z_axis'])
+        self.center = V3.from_record(record['center'])
+        self.label = label
+
+
+class Surface:
+    def __init__(self, texture: str, record, face_array: np.ndarray):
+        self.texture = texture
+        self.start_corner = int(record['start_corner'])
+        self.span_corner = int(record['span_corner'])
+        self.vertex_count = int(record['vertex_count'])
+        self.face_array = face_array
+
+
+class LogicalMesh:
+    def __init__(self, record, triangle_section: np.ndarray, bsp_offset: int):
+        self.record = record  # LOGICAL_MESH_DTYPE
+        self.index = int(record['index'])
+        self.bounding_box = BoundingBox.from_record(record['bounding_box'])
+        self.floor = KaitaiStream.resolve_enum(Sno.Floor, int(record['floor']))
+        self.triangle_section_count = len(triangle_section)
+        self.triangle_section = triangle_section  # TRIANGLE_SECTION_DTYPE
+        self.bsp_offset = bsp_offset  # of the bsp tree in the file
+
+    @property
+    def triangles(self) -> np.ndarray:  # TRIANGLE_DTYPE
+        return self.triangle_section['triangle']
+
+    @property
+    def normals(self) -> np.ndarray:  # V3_DTYPE
+        return self.triangle_section['normal']
+
+
+# Alternative to the kaitai Sno: the file is memory-mapped and the bulk data - vertices, faces, logical mesh triangles & normals -
+# are structured NumPy arrays viewing into it, instead of one Python object per element.
+# Header, doors, spots, surfaces and logical meshes themselves are few and get small objects named like their kaitai counterparts.
+class SnoView:
+    def __init__(self, data):
+        self.data = data
+        self.header = np.frombuffer(data, HEADER_DTYPE, 1)[0]
+        self.magic = self.header['magic'].tobytes()
+        if self.magic != b'SNOD':
+            raise ValueError(f'Not a SNO file, magic: {self.magic}')
+        self.version = Version(int(self.header['version']['major']), int(self.header['version']['minor']))
+        self.door_count = int(self.header['door_count'])
+        self.spot_count = int(self.header['spot_count'])
+        self.vertex_count = int(self.header['vertex_count'])
+        self.triangle_count = int(self.header['triangle_count'])
+        self.texture_count = int(self.header['texture_count'])
+        self.bounding_box = BoundingBox.from_record(self.header['bounding_box'])
+        self.centroid_offset = V3.from_record(self.header['centroid_offset'])
+        self.tile = int(self.header['tile'])
+        self.reserved0 = int(self.header['reserved0'])
+        self.reserved1 = int(self.header['reserved1'])
+        self.reserved2 = int(self.header['reserved2'])
+        self.checksum = None
+        offset = HEADER_DTYPE.itemsize
+        if self.is_version_at_least(6, 2):
+            self.checksum, offset = self._read_u4(offset)
+
+        self.door_array: list[Door] = list()
+        for _ in range(self.door_count):
+            record = np.frombuffer(data, DOOR_DTYPE, 1, offset)[0]
+            offset += DOOR_DTYPE.itemsize
+            vertex_array = np.frombuffer(data, '<u4', int(record['vertex_count']), offset)
+            offset += vertex_array.nbytes
+            self.door_array.append(Door(record, vertex_array))
+
+        self.spot_array: list[Spot] = list()
+        for _ in range(self.spot_count):
+            record = np.frombuffer(data, SPOT_DTYPE, 1, offset)[0]
+            label, offset = self._read_str(offset + SPOT_DTYPE.itemsize)
+            self.spot_array.append(Spot(record, label))
+
+        self.vertex_array = np.frombuffer(data, VERTEX_DTYPE, self.vertex_count, offset)
+        offset += self.vertex_array.nbytes
+
+        self.surface_array: list[Surface] = list()
+        for _ in range(self.texture_count):
+            texture, offset = self._read_str(offset)
+            record = np.frombuffer(data, SURFACE_DTYPE, 1, offset)[0]
+            offset += SURFACE_DTYPE.itemsize
+            face_array = np.frombuffer(data, FACE_DTYPE, int(record['vertex_count']) // 3, offset)
+            offset += face_array.nbytes
+            self.surface_array.append(Surface(texture, record, face_array))
+
+        self.logical_mesh_count, offset = self._read_u4(offset)
+        self.logical_mesh: list[LogicalMesh] = list()
+        for _ in range(self.logical_mesh_count):
+            offset = self._read_logical_mesh(offset)
+        # index, bounding box & floor of all logical meshes in one array
+        self.logical_mesh_array = np.array([lm.record for lm in self.logical_mesh], LOGICAL_MESH_DTYPE)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SnoView':
+        with open(path, 'rb') as sno_file:
+            data = mmap.mmap(sno_file.fileno(), 0, access=mmap.ACCESS_READ)  # stays mapped as long as arrays view into it
+        return SnoView(data)
+
+    def is_version_at_least(self, major: int, minor: int) -> bool:
+        return (self.version.major, self.version.minor) >= (major, minor)
+
+    def _read_u4(self, offset: int) -> (int, int):
+        return struct.unpack_from('<I', self.data, offset)[0], offset + 4
+
+    def _read_str(self, offset: int) -> (str, int):
+        end = self.data.find(b'\x00', offset)
+        return self.data[offset:end].decode('ASCII'), end + 1
+
+    def _read_logical_mesh(self, offset: int) -> int:
+        data = self.data
+        record = np.frombuffer(data, LOGICAL_MESH_DTYPE, 1, offset)[0]
+        offset += LOGICAL_MESH_DTYPE.itemsize
+        for _ in range(int(record['num_connections'])):
+            offset += 2 + 2 * V3_DTYPE.itemsize  # newid, min_box, max_box
+            if self.is_version_at_least(6, 4):
+                offset += V3_DTYPE.itemsize  # center
+            if self.is_version_at_least(6, 2):
+                num_triangles = struct.unpack_from('<H', data, offset)[0]
+                offset += 2 + 2 * num_triangles
+                num_local_connections, offset = self._read_u4(offset)
+                offset += 2 * num_local_connections
+        num_nodal_connections, offset = self._read_u4(offset)
+        for _ in range(num_nodal_connections):
+            nodal_leaf_connection_count = struct.unpack_from('<I', data, offset + 1)[0]  # after far_id
+            offset += 5 + 4 * nodal_leaf_connection_count
+        triangle_section_count, offset = self._read_u4(offset)
+        triangle_section = np.frombuffer(data, TRIANGLE_SECTION_DTYPE, triangle_section_count, offset)
+        offset += triangle_section.nbytes
+        self.logical_mesh.append(LogicalMesh(record, triangle_section, offset))
+        return self._skip_bsp_section(offset)
+
+    def _skip_bsp_section(self, offset: int) -> int:
+        pending = 1
+        while pending > 0:
+            pending -= 1
+            triangle_count = struct.unpack_from('<H', self.data, offset + BSP_SECTION_DTYPE.itemsize - 2)[0]
+            offset += BSP_SECTION_DTYPE.itemsize + 2 * triangle_count
+            pending += self.data[offset]  # children
+            offset += 1
+        return offset
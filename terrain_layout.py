@@ -87,7 +87,7 @@ class NodeMetaData:
         return self.parent.num_doors_to_target + 1
 
     def get_door(self, door_id) -> Sno.Door:
-        for door in self.sno.sno.door_array:
+        for door in self.sno.view.door_array:
             if door.id == door_id:
                 return door
 
@@ -195,7 +195,7 @@ class NodeMetaData:
         elif what == 'num_doors_to_target':
             return self.num_doors_to_target
         elif what == 'sno':
-            return ', '.join([door_str(d) for d in self.sno.sno.door_array])
+            return ', '.join([door_str(d) for d in self.sno.view.door_array])
         elif what == 'relative_orientation':
             return self.orientation_rel2parent
         elif what == 'absolute_orientation':
@@ -227,6 +227,8 @@ class TerrainMetaData:
         self.snos = snos
 
         # nodes by guid
+        if snos.sno_paths_by_name is None:
+            snos.precompute_names()
         terrain_nodes = sorted(terrain.nodes, key=lambda x: x.guid)
         self.nodes: dict[Hex, NodeMetaData] = {node.guid: NodeMetaData(node, snos.get_sno_by_name(node.mesh_name)) for node in terrain_nodes}
 
@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+
+from benchmark.corpus import generate, MAP_NAME, REGION_NAME
+from bits.bits import Bits
+from gas.gas_dir import GasDir
+from gas.gas_parser import GasParser
+
+
+class TestBenchmarkCorpus(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        generate(self.tmp_dir.name, num_templates=50, depth=8, templates_per_file=10, num_objects=100, num_nodes=10)
+        self.parser = GasParser.get_instance()
+        self.parser.clear_warnings()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_corpus(self):
+        GasDir(self.tmp_dir.name).load_all()
+        self.assertEqual([], self.parser.clear_warnings())
+        bits = Bits(self.tmp_dir.name)
+        templates = bits.templates.get_templates()
+        self.assertEqual(50, len(templates))
+        self.assertTrue(templates['bench_00007'].is_descendant_of('bench_00000'))
+        region = bits.maps[MAP_NAME].get_region(REGION_NAME)
+        region.load_terrain()
+        self.assertEqual(10, len(region.terrain.nodes))
+        objects_path = os.path.join(region.gas_dir.path, 'objects', 'regular', 'actor.gas')
+        self.assertEqual(100, len(self.parser.parse_file(objects_path).get_sections()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from benchmark.corpus import generate, MAP_NAME, REGION_NAME
+from bits.bits import Bits
+
+
+class TestBits(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        generate(self.tmp_dir.name, num_templates=10, depth=2, templates_per_file=10, num_objects=10, num_nodes=2)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_lazy_subsystems(self):
+        bits = Bits(self.tmp_dir.name, profile_startup=True)
+        self.assertEqual({}, bits.startup_profile)
+        self.assertEqual([MAP_NAME], list(bits.maps))
+        self.assertEqual(['maps'], list(bits.startup_profile))
+        self.assertEqual(1, bits.startup_profile['maps'][1])
+        self.assertIsNone(bits.snos)  # no art/terrain dir
+        self.assertEqual(['maps', 'snos'], list(bits.startup_profile))
+        self.assertIs(bits.maps, bits.maps)
+
+    def test_startup_profile_loads(self):
+        bits = Bits(self.tmp_dir.name, profile_startup=True)
+        bits.templates
+        self.assertEqual(0, bits.startup_profile['templates'][1])  # nothing read yet
+        self.assertEqual(10, len(bits.templates.get_templates()))
+        duration, num_files = bits.startup_profile['templates']
+        self.assertGreater(duration, 0)
+        self.assertEqual(1, num_files)
+        bits.templates.get_templates()
+        self.assertEqual(1, bits.startup_profile['templates'][1])  # loaded once
+
+    def test_node_ids(self):
+        region = Bits(self.tmp_dir.name).maps[MAP_NAME].get_region(REGION_NAME)
+        index_file = region.gas_dir.get_subdir('index').get_gas_file('streamer_node_index')
+        node_ids = region.get_node_ids()
+        self.assertEqual(2, len(node_ids))
+        self.assertIsNone(index_file.gas)  # streamed
+        self.assertEqual(node_ids, region.get_node_ids())
+        with open(index_file.path, 'w') as gas_file:
+            gas_file.write('[streamer_node_index]\n{\n  x * = 0x00000001;\n}\n')
+        os.utime(index_file.path, ns=(0, 0))  # changed, even within the mtime resolution
+        self.assertEqual([1], region.get_node_ids())
+        index_file.get_gas().get_section('streamer_node_index').set_attr_value('x', 2)
+        self.assertEqual([1, 2], region.get_node_ids())  # loaded gas is used as it is
+
+
+if __name__ == '__main__':
+    unittest.main()
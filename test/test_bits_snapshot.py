@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+from benchmark.corpus import generate, MAP_NAME, REGION_NAME
+from bits.bits import Bits
+from bits.bits_snapshot import BitsSnapshot
+from gas.gas_parser import GasParser
+
+
+class TestBitsSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        generate(self.tmp_dir.name, num_templates=50, depth=8, templates_per_file=10, num_objects=100, num_nodes=10)
+        GasParser.get_instance().clear_warnings()
+        self.snapshot_dir = tempfile.TemporaryDirectory()  # outside the bits, where it would change the dir mtime
+        self.snapshot_path = os.path.join(self.snapshot_dir.name, 'snapshot')
+        self.main_path = os.path.join(self.tmp_dir.name, 'world', 'maps', MAP_NAME, 'regions', REGION_NAME, 'main.gas')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        self.snapshot_dir.cleanup()
+
+    def write_main(self, attrs: str):
+        with open(self.main_path, 'w') as main_file:
+            main_file.write('[t:region,n:region]\n{\n' + attrs + '}\n')
+
+    def load_bits(self) -> (Bits, BitsSnapshot):
+        bits = Bits(self.tmp_dir.name)
+        snapshot = BitsSnapshot(bits, self.snapshot_path)
+        self.assertTrue(snapshot.load())
+        return bits, snapshot
+
+    def test_snapshot(self):
+        self.write_main('  x guid = 0x00000123;\n  x mesh_range = 0x00000123;\n  x scid_range = 0x00000123;\n')
+        BitsSnapshot(Bits(self.tmp_dir.name), self.snapshot_path).save()
+
+        bits, snapshot = self.load_bits()
+        self.assertEqual([], snapshot.refreshed)
+        self.assertTrue(bits.gas_dir.get_subdir(['world', 'maps']).loaded)
+        region = bits.maps[MAP_NAME].get_region(REGION_NAME)
+        self.assertIsNone(region.gas_dir.get_gas_file('main').gas)
+        self.assertEqual(0x123, region.get_data().id)  # from the snapshot, main.gas not parsed
+        self.assertIsNone(region.gas_dir.get_gas_file('main').gas)
+        self.assertEqual(50, len(bits.templates.get_index().templates))
+
+        os.makedirs(os.path.join(self.tmp_dir.name, 'world', 'maps', 'new_map', 'regions'))
+        bits, snapshot = self.load_bits()
+        maps_path = os.path.join(self.tmp_dir.name, 'world', 'maps')
+        self.assertEqual([maps_path, os.path.join(maps_path, 'new_map'), os.path.join(maps_path, 'new_map', 'regions')], snapshot.refreshed)  # new dirs are listed, the rest is not
+        self.assertEqual({MAP_NAME, 'new_map'}, set(bits.maps))
+
+    def test_region_summary(self):
+        self.write_main('  x guid = 0x00000123;\n  x scid_range = 0x00000123;\n')  # no mesh_range
+        BitsSnapshot(Bits(self.tmp_dir.name), self.snapshot_path).save()
+        with open(self.main_path) as main_file:
+            main_text = main_file.read()
+
+        bits, _ = self.load_bits()
+        region = bits.maps[MAP_NAME].get_region(REGION_NAME)
+        self.assertIsNone(region.data)  # not loaded, so not stored on save
+        region.save()
+        with open(self.main_path) as main_file:
+            self.assertEqual(main_text, main_file.read())
+
+        data = region.get_data()
+        self.assertEqual((0x123, None), (data.id, data.mesh_range))
+        data.mesh_range = 0x456  # edits a copy, not the shared summary
+        other_region = bits.maps[MAP_NAME].get_region(REGION_NAME)
+        self.assertIsNone(other_region.get_data().mesh_range)
+
+
+if __name__ == '__main__':
+    unittest.main()
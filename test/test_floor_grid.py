@@ -0,0 +1,97 @@
+import random
+import unittest
+
+import numpy as np
+
+from sno.floor_grid import FloorGrid
+from sno.geometry import is_point_inside_triangle_2d
+from sno.sno_view import TRIANGLE_DTYPE, V3_DTYPE
+
+
+def make_triangles(corners: list[tuple]) -> (np.ndarray, np.ndarray):
+    # corners: (x, y, z) of a, b, c per triangle; normals point up
+    triangles = np.array([tuple(corner) for corner in corners], TRIANGLE_DTYPE)
+    normals = np.zeros(len(corners), V3_DTYPE)
+    for i, (a, b, c) in enumerate(corners):
+        u, v = np.subtract(b, a), np.subtract(c, a)
+        normal = np.cross(u, v)
+        normals[i] = tuple(normal if normal[1] >= 0 else -normal)
+    return triangles, normals
+
+
+def make_terrain(size: int, seed=0) -> list[tuple]:
+    # size x size quads split into two triangles each, with jittered inner corners and random heights
+    rng = random.Random(seed)
+    points = dict()
+    for i in range(size + 1):
+        for j in range(size + 1):
+            jitter = (0 < i < size and 0 < j < size)
+            points[i, j] = (i + (rng.uniform(-0.3, 0.3) if jitter else 0), rng.uniform(0, 2), j + (rng.uniform(-0.3, 0.3) if jitter else 0))
+    corners = list()
+    for i in range(size):
+        for j in range(size):
+            corners.append((points[i, j], points[i, j+1], points[i+1, j]))
+            corners.append((points[i+1, j], points[i, j+1], points[i+1, j+1]))
+    return corners
+
+
+class TestFloorGrid(unittest.TestCase):
+    def test_inside_triangle(self):
+        self.assertTrue(is_point_inside_triangle_2d(0, 0, 0, 4, 4, 0, 1, 1))
+        self.assertTrue(is_point_inside_triangle_2d(0, 0, 4, 0, 0, 4, 1, 1))  # other winding
+        self.assertTrue(is_point_inside_triangle_2d(0, 0, 0, 4, 4, 0, 2, 2))  # on the edge
+        self.assertTrue(is_point_inside_triangle_2d(0, 0, 0, 4, 4, 0, 0, 0))  # corner
+        self.assertFalse(is_point_inside_triangle_2d(0, 0, 0, 4, 4, 0, 2.001, 2))
+        self.assertFalse(is_point_inside_triangle_2d(0, 0, 1, 1, 2, 2, 1, 1))  # degenerate
+        self.assertFalse(is_point_inside_triangle_2d(0, 0, 0, 4, 4, 0, -1, 5))  # on the edge line, outside the triangle
+        # points on an edge shared by two triangles are in one of them despite rounding
+        ax, az, bx, bz = 0.1, 0.7, 3.3, 2.9
+        for t in np.linspace(0, 1, 101).tolist():
+            x, z = ax + t * (bx - ax), az + t * (bz - az)
+            self.assertTrue(is_point_inside_triangle_2d(ax, az, bx, bz, 0, 5, x, z) or is_point_inside_triangle_2d(bx, bz, ax, az, 4, 0, x, z))
+
+    def test_same_as_loop(self):
+        corners = make_terrain(12)
+        triangles, normals = make_triangles(corners)
+        grid = FloorGrid(triangles, normals)
+        self.assertGreater(grid.cells_x * grid.cells_z, 1)
+        corners_2d = [tuple(float(np.float32(v)) for v in (a[0], a[2], b[0], b[2], c[0], c[2])) for a, b, c in corners]
+        rng = random.Random(1)
+        for _ in range(2000):
+            x, z = rng.uniform(-1, 13), rng.uniform(-1, 13)
+            expected = next((i for i, c in enumerate(corners_2d) if is_point_inside_triangle_2d(*c, x, z)), None)
+            self.assertEqual(expected, grid.find_triangle(x, z), (x, z))
+        for i in range(13):
+            self.assertIsNotNone(grid.find_triangle(i, 6))  # on cell & triangle borders
+
+    def test_batch(self):
+        triangles, normals = make_triangles(make_terrain(12, 2))
+        grid = FloorGrid(triangles, normals)
+        rng = np.random.default_rng(3)
+        x = np.concatenate([rng.uniform(-1, 13, 5000), np.arange(13.0)])
+        z = np.concatenate([rng.uniform(-1, 13, 5000), np.full(13, 6.0)])
+        indexes = grid.find_triangles(x, z)
+        self.assertEqual([grid.find_triangle(px, pz) for px, pz in zip(x.tolist(), z.tolist())], [None if i < 0 else i for i in indexes.tolist()])
+        heights = grid.snap_all(x, z, indexes)
+        self.assertTrue(np.isnan(heights[indexes < 0]).all())
+        for i in np.nonzero(indexes >= 0)[0][:200].tolist():
+            self.assertAlmostEqual(grid.snap(float(x[i]), float(z[i]), int(indexes[i])), heights[i])
+        self.assertEqual(0, len(grid.find_triangles([], [])))
+
+    def test_first_triangle_wins(self):
+        triangles, normals = make_triangles([((0, 0, 0), (0, 0, 4), (4, 0, 0)), ((0, 1, 0), (0, 1, 4), (4, 1, 0))])
+        grid = FloorGrid(triangles, normals)
+        self.assertEqual(0, grid.find_triangle(1, 1))
+        self.assertEqual(0.0, grid.snap(1, 1, 0))
+        self.assertEqual(1.0, grid.snap(1, 1, 1))
+        self.assertIsNone(grid.find_triangle(3, 3))
+        self.assertEqual([0, -1], grid.find_triangles([1, 3], [1, 3]).tolist())
+
+    def test_empty(self):
+        triangles, normals = make_triangles([])
+        self.assertIsNone(FloorGrid(triangles, normals).find_triangle(0, 0))
+        self.assertEqual([-1], FloorGrid(triangles, normals).find_triangles([0], [0]).tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
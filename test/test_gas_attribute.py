@@ -1,6 +1,6 @@
 import unittest
 
-from gas.gas import Attribute, Hex
+from gas.gas import Attribute, Hex, Position, Section
 
 
 class TestGasAttribute(unittest.TestCase):
@@ -33,3 +33,25 @@ class TestGasAttribute(unittest.TestCase):
         x = Attribute('x', '0x00001267', 'x')
         self.assertEqual(4711, x.value)
         self.assertEqual('x (x) = 0x00001267', str(x))
+
+    def test_compact(self):
+        a = Attribute(''.join(['na', 'me']), Position(1, 2, 3, Hex(4)))
+        self.assertFalse(hasattr(a, '__dict__'))
+        self.assertFalse(hasattr(a.value, '__dict__'))
+        self.assertFalse(hasattr(a.value.node_guid, '__dict__'))
+        self.assertIs(Attribute('name', 1).name, a.name)  # interned
+
+    def test_copy_deferred(self):
+        f = Attribute.deferred('f', '1.5', 'f')
+        f_copy = f.copy()
+        self.assertEqual(str(f), str(f_copy))
+        self.assertEqual('f (f) = 1.5', str(f_copy))
+        self.assertEqual(1.5, f_copy.value)
+        x = Attribute.deferred('x', '0x1', 'x')
+        x.value  # decoded, still unmodified
+        x_copy = x.copy()
+        self.assertEqual('x (x) = 0x1', str(x_copy))
+        x_copy.value = Hex(2)
+        self.assertEqual(1, x.value)
+        section_copy = Section('s', [Attribute.deferred('f', '2', 'f')]).copy()
+        self.assertEqual('f (f) = 2', str(section_copy.items[0]))
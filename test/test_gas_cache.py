@@ -0,0 +1,111 @@
+import argparse
+import os
+import tempfile
+import unittest
+
+from gas.gas import Hex, Position
+from gas.gas_cache import GasCache
+from gas.gas_parser import GasParser
+from gas.gas_writer import GasWriter
+
+
+class TestGasCache(unittest.TestCase):
+    gas_text = '[t:template,n:foo]\n{\n\tdoc = "foo";\n\tb flag = true;\n\ti n = 3;\n\tf x = 1.5;\n\tx id = 0x0000002A;\n\t' \
+               'p pos = 1,2,3,0x00000001;\n\tmulti = "first\nsecond";\n\t[aspect]\n\t{\n\t\tmodel = m_c_na_foo;\n\t}\n}\n'
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.gas_path = os.path.join(self.tmp_dir.name, 'foo.gas')
+        with open(self.gas_path, 'w') as gas_file:
+            gas_file.write(self.gas_text)
+        self.cache = GasCache(os.path.join(self.tmp_dir.name, 'cache'))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def store(self):
+        stat = os.stat(self.gas_path)
+        gas = GasParser().parse_text(self.gas_text)
+        self.cache.store(self.gas_path, stat, gas, ['some warning'])
+        return gas
+
+    def test_pack_unpack(self):
+        gas = GasParser().parse_text(self.gas_text)
+        unpacked = gas.unpack(gas.pack())
+        self.assertEqual(GasWriter().format_gas(gas), GasWriter().format_gas(unpacked))
+        section = unpacked.get_section('t:template,n:foo')
+        self.assertIsInstance(section.get_attr_value('id'), Hex)
+        self.assertIsInstance(section.get_attr_value('pos'), Position)
+        self.assertIs(True, section.get_attr_value('flag'))
+
+    def test_pack_unpack_deferred(self):
+        parser = GasParser()
+        parser.deferred_values = True
+        gas = parser.parse_text(self.gas_text)
+        unpacked = gas.unpack(gas.pack())
+        self.assertEqual(GasWriter().format_gas(gas), GasWriter().format_gas(unpacked))
+        section = unpacked.get_section('t:template,n:foo')
+        self.assertEqual('1.5', section.get_attr('x').value_str)  # still the raw string
+        self.assertEqual(1.5, section.get_attr_value('x'))
+
+    def test_hit(self):
+        gas = self.store()
+        cached = self.cache.load(self.gas_path)
+        self.assertIsNotNone(cached)
+        cached_gas, warnings = cached
+        self.assertEqual(['some warning'], warnings)
+        self.assertEqual(GasWriter().format_gas(gas), GasWriter().format_gas(cached_gas))
+        self.assertEqual(1, self.cache.hits)
+
+    def test_miss_on_change(self):
+        self.store()
+        with open(self.gas_path, 'a') as gas_file:
+            gas_file.write('[bar]\n{\n}\n')
+        self.assertIsNone(self.cache.load(self.gas_path))
+        self.assertIsNone(self.cache.load(os.path.join(self.tmp_dir.name, 'not_cached.gas')))
+        self.assertEqual(2, self.cache.misses)
+
+    def test_miss_on_version(self):
+        self.store()
+        self.cache.version += '-other'
+        self.assertIsNone(self.cache.load(self.gas_path))
+
+    def test_content_hash(self):
+        self.cache.check_hash = True
+        self.store()
+        self.assertIsNotNone(self.cache.load(self.gas_path))
+        stat = os.stat(self.gas_path)
+        with open(self.gas_path, 'w') as gas_file:
+            gas_file.write(self.gas_text.replace('foo', 'bar'))  # same size
+        os.utime(self.gas_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))  # same mtime
+        self.assertIsNone(self.cache.load(self.gas_path))
+
+    def test_eviction(self):
+        self.store()
+        entry_size = self.cache.size
+        self.cache.max_size = entry_size * 2
+        for i in range(5):
+            gas_path = os.path.join(self.tmp_dir.name, f'foo{i}.gas')
+            with open(gas_path, 'w') as gas_file:
+                gas_file.write(self.gas_text)
+            self.cache.store(gas_path, os.stat(gas_path), GasParser().parse_text(self.gas_text), [])
+        self.assertLessEqual(self.cache.size, self.cache.max_size)
+        self.assertLessEqual(len(self.cache.list_entries()), 2)
+        self.assertIsNotNone(self.cache.load(os.path.join(self.tmp_dir.name, 'foo4.gas')))  # most recent survives
+
+    def test_arguments(self):
+        parser = argparse.ArgumentParser()
+        GasCache.add_arguments(parser)
+        instance, disabled = GasCache._instance, GasCache._disabled
+        try:
+            GasCache._instance = self.cache
+            GasCache.apply_arguments(parser.parse_args([]))
+            self.assertIs(self.cache, GasCache.get_instance())
+            GasCache.apply_arguments(parser.parse_args(['--no-gas-cache']))
+            self.assertIsNone(GasCache.get_instance())
+        finally:
+            GasCache._instance, GasCache._disabled = instance, disabled
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+from gas.gas_dir import GasDir
+from gas.gas_parser import GasParser
+from gas.gas_writer import GasWriter
+
+
+class TestGasDir(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        for d, name in [('', 'a'), ('', 'b'), ('sub', 'c'), ('sub', 'd'), (os.path.join('sub', 'subsub'), 'e'), ('zub', 'f')]:
+            os.makedirs(os.path.join(self.tmp_dir.name, d), exist_ok=True)
+            with open(os.path.join(self.tmp_dir.name, d, name + '.gas'), 'w') as gas_file:
+                gas_file.write(f'[{name}]\n{{\n\ti value = {len(name + d)};\n\tgarbage in {name}\n\t[sub]\n\t{{\n\t\tdoc = "{d}";\n\t}}\n}}\n')
+        self.parser = GasParser.get_instance()
+        self.parser.clear_warnings()
+
+    def tearDown(self):
+        self.parser.clear_warnings()
+        self.tmp_dir.cleanup()
+
+    def load_all(self, parallel):
+        gas_dir = GasDir(self.tmp_dir.name)
+        gas_dir.load_all(parallel)
+        formatted = [(gas_file.path, GasWriter().format_gas(gas_file.gas)) for gas_file in gas_dir.iter_gas_files()]
+        return formatted, self.parser.clear_warnings()
+
+    def test_load_all_parallel(self):
+        print_warnings = self.parser.print_warnings
+        self.parser.print_warnings = False
+        sequential = self.load_all(None)
+        parallel = self.load_all(3)
+        self.parser.print_warnings = print_warnings
+        self.assertEqual(6, len(sequential[0]))
+        self.assertEqual(6, len(sequential[1]))
+        self.assertEqual(sequential, parallel)  # same gas, same warnings in the same order
+
+    def test_iter_rewrite_parallel(self):
+        print_warnings = self.parser.print_warnings
+        self.parser.print_warnings = False
+        gas_dir = GasDir(self.tmp_dir.name)
+        gas_dir.get_gas_file('a').get_gas().get_section('a').set_attr_value('n', 2)
+        gas_dir.iter_rewrite(print_files=False, print_dirs=False, parallel=3)
+        self.parser.print_warnings = print_warnings
+        self.assertEqual(2, gas_dir.get_gas_file('a').get_gas().get_section('a').get_attr_value('n'))  # not re-read
+        self.assertEqual(6, len([gas_file for gas_file in gas_dir.iter_gas_files() if gas_file.gas is not None]))
+        with open(os.path.join(self.tmp_dir.name, 'a.gas')) as a_file:
+            self.assertIn('n = 2;', a_file.read())
+
+    def test_save_unchanged(self):
+        print_warnings = self.parser.print_warnings
+        self.parser.print_warnings = False
+        gas_dir = GasDir(self.tmp_dir.name)
+        gas_dir.load_all()
+        self.parser.print_warnings = print_warnings
+        summary = gas_dir.save()
+        self.assertEqual((0, 6), (len(summary.written), len(summary.skipped)))  # not edited, though formatted differently on disk
+        summary = gas_dir.save()
+        self.assertEqual((0, 6), (len(summary.written), len(summary.skipped)))
+        gas_dir.get_gas_file('a').get_gas().get_section('a').set_attr_value('n', 2)
+        summary = GasDir(self.tmp_dir.name).save()
+        self.assertEqual(0, len(summary.written))  # nothing loaded, nothing to write
+        summary = gas_dir.save()
+        self.assertEqual([os.path.join(self.tmp_dir.name, 'a.gas')], summary.written)
+        self.assertEqual(5, len(summary.skipped))
+        fresh_dir = GasDir(self.tmp_dir.name)
+        fresh_dir.load_all()
+        self.assertEqual(0, len(fresh_dir.save().written))  # same content as on disk
+        self.assertEqual([], [f for f in os.listdir(self.tmp_dir.name) if f.endswith('.tmp')])
+        with open(os.path.join(self.tmp_dir.name, 'b.gas')) as b_file:
+            self.assertIn('garbage in b', b_file.read())  # never rewritten
+
+    def test_save_failed(self):
+        print_warnings = self.parser.print_warnings
+        self.parser.print_warnings = False
+        gas_file = GasDir(self.tmp_dir.name).get_gas_file('a')
+        gas_file.get_gas().get_section('a').get_attr('value').value = None  # can't be written
+        self.parser.print_warnings = print_warnings
+        with self.assertRaises(AssertionError):
+            gas_file.save()
+        self.assertEqual([], [f for f in os.listdir(self.tmp_dir.name) if f.endswith('.tmp')])
+        with open(gas_file.path) as a_file:
+            self.assertIn('i value = 1;', a_file.read())
+
+    def test_load_recursive(self):
+        gas_dir = GasDir(self.tmp_dir.name)
+        gas_dir.load(recursive=True, record_mtimes=True)
+        subsub = gas_dir.subdirs['sub'].subdirs['subsub']
+        self.assertTrue(subsub.loaded)
+        self.assertEqual(['e'], list(subsub.gas_files))
+        self.assertEqual(os.stat(subsub.path).st_mtime_ns, subsub.mtime_ns)
+        self.assertEqual(os.stat(subsub.gas_files['e'].path).st_mtime_ns, subsub.gas_files['e'].mtime_ns)
+        self.assertEqual(['a', 'b'], sorted(gas_dir.gas_files))
+        self.assertEqual(['sub', 'zub'], sorted(gas_dir.subdirs))
+        lazy_dir = GasDir(self.tmp_dir.name)
+        lazy_dir.load()
+        self.assertFalse(lazy_dir.subdirs['sub'].loaded)
+        self.assertIsNone(lazy_dir.gas_files['a'].mtime_ns)
+
+
+if __name__ == '__main__':
+    unittest.main()
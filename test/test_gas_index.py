@@ -0,0 +1,100 @@
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from gas.gas import Attribute, Gas, RenameLog, Section
+
+
+class TestGasIndex(unittest.TestCase):
+    def setUp(self):
+        self.section = Section('t:template,n:foo', [
+            Attribute('doc', 'foo'),
+            Attribute('Specializes', 'base'),
+            Section('aspect', [Attribute('model', 'm_c_na_foo')]),
+            Section('common'),
+        ])
+
+    def test_lookup(self):
+        self.assertEqual('base', self.section.get_attr_value('specializes'))
+        self.assertEqual(['doc', 'Specializes'], [a.name for a in self.section.get_attrs()])
+        self.assertIsNone(self.section.get_attr('model'))
+        self.assertEqual('aspect', self.section.get_section('aspect').header)
+        self.assertEqual(2, len(self.section.get_sections()))
+        self.assertIsNone(self.section.get_section('ASPECT'))  # section headers are case-sensitive
+
+    def test_insert_and_set(self):
+        self.assertIsNone(self.section.get_attr('screen_name'))
+        self.section.set_attr_value('screen_name', 'Foo')
+        self.assertEqual('Foo', self.section.get_attr_value('screen_name'))
+        self.section.set_attr_value('screen_name', None)
+        self.assertIsNone(self.section.get_attr('screen_name'))
+        self.section.insert_item(Section('physics'))
+        self.assertIsNotNone(self.section.get_section('physics'))
+
+    def test_direct_mutation(self):
+        self.section.get_attrs()
+        self.section.items.append(Attribute('doc', 'another'))
+        self.assertEqual(2, len(self.section.get_attrs('doc')))
+        with self.assertRaises(AssertionError):
+            self.section.get_attr('doc')
+        self.section.items[0] = Attribute('category_name', 'foo')
+        self.section.invalidate_index()  # in-place replacements are not noticed by themselves
+        self.assertEqual('foo', self.section.get_attr_value('category_name'))
+        self.section.items.remove(self.section.get_section('aspect'))
+        self.section.items.append(Section('body'))  # same length
+        self.assertIsNone(self.section.get_section('aspect'))
+        self.assertIsNotNone(self.section.get_section('body'))
+        self.section.items.remove(self.section.get_section('common'))
+        self.assertIsNone(self.section.get_section('common'))
+        self.section.items = [Attribute('x', 1)]
+        self.assertEqual([], self.section.get_sections())
+        self.assertEqual(1, self.section.get_attr_value('x'))
+
+    def test_passed_list(self):
+        items = []
+        gas = Gas(items)
+        self.assertIsNone(gas.get_section('foo'))
+        items.append(Section('foo'))  # list was passed to the constructor and is still being filled
+        self.assertIsNotNone(gas.get_section('foo'))
+
+    def test_rename(self):
+        aspect = self.section.get_section('aspect')
+        self.section.get_attr('doc').name = 'category_name'
+        aspect.header = 'body'
+        self.assertIsNone(self.section.get_attr('doc'))
+        self.assertIsNotNone(self.section.get_attr('category_name'))
+        self.assertIsNone(self.section.get_section('aspect'))
+        self.assertIs(aspect, self.section.get_section('body'))
+        self.section.set_t_n_header('template', 'bar')
+        gas = Gas([self.section])
+        self.assertIsNotNone(gas.get_section('t:template,n:bar'))
+        self.section.set_t_n_header('template', 'baz')
+        self.assertIsNone(gas.get_section('t:template,n:bar'))
+
+    def test_rename_elsewhere(self):
+        index = self.section.get_index()
+        other = Section('other', [Attribute('doc', 'other')])
+        other.get_attr('doc').name = 'specializes'
+        other.header = 'renamed'
+        self.assertIs(index, self.section.get_index())  # renames of items of other sections keep the index
+        self.assertEqual('base', self.section.get_attr_value('specializes'))
+        for i in range(RenameLog.MAX_ENTRIES + 1):
+            other.header = f'renamed_{i}'
+        self.assertIsNot(index, self.section.get_index())  # too old to check, rebuilt
+
+    def test_rename_log(self):
+        attr = self.section.get_attr('doc')
+        num_refs = sys.getrefcount(attr)
+        attr.name = 'info'
+        self.assertEqual(num_refs, sys.getrefcount(attr))  # not kept alive by the log
+        log = RenameLog()
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(lambda i: [log.log(Attribute(f'a{i}', j), 'a') for j in range(1000)], range(4)))
+        self.assertEqual(4000, log.version)
+        self.assertEqual((4000, []), log.get_since(4000))
+        self.assertEqual(2, len(log.get_since(3998)[1]))
+        self.assertIsNone(log.get_since(0)[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
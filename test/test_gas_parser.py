@@ -0,0 +1,205 @@
+import glob
+import io
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmark.corpus import generate
+from gas.gas import Section
+from gas.gas_parser import GasParser, SECTION_OPEN, SECTION_CLOSE
+
+
+def dump_items(items) -> list:
+    # comparable form of parsed gas
+    dump = []
+    for item in items:
+        if isinstance(item, Section):
+            dump.append((item.header, dump_items(item.items)))
+        else:
+            dump.append((item.name, item.datatype, type(item.value), str(item.value)))
+    return dump
+
+
+class TestGasParser(unittest.TestCase):
+    # The single-pass parser must behave exactly like the line-based parser, quirks included
+    snippets = [
+        '[t:map,n:map]\n{\n\tname = map_world;\n\tb dev_only = false;\n\tf x = 1.5;\n\tp pos = 1,2,3,0x00000001;\n}\n',
+        '[a]\n{\n\t[b] { x = 1; y = "two; three"; }\n\t[c]\n\t{\n\t}\n}\n',  # 1-line sections, semicolon in quotes
+        '[a]\n{\n\ti order = 2; sample = "hello";\n\tz = 1 ;   \n}',  # multiple attrs per line, no newline at the end
+        '[a]\n{\n\ttext = "first line\nsecond line\n\tthird line";\n\tx = 1;\n}\n',  # multiline string
+        '[a]\n{\n\ttext =\n\t\t"starts on the next line\n\tand ends here";\n}\n',  # multiline string on the next line
+        '[a]\n{\n\tscript = [[\n\t\tsome skrit;\n\t]];\n\tx = 1;\n\ty = [[ one line; ]];\n}\n',  # square brace delimited text
+        '[a]\n{\n\tcommand = some\n\t\t?continued=true\n\t\t&more=false;\n}\n',  # multiline unquoted value
+        '[a]\n{\n\tquest = "no end quote;\n\t  i order = 0;\n\t}\n\t[b]\n\t{\n\t\tdesc = "end" ; x = 1;\n}\n',  # missing end quote
+        '[a]\n{\n\ttitle = "missing semicolon"\n\tx = y;\n}\n',
+        '/* comment\n[a]\n*/ ; [b]\n{\n\t// x = 1;\n\ty = 2; // comment\n\t/* inline */ z = 3;\n}\n',  # comments
+        '[a]\n\trogue = 1;\n{\n\tx = 1;\n}\n',  # rogue attribute before opening brace
+        '[a]\n{\n\tx = 1;\n}\n}\n[b]\n{\n',  # additional closing brace, missing closing brace
+        '[a]\n{\n\tgarbage\n\tmore garbage { x = 1;\n\t}\n}\n',  # unparsable lines
+        '[a]\n{\n\tsub:section:name = value;\n\ti x = \t5  ;\t\n\tempty = ;\n\tsingle=;\n}\n',  # colon-paths & odd spacing
+        '[a]\n{\n\tx = "quoted" ;;\n\ty = "a" "b";\n\tz = [weird];\n}\n',
+        '[a]\r\n{\r\n\tx = 1;\r\n\ty = "multi\r\nline";\r\n}\r\n',  # windows line endings
+        '[a] {\n\tx * = 0x20000000;\n\t* = 1;\n\ta*b = 2;\n\t[b]\n\n\t{ }\n}\n',  # * names, header & brace as one token
+    ]
+    broken_snippets = [
+        '[a\n{\n}\n',  # header without closing bracket
+        '{\n}\n',  # opening brace without section
+        '[a]\n{\n\tx = "never ends\n}\n',  # unexpected end of gas
+        '[a]\n{\n\tx =\n\n\ty = 1;\n}\n',  # unclear multiline value delimiter
+        '[a]\n{\n\tz x = 1;\n}\n',  # unknown datatype
+    ]
+
+    def parse_both(self, text):
+        parser = GasParser()
+        parser.print_warnings = False
+        results = []
+        for parse in [lambda: parser.parse_file_content(io.StringIO(text.replace('\r\n', '\n'))), lambda: parser.parse_text(text)]:
+            try:
+                results.append((dump_items(parse().items), parser.clear_warnings()))
+            except Exception as e:
+                results.append((type(e), parser.clear_warnings()))
+        return results
+
+    def test_parity(self):
+        for snippet in self.snippets:
+            line_based, single_pass = self.parse_both(snippet)
+            self.assertEqual(line_based, single_pass, snippet)
+            self.assertIsInstance(single_pass[0], list, snippet)
+
+    def test_parity_files(self):
+        # committed fixtures and a generated corpus, no game files needed
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            generate(tmp_dir, num_templates=50, depth=8, templates_per_file=10, num_objects=100, num_nodes=10)
+            input_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input', 'parity')
+            self.assertEqual(3, len(glob.glob(os.path.join(input_dir, '*.gas'))))
+            paths = glob.glob(os.path.join(input_dir, '**', '*.gas'), recursive=True) + glob.glob(os.path.join(tmp_dir, '**', '*.gas'), recursive=True)
+            self.assertGreater(len(paths), 10)
+            for path in paths:
+                with open(path, encoding='ANSI') as gas_file:
+                    text = gas_file.read()
+                line_based, single_pass = self.parse_both(text)
+                self.assertEqual(line_based, single_pass, path)
+                self.assertIsInstance(single_pass[0], list, path)
+
+    def test_parity_broken(self):
+        for snippet in self.broken_snippets:
+            line_based, single_pass = self.parse_both(snippet)
+            self.assertEqual(line_based, single_pass, snippet)
+            self.assertNotIsInstance(single_pass[0], list, snippet)
+
+    def test_single_pass(self):
+        gas = GasParser().parse_text(self.snippets[0])
+        section = gas.get_section('t:map,n:map')
+        self.assertEqual(4, len(section.items))
+        self.assertEqual('map_world', section.get_attr_value('name'))
+        self.assertEqual(False, section.get_attr_value('dev_only'))
+        self.assertEqual(1.5, section.get_attr_value('x'))
+        self.assertEqual(3, section.get_attr_value('pos').z)
+
+    def test_deferred_values(self):
+        parser = GasParser()
+        parser.print_warnings = False
+        for parse in [lambda text: parser.parse_file_content(io.StringIO(text.replace('\r\n', '\n'))), parser.parse_text]:
+            for snippet in self.snippets:
+                eager = dump_items(parse(snippet).items)
+                parser.deferred_values = True
+                deferred = dump_items(parse(snippet).items)
+                parser.deferred_values = False
+                self.assertEqual(eager, deferred, snippet)
+
+    def test_deferred_round_trip(self):
+        text = '[a]\n{\n\tf x = 1.5;\n\ti n = 007;\n\tx id = 0xabc;\n\tp pos = 1,2,3,0x00000001;\n}\n'
+        parser = GasParser()
+        parser.deferred_values = True
+        section = parser.parse_text(text).get_section('a')
+        self.assertEqual(['1.5', '007', '0xabc', '1,2,3,0x00000001'], [attr.value_str for attr in section.get_attrs()])
+        self.assertEqual(7, section.get_attr_value('n'))
+        self.assertEqual('007', section.get_attr('n').value_str)  # decoding alone does not modify
+        section.set_attr_value('x', 2.5)
+        self.assertEqual('2.500000', section.get_attr('x').value_str)
+        section.get_attr_value('pos').x = 4
+        self.assertEqual('4,2.0,3.0,0x00000001', section.get_attr('pos').value_str)
+
+    def dump_events(self, parser, text, chunked=False) -> list:
+        stack = [(None, [])]
+        events = parser.iter_text_events(text) if not chunked else parser.iter_chunk_events(iter(text.splitlines(keepends=True)))
+        for event, path, item in events:
+            if event == SECTION_OPEN:
+                stack.append((item, []))
+            elif event == SECTION_CLOSE:
+                header, items = stack.pop()
+                self.assertEqual(header, path[-1])
+                stack[-1][1].append((header, items))
+            else:
+                self.assertEqual(tuple(header for header, _ in stack[1:]), path)
+                stack[-1][1].append(dump_items([item])[0])
+        self.assertEqual(1, len(stack))
+        return stack[0][1]
+
+    def test_events(self):
+        parser = GasParser()
+        parser.print_warnings = False
+        for snippet in self.snippets:
+            tree = (dump_items(parser.parse_text(snippet).items), parser.clear_warnings())
+            events = (self.dump_events(parser, snippet), parser.clear_warnings())
+            self.assertEqual(tree, events, snippet)
+            chunked_events = (self.dump_events(parser, snippet, True), parser.clear_warnings())  # line by line
+            self.assertEqual(tree, chunked_events, snippet)
+        for snippet in self.broken_snippets:
+            with self.assertRaises(Exception):
+                parser.parse_text(snippet)
+            tree = parser.clear_warnings()
+            with self.assertRaises(Exception):
+                self.dump_events(parser, snippet)
+            self.assertEqual(tree, parser.clear_warnings(), snippet)
+            with self.assertRaises(Exception):
+                self.dump_events(parser, snippet, True)
+            self.assertEqual(tree, parser.clear_warnings(), snippet)
+
+    def test_iter_attrs(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'streamer_node_index.gas')
+            with open(path, 'w') as gas_file:
+                gas_file.write('[streamer_node_index]\n{\n\tx a = 0x00000001;\n\tx b = 0x00000002;\n\t[sub] { x c = 0x3; }\n}\n[other] { a = 4; }\n')
+            parser = GasParser()
+            parser.EVENTS_CHUNK_SIZE = 16  # a few lines at a time
+            self.assertEqual([1, 2], [attr.value for attr in parser.iter_attrs(path, 'streamer_node_index', '*')])
+            self.assertEqual([1, '4'], [attr.value for attr in parser.collect_attrs(path, '*', 'A')])
+            self.assertEqual([3], [attr.value for attr in parser.collect_attrs(path, 'streamer_node_index', 'sub', 'c')])
+
+    def test_warnings_per_call(self):
+        parser = GasParser()
+        parser.print_warnings = False
+        parser.parse_text(self.snippets[12])
+        expected = parser.clear_warnings()
+        self.assertEqual(2, len(expected))
+        warnings = []
+        parser.parse_text(self.snippets[12], warnings)
+        self.assertEqual(expected, warnings)
+        self.assertEqual([], parser.warnings)  # not merged
+        parser.merge_warnings(warnings)
+        parser.parse_text(self.snippets[10])
+        self.assertEqual(expected + ['discarding rogue attribute rogue = 1'], parser.clear_warnings())
+
+    def test_reentrant(self):
+        parser = GasParser()
+        parser.print_warnings = False
+        for single_pass in [True, False]:
+            parser.single_pass = single_pass
+            expected = [(dump_items(parser.parse_text(snippet).items), parser.clear_warnings()) for snippet in self.snippets]
+            events = parser.iter_text_events(self.snippets[3])
+            next(events)  # suspended mid-parse
+            self.assertEqual(expected[4][0], dump_items(parser.parse_text(self.snippets[4]).items))
+            list(events)
+
+            def parse(snippet):
+                warnings = []
+                return dump_items(parser.parse_text(snippet, warnings).items), warnings
+            with ThreadPoolExecutor(4) as pool:
+                for _ in range(20):
+                    self.assertEqual(expected, list(pool.map(parse, self.snippets)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,12 @@
+import io
 import os
 import unittest
+from pathlib import Path
 
 from gas.gas_file import GasFile
 from gas.gas_parser import GasParser
 from test.files import Files
+from test.test_gas_parser import dump_items
 
 
 class TestGasParsing(unittest.TestCase):
@@ -381,5 +384,35 @@ class TestGasParsing(unittest.TestCase):
         self.assertEqual(1, len(GasParser.get_instance().clear_warnings()))
 
 
+class TestGasParsingLineBased(TestGasParsing):
+    # same tests against the line-based fallback parser
+
+    def setUp(self):
+        super().setUp()
+        GasParser.get_instance().single_pass = False
+
+    def tearDown(self):
+        GasParser.get_instance().single_pass = True
+        super().tearDown()
+
+
+class TestGasParserParity(unittest.TestCase):
+    files = Files()
+
+    def test_single_pass_line_based_parity(self):
+        # Both parser engines must produce the same gas & warnings for every file of the extracts
+        parser = GasParser()
+        parser.print_warnings = False
+        for path in Path(self.files.extracts_dir).rglob('*.gas'):
+            with open(path, encoding='ANSI') as f:
+                text = f.read()
+            line_based_gas = parser.parse_file_content(io.StringIO(text))
+            line_based_warnings = parser.clear_warnings()
+            single_pass_gas = parser.parse_text(text)
+            single_pass_warnings = parser.clear_warnings()
+            self.assertEqual(dump_items(line_based_gas.items), dump_items(single_pass_gas.items), str(path))
+            self.assertEqual(line_based_warnings, single_pass_warnings, str(path))
+
+
 if __name__ == '__main__':
     unittest.main()
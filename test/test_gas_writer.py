@@ -0,0 +1,69 @@
+import glob
+import io
+import os
+import tempfile
+import unittest
+
+from benchmark.corpus import generate
+from benchmark.writer import previous_format_gas
+from gas.gas import Attribute, Gas, Hex, Position, Section
+from gas.gas_parser import GasParser
+from gas.gas_writer import GasWriter
+
+
+class TestGasWriter(unittest.TestCase):
+    gas = Gas([Section('t:template,n:foo', [
+        Attribute('doc', 'foo'),
+        Attribute('b', True),
+        Attribute('i', 42),
+        Attribute('f', 1.5),
+        Attribute('x', Hex(42)),
+        Attribute('p', Position(1, 2, 3, Hex(1))),
+        Section('aspect', [Attribute('model', 'm_c_na_foo'), Section('textures', [Attribute('0', 'b_c_foo')])]),
+    ])])
+    text = '[t:template,n:foo]\n{\n\tdoc = foo;\n  b b = true;\n  i i = 42;\n  f f = 1.500000;\n  x x = 0x0000002A;\n  p p = 1,2,3,0x00000001;\n' \
+           '\t[aspect]\n\t{\n\t\tmodel = m_c_na_foo;\n\t\t[textures]\n\t\t{\n\t\t\t0 = b_c_foo;\n\t\t}\n\t}\n}\n'
+
+    def test_format_gas(self):
+        lines = GasWriter().format_gas(self.gas)
+        self.assertEqual(self.text, ''.join(lines))
+        self.assertEqual(len(self.text.splitlines()), len(lines))
+
+    def test_write_gas(self):
+        file = io.StringIO()
+        GasWriter().write_gas(file, self.gas)
+        self.assertEqual(self.text, file.getvalue())
+
+    def test_write_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'foo.gas')
+            GasWriter().write_file(path, self.gas)
+            with open(path) as file:
+                self.assertEqual(self.text, file.read())
+            self.assertEqual(['foo.gas'], os.listdir(tmp_dir))
+
+    def test_round_trip(self):
+        parser = GasParser()
+        eager_text = self.text.replace('1,2,3', '1.0,2.0,3.0')  # eagerly parsed floats
+        self.assertEqual(eager_text, ''.join(GasWriter().format_gas(parser.parse_text(eager_text))))
+        parser.deferred_values = True
+        text = self.text.replace('1.500000', '1.5').replace('0x0000002A', '0x2a')
+        self.assertEqual(text, ''.join(GasWriter().format_gas(parser.parse_text(text))))
+
+    def test_previous_writer_parity(self):
+        # same output as the list-building writer the streaming one replaced
+        self.assertEqual(previous_format_gas(self.gas), GasWriter().format_gas(self.gas))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            generate(tmp_dir, num_templates=50, depth=8, templates_per_file=10, num_objects=100, num_nodes=10)
+            paths = glob.glob(os.path.join(tmp_dir, '**', '*.gas'), recursive=True)
+            self.assertGreater(len(paths), 5)
+            for deferred_values in [False, True]:
+                parser = GasParser()
+                parser.deferred_values = deferred_values
+                for path in paths:
+                    gas = parser.parse_file(path)
+                    self.assertEqual(previous_format_gas(gas), GasWriter().format_gas(gas), path)
+
+
+if __name__ == '__main__':
+    unittest.main()
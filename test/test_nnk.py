@@ -0,0 +1,39 @@
+import os
+import unittest
+
+from bits.nnk import NNK
+
+
+class TestNNK(unittest.TestCase):
+    def make_nnk(self):
+        nnk = NNK(None)
+        nnk.nnk = {'t': 'terrain', 't_grs01': 'grass', 't_grs01_floor': 'floor', 't_xxx': 'generic', 'm': 'meshes', 'm_x_y': 'unreachable'}
+        return nnk
+
+    def test_lookup_prefix(self):
+        nnk = self.make_nnk()
+        self.assertEqual(os.path.join('terrain', 'grass', 'floor'), nnk.lookup_prefix('T_Grs01_Floor'))
+        self.assertEqual('meshes', nnk.lookup_prefix('m'))
+        with self.assertRaises(AssertionError):
+            nnk.lookup_prefix('m_x_y')  # m_x is missing
+
+    def test_lookup_file(self):
+        nnk = self.make_nnk()
+        self.assertEqual(os.path.join('terrain', 'grass', 'floor', 't_grs01_floor_01.sno'), nnk.lookup_file('t_grs01_floor_01.sno'))
+        self.assertEqual(os.path.join('terrain', 'grass', 'T_Grs01_wall.sno'), nnk.lookup_file('T_Grs01_wall.sno'))
+        self.assertEqual(os.path.join('meshes', 'm_x_y_z.sno'), nnk.lookup_file('m_x_y_z.sno'))
+        self.assertEqual([os.path.join('terrain', 'generic', 't_xxx_flr.sno'), os.path.join('terrain', 't_yyy.sno')], nnk.lookup_files(['t_xxx_flr.sno', 't_yyy.sno']))
+        with self.assertRaises(AssertionError):
+            nnk.lookup_file('b_unknown.sno')
+        nnk.nnk['b'] = 'bitmaps'  # trie is rebuilt
+        self.assertEqual(os.path.join('bitmaps', 'b_unknown.sno'), nnk.lookup_file('b_unknown.sno'))
+        nnk.nnk['b'] = 'bitmapz'  # same size & length
+        self.assertEqual(os.path.join('bitmapz', 'b_unknown.sno'), nnk.lookup_file('b_unknown.sno'))
+        nnk.nnk.update({'b': 'bitmaps'})
+        self.assertEqual(os.path.join('bitmaps', 'b_unknown.sno'), nnk.lookup_file('b_unknown.sno'))
+        nnk.nnk = {'b': 'bmp'}
+        self.assertEqual(os.path.join('bmp', 'b_unknown.sno'), nnk.lookup_file('b_unknown.sno'))
+
+
+if __name__ == '__main__':
+    unittest.main()
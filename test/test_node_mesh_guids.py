@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+from bits.node_mesh_guids import NodeMeshGuids
+from gas.gas_cache import GasCache
+from gas.gas_dir import GasDir
+from gas.molecules import Hex
+
+
+class TestNodeMeshGuids(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.siege_nodes_path = os.path.join(self.tmp_dir.name, 'world', 'global', 'siege_nodes', 'grs')
+        os.makedirs(self.siege_nodes_path)
+        self.write_nodes('a', [('0x00000101', 't_grs01_floor_01'), ('0xa801037g', 't_gi_flr_04x04-b')])
+        self.write_nodes('b', [('0x00000102', 'T_Grs01_Floor_02')])
+        self.cache_path = os.path.join(self.tmp_dir.name, 'cache', 'nmg.pickle')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_nodes(self, name, meshes):
+        with open(os.path.join(self.siege_nodes_path, name + '.gas'), 'w') as gas_file:
+            gas_file.write('[t:mesh_file_list,n:grs]\n{\n')
+            for guid, filename in meshes:
+                gas_file.write(f'\t[mesh_file*]\n\t{{\n\t\tfilename = {filename};\n\t\tguid = {guid};\n\t}}\n')
+            gas_file.write('}\n')
+
+    def make_nmg(self):
+        nmg = NodeMeshGuids(GasDir(self.tmp_dir.name))
+        nmg.cache_path = self.cache_path
+        return nmg
+
+    def test_cache(self):
+        expected = {'0x00000101': 't_grs01_floor_01', '0xa801037g': 't_gi_flr_04x04-b', '0x00000102': 'T_Grs01_Floor_02'}
+        self.assertEqual(expected, self.make_nmg().get_node_mesh_guids())
+        self.assertTrue(os.path.exists(self.cache_path))
+
+        nmg = self.make_nmg()
+        nmg.load_node_mesh_guids = None  # must not parse
+        self.assertEqual(expected, nmg.get_node_mesh_guids())
+        self.assertEqual('t_gi_flr_04x04-b', nmg.get_node_mesh_guids_by_hex()[Hex(0x0a801037)])
+        self.assertEqual(Hex(0x102), nmg.get_node_mesh_guids_by_filename()['t_grs01_floor_02'])
+        self.assertEqual(Hex(0x0a801037), nmg.get_node_mesh_guids_by_filename()['t_gi_flr_04x04-b'])
+
+        self.write_nodes('b', [('0x00000103', 't_grs01_floor_03')])
+        os.utime(os.path.join(self.siege_nodes_path, 'b.gas'), ns=(0, 0))
+        self.assertEqual('t_grs01_floor_03', self.make_nmg().get_node_mesh_guids().get('0x00000103'))
+
+    def test_no_gas_cache(self):
+        instance, disabled = GasCache._instance, GasCache._disabled
+        try:
+            GasCache.disable()
+            nmg = NodeMeshGuids(GasDir(self.tmp_dir.name))
+            self.assertEqual('t_grs01_floor_01', nmg.get_node_mesh_guids()['0x00000101'])
+            self.assertFalse(os.path.exists(os.path.join(self.tmp_dir.name, 'cache')))
+            GasCache.enable(os.path.join(self.tmp_dir.name, 'cache'))
+            NodeMeshGuids(GasDir(self.tmp_dir.name)).get_node_mesh_guids()
+            self.assertEqual(1, len([name for name in os.listdir(os.path.join(self.tmp_dir.name, 'cache')) if name.endswith('.node-mesh-guids.pickle')]))
+        finally:
+            GasCache._instance, GasCache._disabled = instance, disabled
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from bits.nnk import NNK
+from bits.sno_index import SnoIndex
+from bits.snos import SNOs
+from sno.sno import Sno
+from test.test_sno_view import make_sno, TEST_MESHES, FLOOR_TRIANGLES, WATER_TRIANGLES
+
+
+class TestSnoIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.snos_path = os.path.join(self.tmp_dir.name, 'terrain')
+        self.write_sno(os.path.join('generic', 'floor', 't_xxx_flr_04x04-v0.sno'), make_sno(TEST_MESHES))
+        self.write_sno(os.path.join('generic', 'T_Water.sno'), make_sno([(Sno.Floor.water.value, WATER_TRIANGLES)], (6, 1)))
+        self.write_sno(os.path.join('generic', 't_broken.sno'), b'SNOD')
+        self.index_path = os.path.join(self.tmp_dir.name, 'cache', 'sno-index.pickle')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_sno(self, rel_path, data):
+        path = os.path.join(self.snos_path, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as sno_file:
+            sno_file.write(data)
+
+    def make_index(self) -> SnoIndex:
+        index = SnoIndex(self.snos_path, self.index_path)
+        index.load()
+        return index
+
+    def test_refresh(self):
+        snos = SNOs(self.snos_path, NNK(None))
+        index = self.make_index()
+        index.parallel = 2
+        index.PARALLEL_MIN_FILES = 1  # read in processes
+        self.assertEqual(3, index.refresh(snos.sno_file_paths))
+        floor = index.get_metadata(os.path.join('generic', 'floor', 't_xxx_flr_04x04-v0.sno'))
+        self.assertEqual((2, 4, len(FLOOR_TRIANGLES), True, True), (floor.door_count, floor.triangle_count, floor.floor_triangle_count, floor.has_floor, floor.has_water))
+        self.assertEqual((6.0, 4.0), (floor.bounding_box.max.x, floor.bounding_box.max.z))
+        water = index.get_metadata(os.path.join('Generic', 't_water.sno'))
+        self.assertEqual((1, 0, False, True), (water.version.minor, water.floor_triangle_count, water.has_floor, water.has_water))
+        self.assertIsNone(index.get_metadata(os.path.join('generic', 't_broken.sno')))
+        self.assertIn('Exception', index.get_error(os.path.join('generic', 't_broken.sno')))
+
+        index = self.make_index()
+        self.assertEqual(0, index.refresh(snos.sno_file_paths))  # nothing changed, errors included
+        self.write_sno(os.path.join('generic', 't_broken.sno'), make_sno([(Sno.Floor.floor.value, FLOOR_TRIANGLES)]))
+        self.assertEqual(1, index.refresh(snos.sno_file_paths))
+        self.assertTrue(index.get_metadata(os.path.join('generic', 't_broken.sno')).has_floor)
+
+    def test_output_dir(self):
+        output_dir = os.path.join(self.tmp_dir.name, 'output')
+        index = SnoIndex(self.snos_path, output_dir=output_dir)
+        self.assertEqual(output_dir, os.path.dirname(index.path))
+        index.refresh(SNOs(self.snos_path, NNK(None)).sno_file_paths)
+        self.assertTrue(SnoIndex(self.snos_path, output_dir=output_dir).load())
+        self.assertNotEqual(index.path, SnoIndex(os.path.join(self.tmp_dir.name, 'other'), output_dir=output_dir).path)
+
+    def test_print(self):
+        snos = SNOs(self.snos_path, NNK(None))
+        snos.index = self.make_index()
+        snos.index.refresh(snos.sno_file_paths)
+        from_index = io.StringIO()
+        with redirect_stdout(from_index):
+            snos.print()
+        from_handler = io.StringIO()
+        with redirect_stdout(from_handler):
+            snos.get_sno_by_path(os.path.join('generic', 'floor', 't_xxx_flr_04x04-v0.sno')).print('  ')
+        self.assertIn('t_xxx_flr_04x04-v0\n' + from_handler.getvalue(), from_index.getvalue())
+        self.assertIn('t_broken\n  ', from_index.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+from sno.sno import Sno
+from sno.sno_handler import SnoHandler
+from sno.sno_view import SnoView
+
+
+def pack_v3(x, y, z) -> bytes:
+    return struct.pack('<3f', x, y, z)
+
+
+def pack_bsp(triangles: list[int], children: list) -> bytes:
+    # children: (triangles, children) tuples
+    data = pack_v3(0, 0, 0) + pack_v3(0, 0, 0) + struct.pack('<BH', 1 if len(children) == 0 else 0, len(triangles))
+    data += struct.pack(f'<{len(triangles)}H', *triangles) + struct.pack('<B', len(children))
+    for child_triangles, child_children in children:
+        data += pack_bsp(child_triangles, child_children)
+    return data
+
+
+def make_sno(meshes: list[tuple[int, list[tuple]]], version=(6, 4)) -> bytes:
+    # meshes: (floor flag, triangles as 3 (x, y, z) tuples each); minimal doors, spots, vertices & surfaces around them
+    points = [p for _, triangles in meshes for triangle in triangles for p in triangle]
+    bb_min = [min(p[i] for p in points) for i in range(3)]
+    bb_max = [max(p[i] for p in points) for i in range(3)]
+    data = b'SNOD' + struct.pack('<2I', *version)
+    data += struct.pack('<5I', 2, 1, 3, sum(len(t) for _, t in meshes), 1)  # doors, spots, vertices, triangles, textures
+    data += pack_v3(*bb_min) + pack_v3(*bb_max) + pack_v3(0, 0, 0)
+    data += struct.pack('<4I', 7, 0, 0, 0)  # tile, reserved
+    if version >= (6, 2):
+        data += struct.pack('<I', 0x12345678)
+    for door_id, x_axis, z_axis in [(1, (1, 0, 0), (0, 0, 1)), (2, (0, 0, -1), (1, 0, 0))]:
+        data += struct.pack('<I', door_id) + pack_v3(door_id * 2, 0, 0) + pack_v3(*x_axis) + pack_v3(0, 1, 0) + pack_v3(*z_axis)
+        data += struct.pack('<3I', 2, 0, door_id)
+    data += pack_v3(1, 0, 0) + pack_v3(0, 1, 0) + pack_v3(0, 0, 1) + pack_v3(0.5, 0, 0.5) + b'spot_label\x00'
+    for i in range(3):
+        data += pack_v3(i, i + 1, i + 2) + pack_v3(0, 1, 0) + bytes([255, 128, i, 0]) + struct.pack('<2f', 0.25 * i, 0.5)
+    data += b'b_t_grs01\x00' + struct.pack('<3I', 0, 3, 3) + struct.pack('<3H', 0, 1, 2)
+    data += struct.pack('<I', len(meshes))
+    for index, (floor, triangles) in enumerate(meshes):
+        mesh_points = [p for triangle in triangles for p in triangle]
+        data += struct.pack('<B', index)
+        data += pack_v3(*[min(p[i] for p in mesh_points) for i in range(3)]) + pack_v3(*[max(p[i] for p in mesh_points) for i in range(3)])
+        data += struct.pack('<II', floor, 1)
+        data += struct.pack('<H', 1) + pack_v3(0, 0, 0) + pack_v3(1, 1, 1)  # general connection
+        if version >= (6, 4):
+            data += pack_v3(0.5, 0.5, 0.5)
+        if version >= (6, 2):
+            data += struct.pack('<H2H', 2, 0, 1) + struct.pack('<I2H', 2, 3, 4)
+        data += struct.pack('<I', 1) + struct.pack('<BI4H', 9, 2, 1, 2, 3, 4)  # nodal connection
+        data += struct.pack('<I', len(triangles))
+        for a, b, c in triangles:
+            ux, uy, uz = [b[i] - a[i] for i in range(3)]
+            vx, vy, vz = [c[i] - a[i] for i in range(3)]
+            data += pack_v3(*a) + pack_v3(*b) + pack_v3(*c) + pack_v3(uy * vz - uz * vy, uz * vx - ux * vz, ux * vy - uy * vx)
+        data += pack_bsp([], [(list(range(len(triangles))), []), ([], [([0], [])])])
+    return data
+
+
+# a 4x4 floor from 0,0 to 4,4 rising along x, and a 2x2 water surface next to it
+FLOOR_TRIANGLES = [((0, 0, 0), (0, 0, 4), (4, 2, 0)), ((4, 2, 0), (0, 0, 4), (4, 2, 4))]
+WATER_TRIANGLES = [((4, -1, 0), (4, -1, 2), (6, -1, 0)), ((6, -1, 0), (4, -1, 2), (6, -1, 2))]
+TEST_MESHES = [(Sno.Floor.floor.value, FLOOR_TRIANGLES), (Sno.Floor.water.value, WATER_TRIANGLES)]
+
+
+class TestSnoView(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.sno_path = os.path.join(self.tmp_dir.name, 't_test_floor.sno')
+        with open(self.sno_path, 'wb') as sno_file:
+            sno_file.write(make_sno(TEST_MESHES))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assert_v3(self, expected: Sno.V3, actual):
+        self.assertEqual((expected.x, expected.y, expected.z), (actual.x, actual.y, actual.z))
+
+    def test_same_as_kaitai(self):
+        for version in [(6, 1), (6, 2), (6, 4)]:
+            data = make_sno(TEST_MESHES, version)
+            sno = Sno.from_bytes(data)
+            view = SnoView(data)
+            for field in ['magic', 'door_count', 'spot_count', 'vertex_count', 'triangle_count', 'texture_count', 'tile', 'logical_mesh_count']:
+                self.assertEqual(getattr(sno, field), getattr(view, field), field)
+            self.assertEqual(getattr(sno, 'checksum', None), view.checksum)
+            self.assert_v3(sno.bounding_box.max, view.bounding_box.max)
+            self.assertEqual([d.id for d in sno.door_array], [d.id for d in view.door_array])
+            self.assert_v3(sno.door_array[1].x_axis, view.door_array[1].x_axis)
+            self.assertEqual(sno.door_array[1].vertex_array, view.door_array[1].vertex_array.tolist())
+            self.assertEqual(sno.spot_array[0].label, view.spot_array[0].label)
+            self.assertEqual([v.uvcoords.u for v in sno.vertex_array], view.vertex_array['uvcoords']['u'].tolist())
+            self.assertEqual([v.color.b for v in sno.vertex_array], view.vertex_array['color']['b'].tolist())
+            self.assertEqual(sno.surface_array[0].texture, view.surface_array[0].texture)
+            self.assertEqual(sno.surface_array[0].face_array[0].c, view.surface_array[0].face_array[0]['c'])
+            for lm, lm_view in zip(sno.logical_mesh, view.logical_mesh):
+                self.assertEqual(lm.floor, lm_view.floor)
+                self.assert_v3(lm.bounding_box.min, lm_view.bounding_box.min)
+                self.assertEqual([t.triangle.c.x for t in lm.triangle_section], lm_view.triangles['c']['x'].tolist())
+                self.assertEqual([t.normal.y for t in lm.triangle_section], lm_view.normals['y'].tolist())
+            self.assertEqual([0, 1], view.logical_mesh_array['index'].tolist())
+
+    def test_handler(self):
+        sno = SnoHandler(self.sno_path)
+        self.assertEqual(2, sno.view.door_count)
+        self.assertEqual(24, sno.bounding_box_2d_size())
+        self.assertTrue(sno.is_in_floor_2d(1, 2))
+        self.assertFalse(sno.is_in_floor_2d(5, 1))  # water
+        self.assertAlmostEqual(0.25, sno.snap_to_ground(0.5, 3))
+        self.assertAlmostEqual(1.75, sno.snap_to_ground(3.5, 3))
+        self.assertEqual([True, False, True, False], sno.is_in_floor_2d_batch([1, 5, 3.5, -1], [2, 1, 3, 0]).tolist())
+        mask, heights = sno.snap_to_ground_batch(np.array([0.5, 3.5, 5]), np.array([3, 3, 1]))
+        self.assertEqual([True, True, False], mask.tolist())
+        self.assertEqual([0.25, 1.75], heights[mask].tolist())
+        self.assertEqual(Sno.Floor.floor, sno.sno.logical_mesh[0].floor)  # full kaitai parse on demand
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from bits.maps.game_object import GameObject
+from bits.template_index import TemplateIndex
+from bits.templates import Templates
+from gas.gas import Section
+from gas.gas_cache import GasCache
+from gas.gas_dir import GasDir
+from gas.gas_parser import GasParser
+
+
+class TestTemplateIndex(unittest.TestCase):
+    BASE_TEXT = '''[t:template,n:base]
+{
+\tdoc = "base [not a component] { }";
+\t[aspect] { model = m_base; }
+\t// [commented_out] { }
+\t/*
+\t[t:template,n:commented_out] { }
+\t*/
+}
+'''
+    LEAF_TEXT = '''[t:template,n:Leaf]
+{
+\tspecializes = "base";
+\t[common]
+\t{
+\t\tscreen_name = "Leaf";
+\t\t[template_triggers] { }
+\t}
+\t[gizmo] { script = [[ [not_a_section] { ]]; }
+}
+[t:template,n:other]
+{
+  specializes = base;
+'''  # missing closing brace
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.tmp_dir.name, 'sub'))
+        self.write('base.gas', self.BASE_TEXT)
+        self.write(os.path.join('sub', 'leaf.gas'), self.LEAF_TEXT)
+        self.index_path = os.path.join(self.tmp_dir.name, 'index', 'templates.pickle')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, rel_path, text):
+        with open(os.path.join(self.tmp_dir.name, rel_path), 'w') as gas_file:
+            gas_file.write(text)
+
+    def test_scan(self):
+        entries = TemplateIndex.scan_text(self.LEAF_TEXT.encode())
+        self.assertEqual([
+            ('Leaf', 0, 'base', ('common', 'gizmo')),
+            ('other', self.LEAF_TEXT.index('[t:template,n:other]'), 'base', ()),
+        ], entries)
+        self.assertEqual([('base', 0, None, ('aspect',))], TemplateIndex.scan_text(self.BASE_TEXT.encode()))
+
+    def test_refresh(self):
+        index = TemplateIndex(GasDir(self.tmp_dir.name), self.index_path)
+        self.assertFalse(index.load())
+        self.assertEqual(2, index.refresh())
+        self.assertEqual((os.path.join('sub', 'leaf.gas'), 0, 'base', ('common', 'gizmo')), index.lookup('LEAF'))
+        self.assertIsNone(index.lookup('commented_out'))
+
+        index = TemplateIndex(GasDir(self.tmp_dir.name), self.index_path)
+        self.assertTrue(index.load())
+        self.assertEqual(0, index.refresh())
+        self.assertEqual(3, len(index.templates))
+        self.write('base.gas', self.BASE_TEXT.replace('n:base', 'n:base_renamed'))
+        os.utime(os.path.join(self.tmp_dir.name, 'base.gas'), ns=(0, 0))
+        self.assertEqual(1, index.refresh())
+        self.assertIsNone(index.lookup('base'))
+        self.assertIsNotNone(index.lookup('base_renamed'))
+
+    def test_get_template(self):
+        parser = GasParser.get_instance()
+        print_warnings = parser.print_warnings
+        parser.print_warnings = False
+        templates = Templates(GasDir(self.tmp_dir.name))
+        templates.index = TemplateIndex(templates.gas_dir, self.index_path)
+        templates.index.refresh()
+        leaf = templates.get_template('leaf')
+        self.assertEqual({os.path.join('sub', 'leaf.gas'), 'base.gas'}, templates.loaded_files)
+        self.assertEqual('base', leaf.parent_template.name)
+        self.assertEqual('m_base', leaf.compute_value('aspect', 'model'))
+        self.assertIsNone(templates.get_template('nonexistent'))
+        self.assertIn('base', templates.get_resolved('LEAF').ancestors)
+        game_object = GameObject(Section('t:leaf,n:0x00000001'), SimpleNamespace(templates=templates))
+        self.assertIs(leaf, game_object.get_template())
+        self.assertEqual('m_base', game_object.compute_value('aspect', 'model'))
+        self.assertIsNone(templates.templates)  # nothing else loaded
+
+        all_templates = templates.get_templates()
+        self.assertIs(leaf, all_templates['leaf'])  # same objects as handed out before
+        self.assertIs(leaf.parent_template, all_templates['base'])
+        self.assertEqual(['Leaf', 'other'], sorted(t.name for t in leaf.parent_template.child_templates))
+        self.assertTrue(templates.is_descendant(leaf, 'base'))
+        self.assertIs(leaf, templates.get_template('LEAF'))
+        parser.print_warnings = print_warnings
+        parser.clear_warnings()
+
+    def test_not_persisted_without_gas_cache(self):
+        instance, disabled = GasCache._instance, GasCache._disabled
+        try:
+            GasCache.disable()
+            index = TemplateIndex(GasDir(self.tmp_dir.name))
+            self.assertIsNone(index.path)
+            self.assertFalse(index.load())
+            self.assertEqual(2, index.refresh())
+            self.assertIsNotNone(index.lookup('leaf'))
+            GasCache.enable(os.path.join(self.tmp_dir.name, 'cache'))
+            index = TemplateIndex(GasDir(self.tmp_dir.name))
+            self.assertTrue(index.path.startswith(os.path.join(self.tmp_dir.name, 'cache')))
+        finally:
+            GasCache._instance, GasCache._disabled = instance, disabled
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import math
+import unittest
+
+from bits.template_table import TemplateTable
+from bits.templates import Template
+from gas.gas import Attribute, Section
+from printouts.world_level_stats import actor_stats_dict, actor_stats_table
+
+
+class TestTemplateTable(unittest.TestCase):
+    def make_templates(self):
+        base = Template(Section('t:template,n:base', [
+            Section('aspect', [Attribute('max_life', 100), Attribute('experience_value', '50'), Attribute('life', '80.0')]),
+            Section('actor', [Section('skills', [Attribute('strength', '12, 0'), Attribute('melee', '3.5, 0')])]),
+        ]))
+        krug = Template(Section('t:template,n:krug', [
+            Attribute('specializes', 'base'),
+            Section('attack', [Attribute('damage_min', '4'), Attribute('damage_max', '7 garbage')]),
+        ]))
+        krug.parent_template = base
+        gom = Template(Section('t:template,n:gom', [
+            Attribute('specializes', 'base'),
+            Section('aspect', [Attribute('max_life', 2000)]),
+        ]))
+        gom.parent_template = base
+        return {'base': base, 'krug': krug, 'gom': gom}
+
+    def test_extract(self):
+        templates = self.make_templates()
+        table = TemplateTable.extract(templates, {'life': ('aspect', 'max_life'), 'damage_max': ('attack', 'damage_max'), 'current_life': ('aspect', 'life')})
+        self.assertEqual(['base', 'krug', 'gom'], table.names)
+        self.assertEqual([100, 100, 2000], table['life'].tolist())
+        self.assertEqual([None, 7, None], table.cell_values('damage_max'))
+        self.assertEqual(['80.0'] * 3, [repr(v) for v in table.cell_values('current_life')])
+        with self.assertRaises(ValueError):
+            TemplateTable.extract(templates, {'strength': ('actor', 'skills', 'strength')})  # "12, 0"
+        strong = table.select(table['life'] > 500)
+        self.assertEqual(['gom'], strong.names)
+        self.assertEqual([2000], strong['life'].tolist())
+        self.assertEqual(['80.0'], [repr(v) for v in strong.cell_values('current_life')])
+        named = TemplateTable.extract([templates['krug']], {'name': lambda t: len(t.name)}, ['k'])
+        self.assertEqual((['k'], [4]), (named.names, named['name'].tolist()))
+
+    def test_actor_stats(self):
+        templates = self.make_templates()
+        table = actor_stats_table(list(templates.values()))
+        for i, template in enumerate(templates.values()):
+            stats = actor_stats_dict(template)
+            for stat, value in stats.items():
+                if value is None:
+                    self.assertTrue(math.isnan(table[stat][i]), stat)
+                else:
+                    self.assertEqual(value, table[stat][i], stat)
+                self.assertEqual(repr(value), repr(table.cell_values(stat)[i]), stat)  # printed the same
+
+
+if __name__ == '__main__':
+    unittest.main()
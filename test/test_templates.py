@@ -1,6 +1,6 @@
 import unittest
 
-from bits.templates import Template
+from bits.templates import Template, Templates
 from gas.gas import Attribute, Hex, Section
 
 
@@ -107,3 +107,103 @@ class TestTemplates(unittest.TestCase):
         frags_section = leaf.resolve_section('physics', 'break_particulate')
         self.assertIsNotNone(frags_section)
         self.assertEqual('baddie_frag_01', frags_section.items[0].name)
+
+    def test_resolved(self):
+        root = Template(Section('t:template,n:root', [
+            Attribute('doc', 'root'),
+            Section('aspect', [Attribute('scale_base', 1.0)]),
+        ]))
+        base = Template(Section('t:template,n:base', [
+            Attribute('specializes', 'root'),
+            Section('aspect', [Attribute('model', 'm_base')]),
+            Section('common', [Attribute('screen_name', 'Base')]),
+            Section('common', [Attribute('SCREEN_NAME', 'Base 2')]),
+        ]))
+        base.parent_template = root
+        leaf = Template(Section('t:template,n:leaf', [
+            Attribute('specializes', 'base'),
+            Section('actor', [Attribute('alignment', 'aa_evil')]),
+        ]))
+        leaf.parent_template = base
+        resolved = leaf.get_resolved()
+        self.assertEqual({'leaf', 'base', 'root'}, resolved.ancestors)
+        self.assertEqual({'actor', 'aspect', 'common'}, resolved.components)
+        self.assertIs(resolved, leaf.get_resolved())  # cached
+        self.assertTrue(leaf.is_descendant_of('root'))
+        self.assertFalse(base.is_descendant_of('leaf'))
+        self.assertTrue(leaf.has_component('aspect'))
+        self.assertFalse(root.has_component('common'))
+        self.assertEqual('Base 2', leaf.compute_value('common', 'screen_name'))
+        self.assertEqual('m_base', leaf.compute_value('aspect', 'model'))
+        self.assertEqual(1.0, leaf.compute_value('aspect', 'scale_base'))
+        self.assertEqual('root', leaf.compute_value('DOC'))
+
+        # set_scale_base-style edits
+        leaf.section.get_or_create_section('aspect').set_attr_value('scale_base', 2.0)
+        self.assertIsNot(resolved, leaf.get_resolved())
+        self.assertEqual(2.0, leaf.compute_value('aspect', 'scale_base'))
+        self.assertEqual(1.0, base.compute_value('aspect', 'scale_base'))
+        leaf.section.resolve_attr('aspect', 'scale_base').set_value(3.0)
+        self.assertEqual(3.0, leaf.compute_value('aspect', 'scale_base'))
+        base.section.get_section('aspect').set_attr_value('model', None)
+        self.assertIsNone(leaf.compute_value('aspect', 'model'))
+
+        # edits elsewhere keep it, direct edits on items are noticed
+        resolved = leaf.get_resolved()
+        other = Section('t:template,n:other', [Attribute('doc', 'other')])
+        other.set_attr_value('doc', 'other 2')
+        other.get_attr('doc').name = 'info'
+        self.assertIs(resolved, leaf.get_resolved())
+        root.section.items.append(Attribute('doc', 'root 2'))
+        self.assertEqual('root 2', leaf.compute_value('doc'))
+        root.section.get_section('aspect').items[0] = Attribute('scale_base', 4.0)
+        self.assertEqual(4.0, base.compute_value('aspect', 'scale_base'))
+        root.section.get_section('aspect').get_attrs()[0].name = 'model'
+        self.assertEqual(4.0, leaf.compute_value('aspect', 'model'))
+        leaf.parent_template = root
+        self.assertFalse(leaf.is_descendant_of('base'))
+
+    def test_descendants(self):
+        def make_template(name, specializes=None):
+            items = [Attribute('specializes', specializes)] if specializes is not None else []
+            return Template(Section('t:template,n:' + name, items))
+        templates = Templates(None)
+        templates.templates = {t.name.lower(): t for t in [
+            make_template('actor'), make_template('actor_evil', 'actor'), make_template('Krug', 'actor_evil'),
+            make_template('actor_good', 'actor'), make_template('farmer', 'actor_good'), make_template('prop'), make_template('barrel', 'prop'),
+        ]}
+        templates.connect_template_tree()
+        self.assertEqual(['actor', 'actor_evil', 'krug', 'actor_good', 'farmer'], list(templates.descendants('actor')))
+        self.assertEqual(['krug', 'farmer'], list(templates.descendants('actor', leaf_only=True)))
+        self.assertEqual(['barrel'], list(templates.descendants('prop', leaf_only=True)))
+        self.assertTrue(templates.is_descendant(templates.templates['krug'], 'actor'))
+        self.assertFalse(templates.is_descendant(templates.templates['krug'], 'actor_good'))
+        self.assertFalse(templates.is_descendant(templates.templates['krug'], 'nonexistent'))
+        self.assertEqual(['barrel'], list(templates.get_leaf_templates('prop')))
+        self.assertEqual(['actor_evil', 'krug'], list(templates.filter_templates(False, 'actor_evil')))
+
+        # re-parenting renumbers
+        krug = templates.templates['krug']
+        templates.templates['actor_evil'].child_templates.remove(krug)
+        krug.parent_template = templates.templates['prop']
+        templates.templates['prop'].child_templates.append(krug)
+        self.assertEqual(['barrel', 'krug'], list(templates.descendants('prop', leaf_only=True)))
+        self.assertEqual(['actor', 'actor_evil', 'actor_good', 'farmer'], list(templates.descendants('actor')))
+
+    def test_with_component(self):
+        def make_template(name, specializes=None, components=()):
+            items = [Attribute('specializes', specializes)] if specializes is not None else []
+            return Template(Section('t:template,n:' + name, items + [Section(c) for c in components]))
+        templates = Templates(None)
+        templates.templates = {t.name.lower(): t for t in [
+            make_template('actor', None, ['actor']), make_template('shopkeeper', 'actor', ['store']), make_template('Fence', 'shopkeeper', ['store']),
+            make_template('prop'), make_template('gen', 'prop', ['generator_basic', 'generator_basic']), make_template('darkgen', 'gen', ['actor']),
+        ]}
+        templates.connect_template_tree()
+        self.assertEqual(['shopkeeper', 'fence'], list(templates.with_component('store')))
+        self.assertEqual(['actor', 'shopkeeper', 'fence', 'darkgen'], list(templates.with_component('actor')))
+        self.assertEqual(['gen', 'darkgen'], list(templates.with_component('generator_basic')))
+        self.assertEqual({}, templates.with_component('nonexistent'))
+        self.assertEqual(['actor', 'shopkeeper', 'fence', 'darkgen'], list(templates.get_actor_templates(False)))
+        templates.templates['prop'].section.get_or_create_section('store')
+        self.assertEqual(['shopkeeper', 'fence', 'prop', 'gen', 'darkgen'], list(templates.with_component('store')))
@@ -7,7 +7,7 @@ import sys
 from bits.bits import Bits
 from printouts.common import get_wl_templates
 from printouts.csv import read_csv
-from printouts.world_level_stats import actor_stats_dict
+from printouts.world_level_stats import actor_stats_table
 
 
 # todo life=max_life, mana=max_mana
@@ -51,37 +51,18 @@ def calc_linear_regression(bits: Bits, wl: str, regression_vars: dict):
     wls_actors = get_wl_templates(actors)
     enemy_occurrence = read_enemy_occurrence()
 
-    stats_vals = {s: list() for s in STAT_ATTRS}
-    for name, wl_actors in wls_actors.items():
-        if name not in enemy_occurrence:
-            continue
-        regular_actor = wl_actors['regular']
-        wl_actor = wl_actors[wl]
-        if wl_actor is None:
-            continue
-
-        regular_stats = actor_stats_dict(regular_actor)
-        wl_stats = actor_stats_dict(wl_actor)
-
-        for stat, stat_reg_vars in regression_vars.items():
-            regular_value = regular_stats[stat]
-            if regular_value is None:
-                continue
-            if not regular_value:  # skip zeroes - zero values remain zero values in V/E
-                continue
-            regular_values = [regular_stats[var] for var in stat_reg_vars]
-            if None in regular_values or 0 in regular_values or 0.0 in regular_values:
-                continue
-            wl_value = wl_stats[stat]
-            stats_vals[stat].append((regular_values, wl_value))
+    names = [name for name, wl_actors in wls_actors.items() if name in enemy_occurrence and wl_actors[wl] is not None]
+    regular_stats = actor_stats_table([wls_actors[name]['regular'] for name in names], names)
+    wl_stats = actor_stats_table([wls_actors[name][wl] for name in names], names)
 
     lins = {stat: tuple() for stat in STAT_ATTRS}
-    for stat in STAT_ATTRS:
-        x = [v[0] for v in stats_vals[stat]]
-        y = [v[1] for v in stats_vals[stat]]
-        x = [[v[i] for v in x] for i in range(len(x[0]))]  # flip around
-        x = numpy.vstack([x, numpy.ones(len(x[0]))]).T
-        coeffs = tuple(numpy.linalg.lstsq(x, y, rcond=None)[0])
+    for stat, stat_reg_vars in regression_vars.items():
+        x = numpy.column_stack([regular_stats[var] for var in stat_reg_vars])
+        y = wl_stats[stat]
+        # skip zeroes - zero values remain zero values in V/E
+        mask = numpy.all(numpy.isfinite(x) & (x != 0), axis=1) & numpy.isfinite(regular_stats[stat]) & (regular_stats[stat] != 0) & numpy.isfinite(y)
+        x = numpy.column_stack([x[mask], numpy.ones(numpy.count_nonzero(mask))])
+        coeffs = tuple(numpy.linalg.lstsq(x, y[mask], rcond=None)[0])
         lins[stat] = coeffs
 
     return lins